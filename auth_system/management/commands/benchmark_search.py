@@ -0,0 +1,86 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+
+from code_of_conduct.models.ras_data import RasData
+from code_of_conduct.views.ras_view import RAS_SEARCH_FIELDS, RAS_SEARCH_PREFIX_FIELDS
+from auth_system.utils.search import apply_search
+from ems.models import Menu, TblBranch
+from ems.models.emp_basic_profile import TblEmpBasicProfile
+from ems.views.branch_view import BRANCH_SEARCH_FIELDS, BRANCH_SEARCH_PREFIX_FIELDS
+from ems.views.emp_basic_profile_views import (
+    EMPLOYEE_SEARCH_FIELDS,
+    EMPLOYEE_SEARCH_PREFIX_FIELDS,
+)
+from ems.views.menu_view import MENU_SEARCH_FIELDS, MENU_SEARCH_PREFIX_FIELDS
+from lead.models.enquiry import Enquiry
+from lead.views.enquirey_view import ENQUIRY_SEARCH_FIELDS, ENQUIRY_SEARCH_PREFIX_FIELDS
+
+SEARCH_TARGETS = {
+    "enquiry": (Enquiry, ENQUIRY_SEARCH_FIELDS, ENQUIRY_SEARCH_PREFIX_FIELDS),
+    "employee": (TblEmpBasicProfile, EMPLOYEE_SEARCH_FIELDS, EMPLOYEE_SEARCH_PREFIX_FIELDS),
+    "branch": (TblBranch, BRANCH_SEARCH_FIELDS, BRANCH_SEARCH_PREFIX_FIELDS),
+    "menu": (Menu, MENU_SEARCH_FIELDS, MENU_SEARCH_PREFIX_FIELDS),
+    "ras": (RasData, RAS_SEARCH_FIELDS, RAS_SEARCH_PREFIX_FIELDS),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the list-view searches: the old icontains-on-every-column filter "
+        "against the indexed search (plus relevance ranking)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--query", required=True, help="Search text to time.")
+        parser.add_argument(
+            "--target",
+            choices=sorted(SEARCH_TARGETS),
+            action="append",
+            help="Listing to time (repeatable, default: all).",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs per variant (best is reported)."
+        )
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Print the query plan of each variant (PostgreSQL only).",
+        )
+
+    def handle(self, *args, **options):
+        query = options["query"]
+        repeat = max(options["repeat"], 1)
+        for name in options["target"] or sorted(SEARCH_TARGETS):
+            model, fields, prefix_fields = SEARCH_TARGETS[name]
+            base = model.objects.filter(deleted_at__isnull=True).order_by("id")
+
+            legacy = Q()
+            for field in (*fields, *prefix_fields):
+                legacy |= Q(**{f"{field}__icontains": query})
+            variants = [
+                ("icontains", base.filter(legacy)),
+                ("indexed", apply_search(base, query, fields, prefix_fields)),
+                ("ranked", apply_search(base, query, fields, prefix_fields, rank=True)),
+            ]
+
+            self.stdout.write(f"{name}:")
+            for label, queryset in variants:
+                best, rows = self.time_page(queryset, repeat)
+                self.stdout.write(f"  {label:<10} {best * 1000:8.2f} ms  {rows} rows")
+                if options["explain"] and connections[queryset.db].vendor == "postgresql":
+                    self.stdout.write(queryset[:20].explain(analyze=True))
+
+    def time_page(self, queryset, repeat):
+        """Best time to fetch the first page and count the matches."""
+        best = None
+        rows = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset[:20])
+            rows = queryset.count()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, rows
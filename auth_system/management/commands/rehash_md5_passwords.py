@@ -0,0 +1,78 @@
+from django.contrib.auth.hashers import check_password
+from django.core.management.base import BaseCommand
+
+from auth_system.models.user import TblUser
+from auth_system.utils.password_hashing import get_hash_workers, hash_passwords
+from ems.utils.emp_import import bulk_import_password
+
+
+class Command(BaseCommand):
+    help = (
+        "Rehash MD5 passwords left by the old employee bulk import with the "
+        "default hasher, for accounts still using their initial password"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Accounts hashed and updated per batch.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Hashing processes (default: PASSWORD_HASH_WORKERS or all cores).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the accounts that would be rehashed.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        workers = options["workers"] or get_hash_workers()
+        dry_run = options["dry_run"]
+
+        rehashed = 0
+        skipped = 0
+        last_id = 0
+        while True:
+            batch = list(
+                TblUser.objects.filter(id__gt=last_id, password__startswith="md5$")
+                .order_by("id")
+                .only("id", "full_name", "mobile_number", "password")[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            # Only the import-generated password can be recovered; MD5 is
+            # cheap, so checking each candidate costs next to nothing.
+            matched = []
+            for user in batch:
+                raw = bulk_import_password(user.full_name, user.mobile_number)
+                if check_password(raw, user.password):
+                    matched.append((user, raw))
+                else:
+                    skipped += 1
+
+            if matched and not dry_run:
+                hashes = hash_passwords([raw for _, raw in matched], workers=workers)
+                for (user, _), hashed in zip(matched, hashes):
+                    user.password = hashed
+                TblUser.objects.bulk_update(
+                    [user for user, _ in matched], ["password"], batch_size=500
+                )
+            rehashed += len(matched)
+            self.stdout.write(f"Processed up to user id {last_id}: {rehashed} rehashed")
+
+        verb = "Would rehash" if dry_run else "Rehashed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {rehashed} account(s). {skipped} MD5 account(s) no longer "
+                "use their import password and will be upgraded at their next login."
+            )
+        )
@@ -0,0 +1,78 @@
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from auth_system.utils.export_jobs import (
+    claim_next_job,
+    get_worker_id,
+    purge_expired_exports,
+    release_stale_jobs,
+    run_export_job,
+)
+
+# Seconds between sweeps for orphaned jobs and expired files.
+MAINTENANCE_INTERVAL = 60
+
+
+def work_loop(poll_interval, once=False):
+    worker_id = get_worker_id()
+    next_maintenance = 0
+    while True:
+        close_old_connections()
+        if time.monotonic() >= next_maintenance:
+            release_stale_jobs()
+            purge_expired_exports()
+            next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+        job = claim_next_job(worker_id)
+        if job:
+            run_export_job(job)
+            continue
+        if once:
+            return
+        time.sleep(poll_interval)
+
+
+class Command(BaseCommand):
+    help = "Run background export workers that process queued ExportJob rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of worker processes to run in parallel.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        processes = max(options["processes"], 1)
+        poll_interval = options["poll_interval"]
+        once = options["once"]
+        self.stdout.write(f"Starting {processes} export worker(s)...")
+
+        if processes == 1:
+            work_loop(poll_interval, once)
+            return
+
+        # Child processes must open their own database connections.
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=work_loop, args=(poll_interval, once))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,86 @@
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from auth_system.utils.message_dispatch import (
+    MESSAGE_MODELS,
+    claim_due_messages,
+    deliver_message,
+    get_dispatch_settings,
+    get_worker_id,
+    load_backends,
+    release_stale_claims,
+)
+
+
+def work_loop(poll_interval, batch_size, once=False):
+    conf = get_dispatch_settings()
+    backends = load_backends(conf)
+    worker_id = get_worker_id()
+    while True:
+        close_old_connections()
+        release_stale_claims(conf)
+        claimed = 0
+        for kind in MESSAGE_MODELS:
+            for pk in claim_due_messages(kind, worker_id, batch_size):
+                claimed += 1
+                deliver_message(kind, pk, backends, conf)
+        if claimed:
+            continue
+        if once:
+            return
+        time.sleep(poll_interval)
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued SmsLog / EmailLogs rows (MESSAGE_DISPATCH MODE 'worker'), "
+        "and retries left behind by the in-process dispatcher"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of worker processes to run in parallel.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when nothing is due.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Messages claimed per table per round.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Deliver what is due and exit instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        processes = max(options["processes"], 1)
+        args = (options["poll_interval"], max(options["batch_size"], 1), options["once"])
+        self.stdout.write(f"Starting {processes} message worker(s)...")
+
+        if processes == 1:
+            work_loop(*args)
+            return
+
+        # Child processes must open their own database connections.
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=work_loop, args=args)
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
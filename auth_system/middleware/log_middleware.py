@@ -6,10 +6,28 @@ from auth_system.models import TblUser
 from auth_system.models.login_session import LoginSession
 import jwt
 from django.conf import settings
+from auth_system.utils.audit_log import get_audit_log_pipeline
+from auth_system.utils.message_dispatch import get_dispatcher
+from auth_system.utils.session_cache import get_session_state
+
+STREAMED_CONTENT_TYPES = (
+    "multipart/",
+    "application/octet-stream",
+    "application/offset+octet-stream",
+)
 
 
 class APILogMiddleware(MiddlewareMixin):
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        # App name -> APILog model map is resolved once here, not per request.
+        self.audit_log = get_audit_log_pipeline()
+        self.dispatcher = get_dispatcher()
+
     def process_request(self, request):
+        # Started here so every web process sweeps the message queue, even
+        # one that has not queued a message since it (re)started.
+        self.dispatcher.ensure_sweeper()
         auth_header = request.headers.get("Authorization", "")
         token = None
         if auth_header.startswith("Bearer "):
@@ -18,15 +36,9 @@ class APILogMiddleware(MiddlewareMixin):
         session_uuid = None
         if token:
             try:
-                session = LoginSession.objects.filter(
-                    token=token, is_active=True
-                ).first()
-                if session:
-                    session_uuid = (
-                        str(session.session_id)
-                        if hasattr(session, "session_id")
-                        else str(session.pk)
-                    )
+                session_state = get_session_state(token, request)
+                if session_state["active"]:
+                    session_uuid = session_state["session_id"]
             except Exception as e:
                 print(f"[Middleware] Error fetching session by token: {e}")
         if session_uuid:
@@ -39,7 +51,11 @@ class APILogMiddleware(MiddlewareMixin):
             request.session["session_uuid"] = new_uuid
             request.session.modified = True
         try:
-            if request.body:
+            if request.content_type.startswith(STREAMED_CONTENT_TYPES):
+                # Never JSON, and reading request.body would buffer whole
+                # uploads in memory before the view streams them.
+                request._body_data = {}
+            elif request.body:
                 request._body_data = json.loads(request.body.decode("utf-8"))
             else:
                 request._body_data = {}
@@ -147,9 +163,6 @@ class APILogMiddleware(MiddlewareMixin):
 
             if not app_name:
                 return response
-            APILog = self._import_apilog_model(app_name)
-            if not APILog:
-                return response
             query_params = getattr(request, "_query_params", {})
             body_data = getattr(request, "_body_data", {})
             if method == "GET" and not query_params:
@@ -161,38 +174,21 @@ class APILogMiddleware(MiddlewareMixin):
                         **getattr(request, "_query_params", {}),
                     },
                 )
-            log_entry = APILog(
-                uniqid=request.uniqid,
-                user=user_obj,
-                method=method,
-                endpoint=path,
-                request_data=request_data,
-                response_status=response.status_code,
+            self.audit_log.submit(
+                app_name,
+                {
+                    "uniqid": request.uniqid,
+                    "user": user_obj,
+                    "method": method,
+                    "endpoint": path,
+                    "request_data": request_data,
+                    "response_status": response.status_code,
+                },
             )
-            try:
-                if hasattr(response, "content") and response.get(
-                    "Content-Type", ""
-                ).startswith("application/json"):
-                    log_entry.response_data = json.loads(
-                        response.content.decode("utf-8")
-                    )
-                else:
-                    log_entry.response_data = None
-            except Exception:
-                log_entry.response_data = None
-            log_entry.save()
         except Exception as e:
             print(f"[Middleware] APILog error: {e}")
         return response
 
-    def _import_apilog_model(self, app_name):
-        try:
-            module = __import__(f"{app_name}.models", fromlist=["APILog"])
-            return getattr(module, "APILog")
-        except (ImportError, AttributeError) as e:
-            print(f"[Middleware] Could not import APILog from {app_name}.models: {e}")
-            return None
-
 
 def _flatten_querydict(querydict, exclude_keys=None):
     exclude_keys = exclude_keys or []
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 13:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_system', '0004_message_delivery_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='smslog',
+            name='campaign_id',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+    ]
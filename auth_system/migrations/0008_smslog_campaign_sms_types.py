@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_system', '0007_exportjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='smslog',
+            name='sms_type',
+            field=models.IntegerField(choices=[(1, 'Customer Login OTP'), (2, 'FD Login OTP'), (3, 'Employee Login OTP'), (4, 'Lead Verification OTP'), (5, 'Send Link'), (6, 'DSA Send Link'), (7, 'RAS Send Link')]),
+        ),
+    ]
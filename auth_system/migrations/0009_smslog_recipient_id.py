@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_system', '0008_smslog_campaign_sms_types'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='smslog',
+            name='recipient_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
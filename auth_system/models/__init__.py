@@ -11,6 +11,7 @@ from .sms_log import SmsLog
 from .blacklist import BlackListedToken
 from .apilog import APILog
 from .email_logs import EmailLogs
+from .export_job import ExportJob
 
 __all__ = [
     "ForgotPassword",
@@ -24,5 +25,6 @@ __all__ = [
     "BlackListedToken",
     "APILog",
     "EmailLogs",
+    "ExportJob",
    
 ]
@@ -12,9 +12,17 @@ class EmailLogs(models.Model):
     sent_at = models.DateTimeField(auto_now_add=True)
     delivered_at = models.DateTimeField(null=True, blank=True)
     response = models.TextField(null=True, blank=True)
+    subject = models.CharField(max_length=255, null=True, blank=True)
+
+    # Delivery queue (auth_system.utils.message_dispatch)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    worker_id = models.CharField(max_length=100, null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = "auth_system_email_log"
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
 
     def __str__(self):
         return f"Email to {self.email}]"
@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils import timezone
+from constants import EXPORT_JOB_TYPE_CHOICES, ExportJobStatus
+
+
+class ExportJob(models.Model):
+    job_type = models.CharField(max_length=50, choices=EXPORT_JOB_TYPE_CHOICES)
+    export_format = models.CharField(max_length=10, default="xlsx")
+    params = models.JSONField(default=dict, blank=True)
+    params_hash = models.CharField(max_length=64, db_index=True)
+    status = models.IntegerField(
+        choices=ExportJobStatus.choices, default=ExportJobStatus.PENDING
+    )
+    progress = models.IntegerField(default=0)
+    total_rows = models.IntegerField(null=True, blank=True)
+    processed_rows = models.IntegerField(default=0)
+    file_path = models.CharField(max_length=255, null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    worker_id = models.CharField(max_length=100, null=True, blank=True)
+
+    created_by = models.IntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Touched by the running worker with every progress update.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "auth_system_export_job"
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["params_hash", "status", "finished_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.job_type} #{self.id} [{self.get_status_display()}]"
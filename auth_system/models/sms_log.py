@@ -12,9 +12,21 @@ class SmsLog(models.Model):
     sent_at = models.DateTimeField(auto_now_add=True)
     delivered_at = models.DateTimeField(null=True, blank=True)
     response = models.TextField(null=True, blank=True)
+    template_id = models.CharField(max_length=50, null=True, blank=True)
+    # code_of_conduct LinkCampaign that produced this message, if any
+    campaign_id = models.IntegerField(null=True, blank=True, db_index=True)
+    # Row id of the campaign recipient (e.g. DepositAgentsData) it was sent to
+    recipient_id = models.IntegerField(null=True, blank=True)
+
+    # Delivery queue (auth_system.utils.message_dispatch)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    worker_id = models.CharField(max_length=100, null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = "auth_system_sms_log"
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
 
     def __str__(self):
         return f"SMS to {self.mobile_number} [{self.get_status_display()}]"
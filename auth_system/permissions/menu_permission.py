@@ -0,0 +1,43 @@
+from rest_framework.permissions import BasePermission
+
+from ems.utils.permission_matrix import has_menu_permission
+
+METHOD_ACTIONS = {
+    "GET": "view",
+    "HEAD": "view",
+    "OPTIONS": "view",
+    "POST": "add",
+    "PUT": "edit",
+    "PATCH": "edit",
+    "DELETE": "delete",
+}
+
+
+class HasMenuPermission(BasePermission):
+    """
+    Checks the caller's role against the view's ``menu_id`` (and optional
+    ``menu_portal_id``), using the permission implied by the HTTP method
+    unless the view sets ``menu_action``. Answered from the compiled
+    permission matrix, so no query per request once the role is cached.
+
+        class BranchListView(APIView):
+            permission_classes = [IsAuthenticated, IsTokenValid, HasMenuPermission]
+            menu_id = BRANCH
+    """
+
+    message = "You do not have permission to access this menu."
+
+    def has_permission(self, request, view):
+        menu_id = getattr(view, "menu_id", None)
+        if menu_id is None:
+            return True
+        action = getattr(view, "menu_action", None) or METHOD_ACTIONS.get(
+            request.method, "view"
+        )
+        return has_menu_permission(
+            request.user,
+            menu_id,
+            action,
+            portal_id=getattr(view, "menu_portal_id", None),
+            request=request,
+        )
@@ -1,9 +1,8 @@
 from rest_framework.permissions import BasePermission
 from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
-from auth_system.models.blacklist import BlackListedToken
-from auth_system.models.login_session import LoginSession
 from auth_system.utils.common import get_client_ip_and_agent
+from auth_system.utils.session_cache import get_session_state
 
 
 class IsTokenValid(BasePermission):
@@ -12,6 +11,9 @@ class IsTokenValid(BasePermission):
     1. Token is present and structurally valid
     2. Token is not blacklisted (i.e., the user has not logged out)
     3. Token is being used from the same IP and browser (agent)
+
+    Session and blacklist state come from the token-keyed session cache, so
+    steady-state requests do not query the database here.
     """
 
     message = "You do not have permission to perform this action."
@@ -28,7 +30,9 @@ class IsTokenValid(BasePermission):
             self.message = "Authentication credentials are missing or the user is not authenticated."
             return False
 
-        if BlackListedToken.objects.filter(token=raw_token, user=user).exists():
+        session_state = get_session_state(raw_token, request)
+
+        if user.id in session_state["blacklisted_user_ids"]:
             self.message = (
                 "Your session has expired or you have logged out. Please sign in again."
             )
@@ -42,14 +46,12 @@ class IsTokenValid(BasePermission):
 
         # --- IP and Agent Check ---
         ip, agent = get_client_ip_and_agent(request)
-        session = LoginSession.objects.filter(
-            user=user.id,
-            token=raw_token,
-            is_active=True,
-            logout_at__isnull=True,
-            ip_address=ip,
-            agent_browser=agent,
-        ).first()
+        session = (
+            session_state["active"]
+            and session_state["user_id"] == user.id
+            and session_state["ip_address"] == ip
+            and session_state["agent_browser"] == agent
+        )
         if not session:
             self.message = "Your session is not valid for this device or browser."
             return False
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from auth_system.models.user import TblUser
-from django.contrib.auth.hashers import make_password
+from auth_system.utils.password_hashing import hash_password
 import re
 
 
@@ -79,5 +79,5 @@ class TblUserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop("confirm_password")
-        validated_data["password"] = make_password(validated_data["password"])
+        validated_data["password"] = hash_password(validated_data["password"])
         return super().create(validated_data)
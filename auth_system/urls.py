@@ -15,6 +15,7 @@ from auth_system.views.auth_view import (
     # ResetUserPasswordView,
     # UnblockLoginAttemptsView,
 )
+from auth_system.views.export_job_view import ExportJobDetailView, ExportJobDownloadView
 
 
 urlpatterns = [
@@ -28,6 +29,9 @@ urlpatterns = [
     path("lead-login/", LeadLoginView.as_view(), name="lead-login"),
     path("lead-verify-otp/", LeadTwoFactorVerifyView.as_view(), name="lead-verify-otp"),
     path("dealer-login/", DealerLoginView.as_view(), name="dealer-login"),
+    # Background export jobs
+    path("export-jobs/<int:job_id>/", ExportJobDetailView.as_view(), name="export-job-detail"),
+    path("export-jobs/<int:job_id>/download/", ExportJobDownloadView.as_view(), name="export-job-download"),
     # path("reset-user-password/", ResetUserPasswordView.as_view(), name="reset"),
     # path(
     #     "unblock-login-attempts/",
@@ -0,0 +1,219 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+APILOG_APPS = ["auth_system", "ems", "cms", "lead", "code_of_conduct"]
+
+MODE_SYNC = "sync"
+MODE_ASYNC = "async"
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+DEFAULT_PIPELINE_SETTINGS = {
+    "MODE": MODE_SYNC,
+    "QUEUE_SIZE": 10000,
+    "BATCH_SIZE": 200,
+    "FLUSH_INTERVAL": 2.0,
+    "OVERFLOW_POLICY": DROP_NEWEST,
+    "BLOCK_TIMEOUT": 0.05,
+}
+
+
+def get_pipeline_settings():
+    conf = dict(DEFAULT_PIPELINE_SETTINGS)
+    conf.update(getattr(settings, "API_LOG_PIPELINE", {}) or {})
+    if conf["OVERFLOW_POLICY"] not in OVERFLOW_POLICIES:
+        raise ValueError(
+            f"API_LOG_PIPELINE OVERFLOW_POLICY must be one of {OVERFLOW_POLICIES}"
+        )
+    return conf
+
+
+def resolve_apilog_models():
+    """Map app name -> APILog model class, resolved once from the app registry."""
+    models = {}
+    for app_name in APILOG_APPS:
+        try:
+            models[app_name] = apps.get_model(app_name, "APILog")
+        except LookupError as e:
+            logger.warning(f"[AuditLog] No APILog model for {app_name}: {e}")
+    return models
+
+
+class AuditLogPipeline:
+    """
+    In-process bounded queue of API log records.
+
+    Request threads only enqueue a plain dict of APILog field values. A single
+    daemon thread drains the queue and writes one ``bulk_create`` per APILog
+    model whenever BATCH_SIZE records are waiting or FLUSH_INTERVAL seconds
+    have passed.
+    """
+
+    def __init__(self, models, conf=None):
+        conf = conf or get_pipeline_settings()
+        self.models = models
+        self.mode = conf["MODE"]
+        self.batch_size = int(conf["BATCH_SIZE"])
+        self.flush_interval = float(conf["FLUSH_INTERVAL"])
+        self.overflow_policy = conf["OVERFLOW_POLICY"]
+        self.block_timeout = float(conf["BLOCK_TIMEOUT"])
+        self._queue = queue.Queue(maxsize=int(conf["QUEUE_SIZE"]))
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+        self._counters = {"queued": 0, "flushed": 0, "dropped": 0, "failed": 0}
+
+    def _incr(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters["pending"] = self._queue.qsize()
+        counters["mode"] = self.mode
+        return counters
+
+    def submit(self, app_name, record):
+        """Accept one record for ``app_name``; returns False if it was dropped."""
+        if app_name not in self.models:
+            return False
+        if self.mode != MODE_ASYNC:
+            return self._write_now(app_name, record)
+
+        self._ensure_writer()
+        item = (app_name, record)
+        if self._put(item):
+            self._incr("queued")
+            return True
+        self._incr("dropped")
+        return False
+
+    def _put(self, item):
+        if self.overflow_policy == BLOCK:
+            try:
+                self._queue.put(item, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            if self.overflow_policy != DROP_OLDEST:
+                return False
+        try:
+            self._queue.get_nowait()
+            self._incr("dropped")
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def _write_now(self, app_name, record):
+        try:
+            self._build(app_name, record).save()
+            self._incr("flushed")
+            return True
+        except Exception as e:
+            self._incr("failed")
+            logger.error(f"[AuditLog] APILog save failed: {e}")
+            return False
+
+    def _build(self, app_name, record):
+        return self.models[app_name](**record)
+
+    def _ensure_writer(self):
+        # Threads do not survive a fork, so restart the writer per worker pid.
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="api-audit-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(deadline - time.monotonic(), 0)
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
+
+            stopping = self._stopping.is_set()
+            if (
+                len(batch) >= self.batch_size
+                or time.monotonic() >= deadline
+                or (stopping and self._queue.empty())
+            ):
+                if batch:
+                    self._flush(batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+                if stopping and self._queue.empty():
+                    return
+
+    def _flush(self, batch):
+        grouped = {}
+        for app_name, record in batch:
+            try:
+                grouped.setdefault(app_name, []).append(self._build(app_name, record))
+            except Exception as e:
+                self._incr("failed")
+                logger.error(f"[AuditLog] Could not build APILog record: {e}")
+
+        for app_name, objs in grouped.items():
+            try:
+                self.models[app_name].objects.bulk_create(
+                    objs, batch_size=self.batch_size
+                )
+                self._incr("flushed", len(objs))
+            except Exception as e:
+                self._incr("failed", len(objs))
+                logger.error(f"[AuditLog] bulk_create for {app_name} failed: {e}")
+        close_old_connections()
+
+    def shutdown(self, timeout=5.0):
+        """Drain what is still queued; registered with atexit."""
+        if not self._thread or not self._thread.is_alive():
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_audit_log_pipeline():
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = AuditLogPipeline(resolve_apilog_models())
+                atexit.register(_pipeline.shutdown)
+    return _pipeline
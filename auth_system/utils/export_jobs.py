@@ -0,0 +1,285 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import secrets
+import socket
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from openpyxl import Workbook
+
+from auth_system.models.export_job import ExportJob
+from constants import EXPORT_JOB_ENQUIRY_REPORT, EXPORT_JOB_RAS_DATA, ExportJobStatus
+
+logger = logging.getLogger(__name__)
+
+# job_type -> dotted path of handler(params, export_format, target_path, progress)
+EXPORT_JOB_HANDLERS = {
+    EXPORT_JOB_ENQUIRY_REPORT: "lead.utils.enquiry_export.run_enquiry_report_export",
+    EXPORT_JOB_RAS_DATA: "code_of_conduct.utils.ras_export.run_ras_data_export",
+}
+
+EXPORT_JOB_DIR = "exports"
+PROGRESS_UPDATE_EVERY = 1000
+
+
+def get_export_cache_window():
+    return timedelta(seconds=getattr(settings, "EXPORT_JOB_CACHE_SECONDS", 600))
+
+
+def get_export_stale_after():
+    return timedelta(seconds=getattr(settings, "EXPORT_JOB_STALE_SECONDS", 900))
+
+
+def get_params_hash(job_type, export_format, params):
+    payload = json.dumps(
+        {"job_type": job_type, "format": export_format, "params": params},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def enqueue_export_job(job_type, export_format, params, user_id):
+    """
+    Queue an export, or reuse one when an identical export (same type, format
+    and filters) finished inside EXPORT_JOB_CACHE_SECONDS and its file is
+    still on disk. A reused result is recorded as a new COMPLETED job owned by
+    the requesting user so download permissions stay per user; it keeps the
+    original finished_at, so the file expires on the original schedule.
+    """
+    params_hash = get_params_hash(job_type, export_format, params)
+
+    cached = (
+        ExportJob.objects.filter(
+            params_hash=params_hash,
+            status=ExportJobStatus.COMPLETED,
+            finished_at__gte=timezone.now() - get_export_cache_window(),
+        )
+        .order_by("-finished_at")
+        .first()
+    )
+    if cached and cached.file_path and os.path.exists(
+        os.path.join(settings.MEDIA_ROOT, cached.file_path)
+    ):
+        if cached.created_by == user_id:
+            return cached
+        return ExportJob.objects.create(
+            job_type=job_type,
+            export_format=export_format,
+            params=params,
+            params_hash=params_hash,
+            status=ExportJobStatus.COMPLETED,
+            progress=100,
+            total_rows=cached.total_rows,
+            processed_rows=cached.processed_rows,
+            file_path=cached.file_path,
+            created_by=user_id,
+            started_at=timezone.now(),
+            finished_at=cached.finished_at,
+        )
+
+    # A RUNNING job that stopped reporting progress has lost its worker.
+    in_flight = ExportJob.objects.filter(
+        Q(status=ExportJobStatus.PENDING)
+        | Q(
+            status=ExportJobStatus.RUNNING,
+            heartbeat_at__gte=timezone.now() - get_export_stale_after(),
+        ),
+        params_hash=params_hash,
+        created_by=user_id,
+    ).first()
+    if in_flight:
+        return in_flight
+
+    return ExportJob.objects.create(
+        job_type=job_type,
+        export_format=export_format,
+        params=params,
+        params_hash=params_hash,
+        created_by=user_id,
+    )
+
+
+def get_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next_job(worker_id):
+    """
+    Atomically move the oldest PENDING job to RUNNING. SKIP LOCKED lets any
+    number of worker processes poll the table in parallel without picking up
+    the same job.
+    """
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ExportJobStatus.PENDING)
+            .order_by("created_at", "id")
+            .first()
+        )
+        if not job:
+            return None
+        now = timezone.now()
+        job.status = ExportJobStatus.RUNNING
+        job.worker_id = worker_id
+        job.started_at = now
+        job.heartbeat_at = now
+        # Random, so the PII in it cannot be fetched by guessing the name.
+        job.file_path = os.path.join(
+            EXPORT_JOB_DIR,
+            job.job_type,
+            f"{job.job_type}_{secrets.token_urlsafe(24)}.{job.export_format}",
+        )
+        job.save(update_fields=["status", "worker_id", "started_at", "heartbeat_at", "file_path"])
+        return job
+
+
+def release_stale_jobs():
+    """Queue again RUNNING jobs whose worker died (no progress for a while)."""
+    return ExportJob.objects.filter(
+        status=ExportJobStatus.RUNNING,
+        heartbeat_at__lt=timezone.now() - get_export_stale_after(),
+    ).update(
+        status=ExportJobStatus.PENDING,
+        worker_id=None,
+        started_at=None,
+        heartbeat_at=None,
+        progress=0,
+        processed_rows=0,
+    )
+
+
+def purge_expired_exports():
+    """
+    Delete export files older than the cache window: those of COMPLETED jobs
+    that finished before it (their file_path is cleared, so downloads answer
+    410) and leftovers of failed or abandoned runs.
+    """
+    cutoff = timezone.now() - get_export_cache_window()
+    expired = ExportJob.objects.filter(
+        status=ExportJobStatus.COMPLETED,
+        finished_at__lt=cutoff,
+        file_path__isnull=False,
+    )
+    expired.update(file_path=None)
+
+    live = set(
+        ExportJob.objects.filter(file_path__isnull=False)
+        .exclude(status=ExportJobStatus.FAILED)
+        .values_list("file_path", flat=True)
+    )
+    removed = 0
+    root = os.path.join(settings.MEDIA_ROOT, EXPORT_JOB_DIR)
+    for directory, _, files in os.walk(root):
+        for name in files:
+            full_path = os.path.join(directory, name)
+            if os.path.relpath(full_path, settings.MEDIA_ROOT) in live:
+                continue
+            try:
+                if os.path.getmtime(full_path) < cutoff.timestamp():
+                    os.remove(full_path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def run_export_job(job):
+    relative_path = job.file_path
+    full_path = os.path.join(settings.MEDIA_ROOT, relative_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    # Every write is conditional on the job still being ours: a job released
+    # as stale may meanwhile be running on another worker.
+    owned = ExportJob.objects.filter(
+        pk=job.pk, status=ExportJobStatus.RUNNING, worker_id=job.worker_id
+    )
+
+    def progress(processed, total):
+        job.processed_rows = processed
+        job.total_rows = total
+        job.progress = int(processed * 100 / total) if total else 100
+        owned.update(
+            processed_rows=job.processed_rows,
+            total_rows=job.total_rows,
+            progress=job.progress,
+            heartbeat_at=timezone.now(),
+        )
+
+    try:
+        handler = import_string(EXPORT_JOB_HANDLERS[job.job_type])
+        handler(job.params, job.export_format, full_path, progress)
+    except Exception as e:
+        logger.exception("Export job #%s failed", job.pk)
+        job.status = ExportJobStatus.FAILED
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        owned.update(
+            status=job.status, error=job.error, finished_at=job.finished_at, file_path=None
+        )
+        if os.path.exists(full_path):
+            os.remove(full_path)
+        return job
+
+    job.status = ExportJobStatus.COMPLETED
+    job.progress = 100
+    job.finished_at = timezone.now()
+    if not owned.update(status=job.status, progress=job.progress, finished_at=job.finished_at):
+        os.remove(full_path)
+    return job
+
+
+def iter_with_progress(rows, total, progress, every=PROGRESS_UPDATE_EVERY):
+    processed = 0
+    progress(processed, total)
+    for row in rows:
+        yield row
+        processed += 1
+        if processed % every == 0:
+            progress(processed, total)
+    progress(processed, total)
+
+
+def write_export_file(columns, rows, export_format, target_path, sheet_title="Sheet1"):
+    """Write ``rows`` to disk one at a time (write-only xlsx or csv)."""
+    if export_format == "csv":
+        with open(target_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(["" if value is None else value for value in row])
+        return
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append(columns)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(target_path)
+
+
+def export_job_payload(job):
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "format": job.export_format,
+        "status": job.get_status_display(),
+        "progress": job.progress,
+        "processed_rows": job.processed_rows,
+        "total_rows": job.total_rows,
+        "error": job.error,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+        "status_url": f"/api/auth_system/export-jobs/{job.id}/",
+        "download_url": (
+            f"/api/auth_system/export-jobs/{job.id}/download/"
+            if job.status == ExportJobStatus.COMPLETED
+            else None
+        ),
+    }
@@ -0,0 +1,161 @@
+import threading
+from collections import namedtuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from decouple import config
+
+# delivered: the gateway accepted it. retryable: worth another attempt
+# (network trouble, 5xx), as opposed to a rejected number or address.
+DeliveryResult = namedtuple("DeliveryResult", ["delivered", "response", "retryable"])
+
+PINNACLE_SMS_URL = "http://api.pinnacle.in/index.php/sms/json"
+PINNACLE_SENDER = "berarf"
+
+
+class PinnacleSmsBackend:
+    """Pinnacle JSON SMS API over one pooled keep-alive session."""
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self.api_key = config("API_SMS_KEY")
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, messages, template_id):
+        """POST one JSON request; returns (body, error DeliveryResult or None)."""
+        payload = {
+            "sender": PINNACLE_SENDER,
+            "message": [
+                {"number": f"91{mobile_number}", "text": text}
+                for mobile_number, text in messages
+            ],
+            "messagetype": "TXT",
+            "dlttempid": template_id,
+        }
+        headers = {"apikey": self.api_key, "Content-Type": "application/json"}
+        try:
+            response = self.session.post(
+                PINNACLE_SMS_URL, json=payload, headers=headers, timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            return None, DeliveryResult(False, str(e), True)
+
+        if response.status_code >= 500:
+            return None, DeliveryResult(False, response.text, True)
+        try:
+            return response.json(), None
+        except ValueError:
+            return None, DeliveryResult(False, f"Invalid response: {response.text}", False)
+
+    def send_sms(self, mobile_number, text, template_id):
+        body, error = self._post([(mobile_number, text)], template_id)
+        if error:
+            return error
+        delivered = str(body.get("status", "")).lower() == "success"
+        return DeliveryResult(delivered, str(body), False)
+
+    def send_bulk_sms(self, messages, template_id):
+        """
+        Send [(mobile_number, text), ...] with one template in a single
+        request. Returns one DeliveryResult per message, in order.
+        """
+        body, error = self._post(messages, template_id)
+        if error:
+            return [error] * len(messages)
+        if str(body.get("status", "")).lower() != "success":
+            return [DeliveryResult(False, str(body), False)] * len(messages)
+
+        # The gateway echoes a uniqueid per accepted number; a number that
+        # is missing from "data" was rejected.
+        data = body.get("data")
+        if not isinstance(data, list):
+            return [DeliveryResult(True, str(body), False)] * len(messages)
+        accepted = {str(item.get("mobile")): item for item in data if isinstance(item, dict)}
+        results = []
+        for mobile_number, _ in messages:
+            item = accepted.get(f"91{mobile_number}")
+            if item is None:
+                results.append(DeliveryResult(False, "rejected by gateway", False))
+            else:
+                results.append(DeliveryResult(True, str(item), False))
+        return results
+
+
+class SmtpEmailBackend:
+    """Django's configured email backend, one connection kept open per thread."""
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = get_connection(timeout=self.timeout)
+            connection.open()
+            self._local.connection = connection
+        return connection
+
+    def _reset(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def send_email(self, email, subject, body):
+        message = EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [email])
+        for last_try in (False, True):
+            try:
+                message.connection = self._connection()
+                sent = message.send()
+                return DeliveryResult(bool(sent), "sent" if sent else "not sent", False)
+            except Exception as e:
+                # A kept-open connection may have been dropped by the server;
+                # reconnect once before giving up on this attempt.
+                self._reset()
+                if last_try:
+                    return DeliveryResult(False, str(e), True)
+
+
+class LocalFakeBackend:
+    """
+    In-memory gateway for tests and local runs: records every message in
+    ``outbox`` and fails the ones whose address is in ``fail_for``.
+    """
+
+    outbox = []
+    fail_for = set()
+    _lock = threading.Lock()
+
+    def __init__(self, timeout=None):
+        pass
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls.outbox.clear()
+            cls.fail_for.clear()
+
+    def _record(self, kind, to, **fields):
+        with self._lock:
+            self.outbox.append({"kind": kind, "to": to, **fields})
+        if to in self.fail_for:
+            return DeliveryResult(False, "fake failure", True)
+        return DeliveryResult(True, "fake delivered", False)
+
+    def send_sms(self, mobile_number, text, template_id):
+        return self._record("sms", mobile_number, text=text, template_id=template_id)
+
+    def send_bulk_sms(self, messages, template_id):
+        return [self.send_sms(mobile_number, text, template_id) for mobile_number, text in messages]
+
+    def send_email(self, email, subject, body):
+        return self._record("email", email, subject=subject, body=body)
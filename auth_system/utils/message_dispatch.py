@@ -0,0 +1,313 @@
+import atexit
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from auth_system.models.email_logs import EmailLogs
+from auth_system.models.sms_log import SmsLog
+from constants import DeliveryStatus
+
+logger = logging.getLogger(__name__)
+
+MODE_THREAD = "thread"
+MODE_WORKER = "worker"
+MODE_SYNC = "sync"
+
+DEFAULT_DISPATCH_SETTINGS = {
+    "MODE": MODE_THREAD,
+    "THREADS": 4,
+    "SMS_BACKEND": "auth_system.utils.message_backends.PinnacleSmsBackend",
+    "EMAIL_BACKEND": "auth_system.utils.message_backends.SmtpEmailBackend",
+    "TIMEOUT": 10,
+    "MAX_ATTEMPTS": 3,
+    # Seconds before retry n is RETRY_BACKOFF * 2 ** (n - 1).
+    "RETRY_BACKOFF": 15,
+    # A claimed message not finished within this many seconds is handed out again.
+    "CLAIM_TIMEOUT": 120,
+    # MODE "thread": every SWEEP_INTERVAL seconds each web process releases
+    # stale claims and sends up to SWEEP_BATCH due messages per table, so
+    # retries and messages lost to a restart go out without a separate
+    # worker. 0 turns the sweep off.
+    "SWEEP_INTERVAL": 30,
+    "SWEEP_BATCH": 50,
+}
+
+SMS = "sms"
+EMAIL = "email"
+MESSAGE_MODELS = {SMS: SmsLog, EMAIL: EmailLogs}
+# Campaign SMS are sent in batches by code_of_conduct.utils.link_campaign,
+# not one at a time through this queue.
+QUEUE_FILTERS = {SMS: Q(campaign_id__isnull=True), EMAIL: Q()}
+
+
+def get_dispatch_settings():
+    conf = dict(DEFAULT_DISPATCH_SETTINGS)
+    conf.update(getattr(settings, "MESSAGE_DISPATCH", {}) or {})
+    return conf
+
+
+def get_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+# --- enqueue (request side) ---
+def queue_sms(mobile_number, text, template_id, sms_type, user_id=None, request_id=None):
+    """Store a PENDING SmsLog and hand it to the dispatcher once committed."""
+    log = SmsLog.objects.create(
+        user_id=user_id,
+        mobile_number=mobile_number,
+        message=text,
+        template_id=template_id,
+        sms_type=sms_type,
+        request_id=request_id,
+        status=DeliveryStatus.PENDING,
+    )
+    get_dispatcher().submit_on_commit(SMS, log.pk)
+    return log
+
+
+def queue_email(email, subject, body, email_type, user_id=None, request_id=None):
+    """Store a PENDING EmailLogs row and hand it to the dispatcher once committed."""
+    log = EmailLogs.objects.create(
+        user_id=user_id,
+        email=email,
+        subject=subject,
+        message=body,
+        email_type=email_type,
+        request_id=request_id,
+        status=DeliveryStatus.PENDING,
+    )
+    get_dispatcher().submit_on_commit(EMAIL, log.pk)
+    return log
+
+
+# --- delivery (worker side) ---
+def due_filter(kind, now):
+    return QUEUE_FILTERS[kind] & Q(status=DeliveryStatus.PENDING) & (
+        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+    )
+
+
+def claim_message(kind, pk, worker_id):
+    """Take one PENDING message; False if another worker already has it."""
+    now = timezone.now()
+    return bool(
+        MESSAGE_MODELS[kind]
+        .objects.filter(due_filter(kind, now), pk=pk, worker_id__isnull=True)
+        .update(worker_id=worker_id, claimed_at=now)
+    )
+
+
+def claim_due_messages(kind, worker_id, limit):
+    """
+    Claim up to ``limit`` due messages. SKIP LOCKED lets several worker
+    processes poll the same table without taking the same rows.
+    """
+    model = MESSAGE_MODELS[kind]
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            model.objects.select_for_update(skip_locked=True)
+            .filter(due_filter(kind, now), worker_id__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)[:limit]
+        )
+        model.objects.filter(pk__in=ids).update(worker_id=worker_id, claimed_at=now)
+    return ids
+
+
+def release_stale_claims(conf=None):
+    """Hand back messages whose worker died mid-delivery."""
+    conf = conf or get_dispatch_settings()
+    cutoff = timezone.now() - timedelta(seconds=conf["CLAIM_TIMEOUT"])
+    released = 0
+    for kind, model in MESSAGE_MODELS.items():
+        released += model.objects.filter(
+            QUEUE_FILTERS[kind],
+            status=DeliveryStatus.PENDING,
+            worker_id__isnull=False,
+            claimed_at__lt=cutoff,
+        ).update(worker_id=None, claimed_at=None)
+    return released
+
+
+def deliver_message(kind, pk, backends, conf):
+    """
+    Send one claimed message and record the outcome. Returns the delay in
+    seconds before the next attempt when it failed in a retryable way.
+    """
+    model = MESSAGE_MODELS[kind]
+    log = model.objects.filter(pk=pk).first()
+    if log is None or log.status != DeliveryStatus.PENDING:
+        return None
+
+    try:
+        if kind == SMS:
+            result = backends[SMS].send_sms(log.mobile_number, log.message, log.template_id)
+        else:
+            result = backends[EMAIL].send_email(log.email, log.subject, log.message)
+    except Exception as e:
+        logger.exception("Sending %s #%s failed", kind, pk)
+        result = (False, str(e), True)
+    delivered, response, retryable = result
+
+    now = timezone.now()
+    attempts = log.attempts + 1
+    update = {
+        "attempts": attempts,
+        "response": response,
+        "worker_id": None,
+        "claimed_at": None,
+    }
+    retry_in = None
+    if delivered:
+        update.update(status=DeliveryStatus.DELIVERED, delivered_at=now)
+    elif retryable and attempts < conf["MAX_ATTEMPTS"]:
+        retry_in = conf["RETRY_BACKOFF"] * 2 ** (attempts - 1)
+        update["next_attempt_at"] = now + timedelta(seconds=retry_in)
+    else:
+        update["status"] = DeliveryStatus.FAILED
+    model.objects.filter(pk=pk).update(**update)
+    return retry_in
+
+
+def load_backends(conf):
+    return {
+        SMS: import_string(conf["SMS_BACKEND"])(timeout=conf["TIMEOUT"]),
+        EMAIL: import_string(conf["EMAIL_BACKEND"])(timeout=conf["TIMEOUT"]),
+    }
+
+
+class MessageDispatcher:
+    """
+    Sends queued SMS / email off the request path.
+
+    MODE "thread": a pool of THREADS worker threads in this process picks
+    each message up right after its request commits and retries it on a
+    timer; a sweeper thread also sends whatever is due from the table, which
+    covers retries and claims lost when a process restarts. MODE "worker":
+    messages stay PENDING for ``manage.py run_message_worker``. MODE "sync":
+    sent inside the request.
+    """
+
+    def __init__(self, conf=None):
+        self.conf = conf or get_dispatch_settings()
+        self.mode = self.conf["MODE"]
+        self.backends = load_backends(self.conf)
+        self._executor = None
+        self._pid = None
+        self._sweeper = None
+        self._sweeper_pid = None
+        self._lock = threading.Lock()
+
+    def submit_on_commit(self, kind, pk):
+        if self.mode == MODE_WORKER:
+            return
+        transaction.on_commit(lambda: self.submit(kind, pk))
+
+    def submit(self, kind, pk):
+        if self.mode == MODE_SYNC:
+            self.run(kind, pk)
+            return
+        self._get_executor().submit(self._run_in_thread, self.run, kind, pk)
+
+    def _get_executor(self):
+        # Threads do not survive a fork, so start the pool per worker pid.
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.conf["THREADS"],
+                    thread_name_prefix="message-dispatch",
+                )
+        return self._executor
+
+    def _run_in_thread(self, func, kind, pk):
+        try:
+            func(kind, pk)
+        except Exception:
+            logger.exception("Delivering %s #%s failed", kind, pk)
+        finally:
+            close_old_connections()
+
+    def run(self, kind, pk):
+        if not claim_message(kind, pk, get_worker_id()):
+            return
+        self.deliver(kind, pk)
+
+    def deliver(self, kind, pk):
+        """Send a message this process has claimed."""
+        retry_in = deliver_message(kind, pk, self.backends, self.conf)
+        if retry_in is not None and self.mode == MODE_THREAD:
+            # Sooner than the sweep; next_attempt_at is stored either way.
+            timer = threading.Timer(retry_in, self.submit, args=(kind, pk))
+            timer.daemon = True
+            timer.start()
+
+    def ensure_sweeper(self):
+        """Start this process's sweeper thread (MODE "thread"); cheap to repeat."""
+        if self.mode != MODE_THREAD or not self.conf["SWEEP_INTERVAL"]:
+            return
+        # Threads do not survive a fork, so start it per worker pid.
+        if self._sweeper and self._sweeper.is_alive() and self._sweeper_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sweeper and self._sweeper.is_alive() and self._sweeper_pid == os.getpid():
+                return
+            self._sweeper_pid = os.getpid()
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="message-dispatch-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        worker_id = get_worker_id()
+        while True:
+            time.sleep(self.conf["SWEEP_INTERVAL"])
+            try:
+                self.sweep(worker_id)
+            except Exception:
+                logger.exception("Message sweep failed")
+            finally:
+                close_old_connections()
+
+    def sweep(self, worker_id):
+        """Release stale claims and hand due messages to the pool."""
+        release_stale_claims(self.conf)
+        claimed = 0
+        for kind in MESSAGE_MODELS:
+            for pk in claim_due_messages(kind, worker_id, self.conf["SWEEP_BATCH"]):
+                self._get_executor().submit(self._run_in_thread, self.deliver, kind, pk)
+                claimed += 1
+        return claimed
+
+    def shutdown(self):
+        """Finish the messages already handed to the pool; registered with atexit."""
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=True)
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = MessageDispatcher()
+                atexit.register(_dispatcher.shutdown)
+    return _dispatcher
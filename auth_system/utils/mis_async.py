@@ -0,0 +1,143 @@
+import asyncio
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+from rest_framework.response import Response
+
+from auth_system.utils.mis_cache import cache_key, get_mis_cache
+from auth_system.utils.mis_client import (
+    RETRY_STATUSES,
+    MISUnavailable,
+    get_mis_client,
+    is_cacheable_payload,
+    is_revoked_payload,
+    mis_payload,
+    mis_unavailable_response,
+    mis_unreachable_response,
+)
+from auth_system.utils.session_key_utils import get_mis_auth_headers
+
+# Connection failures worth another attempt (MIS never saw the request).
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+class AsyncMISClient:
+    """
+    MISClient for async views: an httpx.AsyncClient connection pool, with
+    the retry rules, circuit breaker and metrics of the shared sync client.
+    """
+
+    def __init__(self, sync_client=None):
+        self.sync_client = sync_client or get_mis_client()
+        conf = self.sync_client.conf
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=conf["ASYNC_MAX_CONNECTIONS"],
+                max_keepalive_connections=conf["POOL_MAXSIZE"],
+            ),
+        )
+
+    async def get(self, url, headers=None, params=None, timeout=30):
+        """
+        GET ``url`` and return the ``httpx.Response`` (any status).
+        Raises MISUnavailable while the circuit is open, and
+        httpx.HTTPError once retries are used up.
+        """
+        client = self.sync_client
+        endpoint = urlsplit(url).path
+        client.before_call(endpoint)
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            connect_timeout, read_timeout = client.attempt_timeout(started, timeout)
+            try:
+                response = await self.http.get(
+                    url,
+                    headers=headers,
+                    params=query_params(params),
+                    timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                )
+                error = None
+            except httpx.HTTPError as e:
+                response, error = None, e
+
+            retryable = isinstance(error, RETRY_ERRORS) or (
+                response is not None and response.status_code in RETRY_STATUSES
+            )
+            delay = client.retry_delay(attempt, started, timeout) if retryable else None
+            if delay is None:
+                break
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        client.after_call(
+            endpoint, started, error is not None or response.status_code >= 500, attempt
+        )
+        if error is not None:
+            raise error
+        return response
+
+
+def query_params(params):
+    """Params as requests would send them (one value per key, like QueryDict.items())."""
+    if not params:
+        return None
+    return [(key, value) for key, value in params.items() if value is not None]
+
+
+# httpx pools belong to the event loop that opened them.
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_mis_client():
+    """The AsyncMISClient of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncMISClient()
+    return client
+
+
+async def afetch_mis_payload(url, headers=None, params=None, timeout=30):
+    """fetch_mis_payload() for async callers."""
+    response = await get_async_mis_client().get(
+        url, headers=headers, params=params, timeout=timeout
+    )
+    return mis_payload(response.status_code, response.json, response.text)
+
+
+async def acall_mis_api(request, url, params=None, timeout=30, cache=True):
+    """call_mis_api() for async views: the same responses, cache and breaker."""
+    headers, error_response = get_mis_auth_headers(request)
+    if error_response:
+        return error_response
+
+    async def fetch():
+        return await afetch_mis_payload(url, headers=headers, params=params, timeout=timeout)
+
+    try:
+        response_cache = get_mis_cache() if cache else None
+        if response_cache is None:
+            (status_code, body), cache_status = await fetch(), None
+        else:
+            (status_code, body), cache_status = await response_cache.aget_or_fetch(
+                cache_key(url, params, headers["Session-Key"]),
+                fetch,
+                cacheable=is_cacheable_payload,
+                revoked=is_revoked_payload,
+            )
+
+        response = Response(body, status=status_code)
+        if cache_status:
+            response["X-Cache"] = cache_status
+        return response
+
+    except MISUnavailable as e:
+        return mis_unavailable_response(e.retry_after)
+
+    except (httpx.HTTPError, ValueError) as e:
+        # ValueError: a 200 whose body is not JSON, as requests reports it.
+        return mis_unreachable_response(e)
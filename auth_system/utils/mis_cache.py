@@ -0,0 +1,279 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIS_CACHE_SETTINGS = {
+    "ENABLED": True,
+    # Seconds a response is served as-is, then for how much longer it is
+    # still served while one background request refreshes it.
+    "TTL": 60,
+    "STALE_TTL": 300,
+    "MAX_ENTRIES": 2000,
+}
+
+CACHE_HIT = "HIT"
+CACHE_STALE = "STALE"
+CACHE_MISS = "MISS"
+
+
+def get_mis_cache_settings():
+    conf = dict(DEFAULT_MIS_CACHE_SETTINGS)
+    conf.update(getattr(settings, "MIS_CACHE", {}) or {})
+    return conf
+
+
+def normalize_params(params):
+    """Sorted, whitespace-trimmed params with empty values dropped."""
+    if not params:
+        return []
+    if hasattr(params, "lists"):
+        items = [(key, values) for key, values in params.lists()]
+    else:
+        items = [
+            (key, value if isinstance(value, (list, tuple)) else [value])
+            for key, value in params.items()
+        ]
+    normalized = []
+    for key, values in items:
+        values = [str(v).strip() for v in values if v is not None and str(v).strip()]
+        if values:
+            normalized.append((key, sorted(values)))
+    return sorted(normalized)
+
+
+def cache_key(url, params, session_key):
+    """
+    One entry per endpoint + params + Session-Key. MIS decides what a
+    session may see, so a response is never served to another session.
+    """
+    raw = json.dumps(
+        [urlsplit(url).path, normalize_params(params), session_key or ""]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """One upstream fetch that concurrent callers for the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MISResponseCache:
+    """
+    In-process LRU of successful MIS responses with stale-while-revalidate
+    and single-flight fetching: concurrent misses for the same key make one
+    upstream call, and a stale entry is refreshed in the background once.
+    Async callers (aget_or_fetch) share the entries with sync ones.
+    """
+
+    def __init__(self, ttl, stale_ttl, max_entries):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._flights = {}
+        self._async_flights = {}
+        self._refresh_tasks = set()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "revocations": 0,
+            "evictions": 0,
+        }
+
+    def _lookup(self, key, flights, new_flight):
+        """
+        Under the lock: ``(CACHE_HIT | CACHE_STALE, result, start_refresh)``
+        for a cached key, else ``(CACHE_MISS, flight, is_leader)``.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                fresh_until, stale_until, result = entry
+                if now < fresh_until:
+                    self._data.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return CACHE_HIT, result, False
+                if now < stale_until:
+                    self._data.move_to_end(key)
+                    self.stats["stale_hits"] += 1
+                    start_refresh = key not in self._refreshing
+                    self._refreshing.add(key)
+                    return CACHE_STALE, result, start_refresh
+                del self._data[key]
+
+            flight = flights.get(key)
+            if flight is not None:
+                self.stats["coalesced"] += 1
+                return CACHE_MISS, flight, False
+            flight = flights[key] = new_flight()
+            self.stats["misses"] += 1
+            return CACHE_MISS, flight, True
+
+    def get_or_fetch(self, key, fetch, cacheable, revoked=None):
+        """
+        Return ``(result, cache_status)``. ``fetch()`` produces the result
+        (and may raise); only results for which ``cacheable(result)`` is true
+        are stored. A background refresh whose result is ``revoked(result)``
+        drops the stale entry instead of serving it on; other failures keep
+        it until it expires.
+        """
+        cache_status, value, flag = self._lookup(key, self._flights, _Flight)
+        if cache_status != CACHE_MISS:
+            if flag:
+                threading.Thread(
+                    target=self._refresh, args=(key, fetch, cacheable, revoked), daemon=True
+                ).start()
+            return value, cache_status
+
+        flight, leader = value, flag
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, CACHE_MISS
+
+        try:
+            flight.result = fetch()
+            if cacheable(flight.result):
+                self._store(key, flight.result)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.result, CACHE_MISS
+
+    async def aget_or_fetch(self, key, fetch, cacheable, revoked=None):
+        """get_or_fetch() for async callers; ``fetch`` is a coroutine function."""
+        loop = asyncio.get_running_loop()
+        cache_status, value, flag = self._lookup(
+            key, self._async_flights, loop.create_future
+        )
+        if cache_status != CACHE_MISS:
+            if flag:
+                task = loop.create_task(self._arefresh(key, fetch, cacheable, revoked))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return value, cache_status
+
+        future, leader = value, flag
+        if not leader:
+            # shield(): a cancelled waiter must not cancel the shared fetch.
+            return await asyncio.shield(future), CACHE_MISS
+
+        try:
+            result = await fetch()
+            if cacheable(result):
+                self._store(key, result)
+            future.set_result(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so a flight nobody waited on does not log a warning.
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                self._async_flights.pop(key, None)
+        return result, CACHE_MISS
+
+    def _refresh(self, key, fetch, cacheable, revoked):
+        try:
+            self._refreshed(key, fetch(), cacheable, revoked)
+        except Exception as e:
+            self._refresh_failed(e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _arefresh(self, key, fetch, cacheable, revoked):
+        try:
+            self._refreshed(key, await fetch(), cacheable, revoked)
+        except Exception as e:
+            self._refresh_failed(e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refreshed(self, key, result, cacheable, revoked):
+        if cacheable(result):
+            self._store(key, result)
+        elif revoked is not None and revoked(result):
+            # e.g. the session lost access: stop serving what it saw.
+            with self._lock:
+                self._data.pop(key, None)
+                self.stats["revocations"] += 1
+        with self._lock:
+            self.stats["refreshes"] += 1
+
+    def _refresh_failed(self, error):
+        # Network error: keep serving the stale copy until it expires.
+        logger.warning("MIS cache refresh failed: %s", error)
+        with self._lock:
+            self.stats["refresh_errors"] += 1
+
+    def _store(self, key, result):
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = (now + self.ttl, now + self.ttl + self.stale_ttl, result)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"]
+            served = self.stats["hits"] + self.stats["stale_hits"]
+            return {
+                **self.stats,
+                "entries": len(self._data),
+                "hit_ratio": round(served / lookups, 4) if lookups else None,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_mis_cache():
+    """The process-wide MISResponseCache, or None when MIS_CACHE is disabled."""
+    global _cache
+    if _cache is None:
+        conf = get_mis_cache_settings()
+        if not conf["ENABLED"]:
+            return None
+        with _cache_lock:
+            if _cache is None:
+                _cache = MISResponseCache(
+                    conf["TTL"], conf["STALE_TTL"], conf["MAX_ENTRIES"]
+                )
+    return _cache
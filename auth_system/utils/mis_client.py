@@ -0,0 +1,384 @@
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from rest_framework import status
+from rest_framework.response import Response
+
+from auth_system.utils.mis_cache import cache_key, get_mis_cache
+from auth_system.utils.session_key_utils import get_mis_auth_headers
+
+DEFAULT_MIS_CLIENT_SETTINGS = {
+    # Keep-alive connections kept per MIS host (one per concurrent worker thread).
+    "POOL_CONNECTIONS": 4,
+    "POOL_MAXSIZE": 20,
+    # In-flight MIS calls one ASGI worker may hold (async views only).
+    "ASYNC_MAX_CONNECTIONS": 200,
+    "CONNECT_TIMEOUT": 3,
+    # Extra attempts after a connection error or a 502/503/504.
+    "MAX_RETRIES": 2,
+    "BACKOFF_BASE": 0.2,
+    "BACKOFF_MAX": 2.0,
+    # Consecutive failures that open the circuit, and how long it stays open
+    # before one trial request is let through.
+    "FAILURE_THRESHOLD": 5,
+    "RESET_SECONDS": 30,
+    # Latency samples kept per endpoint for the percentiles.
+    "METRICS_WINDOW": 200,
+}
+
+RETRY_STATUSES = (502, 503, 504)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def get_mis_client_settings():
+    conf = dict(DEFAULT_MIS_CLIENT_SETTINGS)
+    conf.update(getattr(settings, "MIS_CLIENT", {}) or {})
+    return conf
+
+
+class MISUnavailable(Exception):
+    """Raised without calling MIS while the circuit is open."""
+
+    def __init__(self, retry_after):
+        super().__init__("MIS circuit is open.")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures."""
+
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return
+            remaining = self.opened_at + self.reset_seconds - time.monotonic()
+            if self.state == CIRCUIT_OPEN and remaining <= 0:
+                self.state = CIRCUIT_HALF_OPEN
+            if self.state == CIRCUIT_HALF_OPEN and not self._trial_running:
+                # Let exactly one request find out whether MIS is back.
+                self._trial_running = True
+                return
+            raise MISUnavailable(max(int(remaining), 1))
+
+    def record_success(self):
+        with self._lock:
+            self.state = CIRCUIT_CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == CIRCUIT_HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CIRCUIT_OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures}
+
+
+class EndpointMetrics:
+    """Per-endpoint call counts and latency, kept in this process."""
+
+    def __init__(self, window):
+        self.window = window
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, endpoint):
+        entry = self._endpoints.get(endpoint)
+        if entry is None:
+            entry = self._endpoints[endpoint] = {
+                "calls": 0,
+                "errors": 0,
+                "retries": 0,
+                "short_circuited": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "samples": deque(maxlen=self.window),
+            }
+        return entry
+
+    def record(self, endpoint, elapsed_ms, ok, retries):
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry["calls"] += 1
+            entry["retries"] += retries
+            if not ok:
+                entry["errors"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["samples"].append(elapsed_ms)
+
+    def record_short_circuit(self, endpoint):
+        with self._lock:
+            self._entry(endpoint)["short_circuited"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for endpoint, entry in self._endpoints.items():
+                samples = sorted(entry["samples"])
+                result[endpoint] = {
+                    "calls": entry["calls"],
+                    "errors": entry["errors"],
+                    "retries": entry["retries"],
+                    "short_circuited": entry["short_circuited"],
+                    "avg_ms": round(entry["total_ms"] / entry["calls"], 2)
+                    if entry["calls"]
+                    else None,
+                    "p50_ms": _percentile(samples, 50),
+                    "p95_ms": _percentile(samples, 95),
+                    "max_ms": round(entry["max_ms"], 2),
+                }
+            return result
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return None
+    index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+    return round(samples[index], 2)
+
+
+class MISClient:
+    """
+    Shared HTTP client for the MIS data API: pooled keep-alive connections,
+    bounded retries with jittered backoff, and a circuit breaker that fails
+    fast while MIS is down.
+    """
+
+    def __init__(self, conf=None):
+        self.conf = conf or get_mis_client_settings()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.conf["POOL_CONNECTIONS"],
+            pool_maxsize=self.conf["POOL_MAXSIZE"],
+            max_retries=0,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.breaker = CircuitBreaker(
+            self.conf["FAILURE_THRESHOLD"], self.conf["RESET_SECONDS"]
+        )
+        self.metrics = EndpointMetrics(self.conf["METRICS_WINDOW"])
+
+    def backoff(self, attempt):
+        # Full jitter: a random wait up to the exponential step.
+        ceiling = min(self.conf["BACKOFF_MAX"], self.conf["BACKOFF_BASE"] * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    def attempt_timeout(self, started, timeout):
+        """
+        (connect, read) timeouts for the next attempt: whatever is left of
+        the call's ``timeout``, so retries share one budget.
+        """
+        remaining = max(timeout - (time.monotonic() - started), 0.001)
+        return min(self.conf["CONNECT_TIMEOUT"], remaining), remaining
+
+    def retry_delay(self, attempt, started, timeout):
+        """Wait before the next attempt, or None when out of retries or time."""
+        if attempt >= self.conf["MAX_RETRIES"]:
+            return None
+        delay = self.backoff(attempt)
+        if time.monotonic() - started + delay >= timeout:
+            return None
+        return delay
+
+    def before_call(self, endpoint):
+        try:
+            self.breaker.before_call()
+        except MISUnavailable:
+            self.metrics.record_short_circuit(endpoint)
+            raise
+
+    def after_call(self, endpoint, started, failed, retries):
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self.metrics.record(endpoint, elapsed_ms, not failed, retries)
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def get(self, url, headers=None, params=None, timeout=30):
+        """
+        GET ``url`` and return the ``requests.Response`` (any status).
+        Raises MISUnavailable while the circuit is open, and
+        requests.RequestException once retries are used up.
+        """
+        endpoint = urlsplit(url).path
+        self.before_call(endpoint)
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(
+                    url,
+                    headers=headers,
+                    params=params,
+                    timeout=self.attempt_timeout(started, timeout),
+                )
+                error = None
+            except requests.RequestException as e:
+                response, error = None, e
+
+            # Only failures to connect are retried; a read timeout means MIS
+            # took the request and retrying would multiply the wait.
+            retryable = isinstance(error, requests.ConnectionError) or (
+                response is not None and response.status_code in RETRY_STATUSES
+            )
+            delay = self.retry_delay(attempt, started, timeout) if retryable else None
+            if delay is None:
+                break
+            attempt += 1
+            time.sleep(delay)
+
+        self.after_call(
+            endpoint, started, error is not None or response.status_code >= 500, attempt
+        )
+        if error is not None:
+            raise error
+        return response
+
+    def snapshot(self):
+        response_cache = get_mis_cache()
+        return {
+            "circuit": self.breaker.snapshot(),
+            "endpoints": self.metrics.snapshot(),
+            "cache": response_cache.snapshot() if response_cache else None,
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_mis_client():
+    """The process-wide MISClient (one connection pool per worker process)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MISClient()
+    return _client
+
+
+def mis_payload(status_code, parse_json, text):
+    """``(status_code, body)`` in the proxy's response format."""
+    if status_code != 200:
+        try:
+            error_data = parse_json()
+        except Exception:
+            error_data = text or "Unknown error"
+
+        return status_code, {
+            "success": False,
+            "message": "MIS API request failed.",
+            "status_code": status_code,
+            "error": error_data,
+        }
+
+    return status.HTTP_200_OK, {
+        "success": True,
+        "message": "Data retrieved successfully.",
+        "data": parse_json(),
+    }
+
+
+def is_cacheable_payload(result):
+    return result[0] == status.HTTP_200_OK
+
+
+def is_revoked_payload(result):
+    """
+    MIS answered, and not with the data: 401 / 403 (session revoked or
+    permissions changed) or another 4xx. Only 5xx and network errors leave a
+    cached response in place.
+    """
+    return result[0] < status.HTTP_500_INTERNAL_SERVER_ERROR and not is_cacheable_payload(result)
+
+
+def fetch_mis_payload(url, headers=None, params=None, timeout=30):
+    """GET ``url`` and return ``(status_code, body)`` in the proxy's response format."""
+    response = get_mis_client().get(url, headers=headers, params=params, timeout=timeout)
+    return mis_payload(response.status_code, response.json, response.text)
+
+
+def mis_unavailable_response(retry_after):
+    return Response(
+        {
+            "success": False,
+            "message": "MIS service is temporarily unavailable.",
+        },
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def mis_unreachable_response(error):
+    return Response(
+        {
+            "success": False,
+            "message": "Unable to reach MIS service.",
+            "details": str(error),
+        },
+        status=status.HTTP_502_BAD_GATEWAY,
+    )
+
+
+def call_mis_api(request, url, params=None, timeout=30, cache=True):
+    """
+    Proxy a MIS GET for ``request`` and wrap the result in a DRF Response.
+    Successful lookups are served from the MIS response cache (per
+    Session-Key) unless ``cache=False``.
+    """
+    headers, error_response = get_mis_auth_headers(request)
+    if error_response:
+        return error_response
+
+    def fetch():
+        return fetch_mis_payload(url, headers=headers, params=params, timeout=timeout)
+
+    try:
+        response_cache = get_mis_cache() if cache else None
+        if response_cache is None:
+            (status_code, body), cache_status = fetch(), None
+        else:
+            (status_code, body), cache_status = response_cache.get_or_fetch(
+                cache_key(url, params, headers["Session-Key"]),
+                fetch,
+                cacheable=is_cacheable_payload,
+                revoked=is_revoked_payload,
+            )
+
+        response = Response(body, status=status_code)
+        if cache_status:
+            response["X-Cache"] = cache_status
+        return response
+
+    except MISUnavailable as e:
+        return mis_unavailable_response(e.retry_after)
+
+    except requests.RequestException as e:
+        return mis_unreachable_response(e)
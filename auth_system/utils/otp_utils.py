@@ -1,9 +1,7 @@
-from django.utils import timezone
-from auth_system.models.email_logs import EmailLogs
 from auth_system.models.otp import OTP
-from auth_system.models.sms_log import SmsLog
 from auth_system.utils.common import generate_otp, otp_expiry_time, generate_request_id
-from auth_system.utils.sms_utils import send_enquiry_otp_to_email,send_link,send_enquiry_otp_to_mobile , send_seized_emp_otp,send_seized_leadApp_otp
+from auth_system.utils.message_dispatch import queue_email, queue_sms
+from auth_system.utils.sms_utils import enquiry_otp_email, link_sms, seized_emp_otp_sms, seized_lead_app_otp_sms
 from constants import EmailType, OtpType, SmsType, DeliveryStatus
 
 
@@ -42,11 +40,6 @@ def send_Applogin_otp(user, app_signature):
     expiry = otp_expiry_time()
     request_id = generate_request_id()
     mobile = user.mobile_number
-    response = send_seized_leadApp_otp(mobile, otp_code, app_signature)
-    sms_status = (
-        DeliveryStatus.DELIVERED if "error" not in response else DeliveryStatus.FAILED
-    )
-    # sms_status = DeliveryStatus.DELIVERED
     OTP.objects.create(
         user_id=user.id,
         otp_type=OtpType.EMPLOYEE_LOGIN,
@@ -55,14 +48,14 @@ def send_Applogin_otp(user, app_signature):
         status=DeliveryStatus.PENDING,
         request_id=request_id,
     )
-    SmsLog.objects.create(
+    text, template_id = seized_lead_app_otp_sms(otp_code, app_signature)
+    queue_sms(
+        mobile,
+        text,
+        template_id,
+        SmsType.EMPLOYEE_LOGIN_OTP,
         user_id=user.id,
-        mobile_number=mobile,
-        message=f"Your OTP is {otp_code}. It is valid for 5 minutes.",
-        sms_type=SmsType.EMPLOYEE_LOGIN_OTP,
         request_id=request_id,
-        status=sms_status,
-        sent_at=timezone.now(),
     )
     return otp_code, expiry, request_id
 
@@ -72,11 +65,6 @@ def send_login_otp(user):
     expiry = otp_expiry_time()
     request_id = generate_request_id()
     mobile = user.mobile_number
-    response = send_seized_emp_otp(mobile, otp_code)
-    sms_status = (
-        DeliveryStatus.DELIVERED if "error" not in response else DeliveryStatus.FAILED
-    )
-    # sms_status = DeliveryStatus.DELIVERED
     OTP.objects.create(
         user_id=user.id,
         otp_type=OtpType.EMPLOYEE_LOGIN,
@@ -85,14 +73,14 @@ def send_login_otp(user):
         status=DeliveryStatus.PENDING,
         request_id=request_id,
     )
-    SmsLog.objects.create(
+    text, template_id = seized_emp_otp_sms(otp_code)
+    queue_sms(
+        mobile,
+        text,
+        template_id,
+        SmsType.EMPLOYEE_LOGIN_OTP,
         user_id=user.id,
-        mobile_number=mobile,
-        message=f"Your OTP is {otp_code}. It is valid for 5 minutes.",
-        sms_type=SmsType.EMPLOYEE_LOGIN_OTP,
         request_id=request_id,
-        status=sms_status,
-        sent_at=timezone.now(),
     )
     return otp_code, expiry, request_id
 
@@ -100,12 +88,6 @@ def enquiry_mobile_otp(mobile, user_id=None):
     otp_code = generate_otp()
     expiry = otp_expiry_time()
     request_id = generate_request_id()
-    sms_status = (
-        DeliveryStatus.DELIVERED
-        if send_enquiry_otp_to_mobile(mobile, otp_code)
-        else DeliveryStatus.FAILED
-    )
-    # sms_status = DeliveryStatus.DELIVERED
     OTP.objects.create(
         user_id=user_id,
         otp_type=OtpType.LEAD_VERIFICATION,
@@ -114,14 +96,14 @@ def enquiry_mobile_otp(mobile, user_id=None):
         status=DeliveryStatus.PENDING,
         request_id=request_id,
     )
-    SmsLog.objects.create(
+    text, template_id = seized_emp_otp_sms(otp_code)
+    queue_sms(
+        mobile,
+        text,
+        template_id,
+        SmsType.LEAD_VERIFICATION_OTP,
         user_id=user_id,
-        mobile_number=mobile,
-        message=f"Your OTP is {otp_code}. It is valid for 5 minutes.",
-        sms_type=SmsType.LEAD_VERIFICATION_OTP,
         request_id=request_id,
-        status=sms_status,
-        sent_at=timezone.now(),
     )
     return otp_code, expiry, request_id
 
@@ -130,9 +112,6 @@ def enquiry_email_otp(email, user_id=None):
     otp_code = generate_otp()
     expiry = otp_expiry_time()
     request_id = generate_request_id()
-    result = send_enquiry_otp_to_email(email, otp_code)
-    if not result.get("success"):
-        return None, None
     OTP.objects.create(
         user_id=user_id,
         otp_type=OtpType.LEAD_VERIFICATION,
@@ -141,60 +120,28 @@ def enquiry_email_otp(email, user_id=None):
         status=DeliveryStatus.PENDING,
         request_id=request_id,
     )
-    return otp_code, expiry, request_id
-
-
-def enquiry_email_otp(email, user_id=None):
-    otp_code = generate_otp()
-    expiry = otp_expiry_time()
-    request_id = generate_request_id()
-    result = send_enquiry_otp_to_email(email, otp_code)
-    if not result.get("success"):
-        return None, None, None
-    OTP.objects.create(
+    subject, body = enquiry_otp_email(otp_code)
+    queue_email(
+        email,
+        subject,
+        body,
+        EmailType.ENQUIRY_VERIFICATION,
         user_id=user_id,
-        otp_type=OtpType.LEAD_VERIFICATION,
-        otp_code=otp_code,
-        expiry_at=expiry,
-        status=DeliveryStatus.PENDING,
-        request_id=request_id,
-    )
-    EmailLogs.objects.create(
-        user_id=user_id,
-        email=email,
-        message=f"Your OTP is {otp_code}. It is valid for 3 minutes.",
-        email_type=EmailType.ENQUIRY_VERIFICATION,
         request_id=request_id,
-        status=DeliveryStatus.DELIVERED,
-        sent_at=timezone.now(),
     )
     return otp_code, expiry, request_id
 
 
 def send_link_to_mobile(request, mobile, link):
-    # api_response = send_link(mobile, link)
-
-    # sms_status = (
-    #     DeliveryStatus.DELIVERED
-    #     if api_response and not api_response.get("error")
-    #     else DeliveryStatus.FAILED
-    # )
-
-    api_response = {
-        "code": 200,
-        "status": "success",
-        "data": [{"mobile": f"91{mobile}", "uniqueid": "dummy_unique_id_123456"}],
-    }
-
-    sms_status = DeliveryStatus.DELIVERED  # Always mark as delivered for dev
-
-    SmsLog.objects.create(
+    request_id = generate_request_id()
+    text, template_id = link_sms(link)
+    log = queue_sms(
+        mobile,
+        text,
+        template_id,
+        SmsType.DEPOSIT_AGENT_SEND_LINK,
         user_id=request.user.id,
-        mobile_number=mobile,
-        message=f"Your Link {link}.",
-        sms_type=SmsType.DEPOSIT_AGENT_SEND_LINK,
-        status=sms_status,
-        sent_at=timezone.now(),
+        request_id=request_id,
     )
-
-    return api_response
+    # Delivery happens after the response; the SmsLog row carries the outcome.
+    return {"status": "queued", "request_id": request_id, "sms_log_id": log.id}
@@ -1,14 +1,248 @@
+import base64
+import hashlib
+import json
+import logging
+import math
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from collections import OrderedDict
-import math
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGINATION_SETTINGS = {
+    # Seconds a cursor page's exact COUNT(*) is reused for the same query
+    # (0 = never cache). Page-number pages always count exactly.
+    "COUNT_CACHE_SECONDS": 60,
+    # Cursor pages report the planner's row estimate instead of running
+    # COUNT(*) once the estimate is above this (PostgreSQL only).
+    "ESTIMATE_COUNT_ABOVE": 10000,
+}
+
+PAGE_MODE = "page"
+CURSOR_MODE = "cursor"
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+
+
+def get_pagination_settings():
+    conf = dict(DEFAULT_PAGINATION_SETTINGS)
+    conf.update(getattr(settings, "PAGINATION", {}) or {})
+    return conf
+
+
+def _count_cache_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha256(f"{queryset.db}|{sql}|{params!r}".encode("utf-8"))
+    return f"pagination:count:{digest.hexdigest()}"
+
+
+def cached_count(queryset):
+    """COUNT(*) of ``queryset``, reused for COUNT_CACHE_SECONDS."""
+    timeout = get_pagination_settings()["COUNT_CACHE_SECONDS"]
+    if not timeout:
+        return queryset.count()
+    return cache.get_or_set(_count_cache_key(queryset), queryset.count, timeout)
+
+
+def estimated_count(queryset):
+    """The planner's row estimate for ``queryset``, or None if unavailable."""
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    try:
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        logger.warning("Count estimate failed", exc_info=True)
+        return None
 
 
 class CustomPagination(PageNumberPagination):
+    """
+    Page-number pagination by default. Keyset (cursor) pagination is used
+    when the view asks for it with ``CustomPagination(mode="cursor")`` or the
+    client sends ``?pagination=cursor`` / a ``cursor`` token.
+
+    Cursor pages seek on the queryset's own ordering (``-id``,
+    ``-created_at, -id`` ...) with ``WHERE (cols) < (last row)`` instead of
+    OFFSET, and only count rows when asked to (``?count=exact|estimate``).
+    Orderings on relations, expressions or nullable columns fall back to
+    page numbers.
+    """
+
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
 
+    mode = PAGE_MODE
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    # Used when the queryset has no ordering of its own.
+    keyset_ordering = ("-id",)
+    cursor_count_mode = COUNT_NONE
+
+    def __init__(self, mode=None, ordering=None, count=None):
+        if mode:
+            self.mode = mode
+        if ordering:
+            self.keyset_ordering = tuple(ordering)
+        if count:
+            self.cursor_count_mode = count
+
+    def is_cursor_mode(self, request):
+        return (
+            self.mode == CURSOR_MODE
+            or request.query_params.get(self.mode_query_param) == CURSOR_MODE
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = self.is_cursor_mode(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_keyset(queryset, request)
+
+    # --- keyset pagination ---
+    def get_keyset_ordering(self, queryset):
+        ordering = [str(o) for o in queryset.query.order_by] or list(
+            self.keyset_ordering
+        )
+        ordering = ["-id" if o == "-pk" else "id" if o == "pk" else o for o in ordering]
+        if not any(o.lstrip("-") == "id" for o in ordering):
+            # id breaks ties so every row has a distinct position.
+            ordering.append("-id" if ordering[0].startswith("-") else "id")
+        return ordering
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps({"v": values, "r": int(reverse)}, default=str)
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, token, fields):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            values = payload["v"]
+            if len(values) != len(fields):
+                raise ValueError("cursor does not match ordering")
+            return (
+                [field.to_python(value) for field, value in zip(fields, values)],
+                bool(payload.get("r")),
+            )
+        except Exception:
+            raise NotFound("Invalid cursor.")
+
+    def seek_filter(self, ordering, values, reverse):
+        """Rows strictly after ``values`` in ``ordering`` (before, if reverse)."""
+        condition = Q()
+        equal = Q()
+        for name, value in zip(ordering, values):
+            descending = name.startswith("-")
+            field = name.lstrip("-")
+            lookup = "lt" if descending != reverse else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def paginate_keyset(self, queryset, request):
+        model = queryset.model
+        ordering = self.get_keyset_ordering(queryset)
+        try:
+            fields = [model._meta.get_field(o.lstrip("-")) for o in ordering]
+        except Exception:
+            fields = None
+        if fields is None or any(field.null for field in fields):
+            # Ordering on a relation, an expression or a nullable column
+            # (NULLs cannot be sought past with < / >): no keyset, fall back.
+            self.keyset = False
+            return super().paginate_queryset(queryset, request)
+
+        self.page_size_value = self.get_page_size(request)
+        self.base_queryset = queryset
+        self.ordering = ordering
+        self.fields = fields
+
+        token = request.query_params.get(self.cursor_query_param)
+        reverse = False
+        if token:
+            values, reverse = self.decode_cursor(token, fields)
+            queryset = queryset.filter(self.seek_filter(ordering, values, reverse))
+
+        if reverse:
+            flipped = [o[1:] if o.startswith("-") else f"-{o}" for o in ordering]
+            queryset = queryset.order_by(*flipped)
+        else:
+            queryset = queryset.order_by(*ordering)
+
+        rows = list(queryset[: self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[: self.page_size_value]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = bool(token), has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(token)
+
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def row_position(self, row):
+        return [field.value_from_object(row) for field in self.fields]
+
+    def get_cursor_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(self.row_position(row), reverse),
+        )
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or self.last_row is None:
+            return None
+        return self.get_cursor_link(self.last_row, reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        if self.first_row is None:
+            # Paged past the end: step back from the start of the listing.
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.get_cursor_link(self.first_row, reverse=True)
+
+    def get_cursor_count(self):
+        """(count, is_estimate) for the whole listing, per ?count=..."""
+        mode = self.request.query_params.get(
+            self.count_query_param, self.cursor_count_mode
+        )
+        if mode == COUNT_EXACT:
+            return cached_count(self.base_queryset), False
+        if mode == COUNT_ESTIMATE:
+            estimate = estimated_count(self.base_queryset)
+            if estimate is not None and (
+                estimate > get_pagination_settings()["ESTIMATE_COUNT_ABOVE"]
+            ):
+                return estimate, True
+            return cached_count(self.base_queryset), False
+        return None, False
+
+    # --- responses ---
     def get_paginated_response(self, data):
         return self._build_response(data)
 
@@ -21,6 +255,21 @@ class CustomPagination(PageNumberPagination):
         if extra_fields:
             response.update(extra_fields)
 
+        if self.keyset:
+            count, is_estimate = self.get_cursor_count()
+            response.update(
+                {
+                    "status": "success",
+                    "count": count,
+                    "count_is_estimate": is_estimate,
+                    "page_size": self.page_size_value,
+                    "next": self.get_next_link(),
+                    "previous": self.get_previous_link(),
+                    "results": data,
+                }
+            )
+            return Response(response, status=200)
+
         response.update(
             {
                 "status": "success",
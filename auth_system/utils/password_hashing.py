@@ -0,0 +1,49 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+# Below this many passwords the pool start-up costs more than it saves.
+PARALLEL_MIN_PASSWORDS = 64
+
+
+def get_hash_workers():
+    workers = getattr(settings, "PASSWORD_HASH_WORKERS", None)
+    if workers:
+        return int(workers)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _hash_one(password):
+    # Runs in a fresh interpreter; DJANGO_SETTINGS_MODULE is inherited and
+    # the hashers only need settings, not the app registry.
+    return make_password(password)
+
+
+def hash_password(password):
+    """Hash one password with the project's default (first) PASSWORD_HASHERS entry."""
+    return make_password(password)
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash ``passwords`` with the default hasher, returning hashes in the same
+    order. Large batches are spread over a process pool sized to the
+    available cores. Each worker is a spawned process, so nothing is forked
+    out of a threaded server process.
+    """
+    passwords = list(passwords)
+    workers = workers or get_hash_workers()
+    if workers <= 1 or len(passwords) < PARALLEL_MIN_PASSWORDS:
+        return [make_password(password) for password in passwords]
+
+    workers = min(workers, len(passwords))
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        return list(pool.map(_hash_one, passwords, chunksize=chunksize))
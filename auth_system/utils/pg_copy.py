@@ -0,0 +1,81 @@
+import io
+
+from django.db import connection
+
+NULL_MARKER = "\\N"
+
+
+def copy_supported():
+    return connection.vendor == "postgresql"
+
+
+def _format_value(value):
+    # Every value is quoted, so only the bare \N marker is read back as NULL.
+    if value is None:
+        return NULL_MARKER
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _to_buffer(rows):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_format_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def copy_into(cursor, table, columns, rows):
+    """Stream ``rows`` into ``table`` with ``COPY ... FROM STDIN``."""
+    quote = connection.ops.quote_name
+    sql = (
+        f"COPY {quote(table)} ({', '.join(quote(c) for c in columns)}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')"
+    )
+    buffer = _to_buffer(rows)
+    raw = getattr(cursor, "cursor", cursor)
+    if hasattr(raw, "copy_expert"):  # psycopg2
+        raw.copy_expert(sql, buffer)
+    else:  # psycopg 3
+        with raw.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def copy_rows(model, fields, rows):
+    """
+    COPY plain value tuples (in ``fields`` order) into ``model``'s table.
+    Returns False when the database is not PostgreSQL so callers can fall
+    back to bulk_create.
+    """
+    if not copy_supported():
+        return False
+    model_fields = [model._meta.get_field(name) for name in fields]
+    prepared = (
+        [f.get_db_prep_save(value, connection) for f, value in zip(model_fields, row)]
+        for row in rows
+    )
+    with connection.cursor() as cursor:
+        copy_into(
+            cursor,
+            model._meta.db_table,
+            [f.column for f in model_fields],
+            prepared,
+        )
+    return True
+
+
+def copy_objects(model, objs):
+    """
+    COPY unsaved model instances, filling auto_now/auto_now_add and defaults
+    the same way bulk_create does. Primary keys are not returned.
+    """
+    if not copy_supported():
+        return False
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    rows = (
+        [f.get_db_prep_save(f.pre_save(obj, True), connection) for f in fields]
+        for obj in objs
+    )
+    with connection.cursor() as cursor:
+        copy_into(cursor, model._meta.db_table, [f.column for f in fields], rows)
+    return True
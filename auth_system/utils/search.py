@@ -0,0 +1,141 @@
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+
+SEARCH_RANK_ALIAS = "search_rank"
+
+# Added to the rank of rows whose prefix field starts with the search text,
+# so an exact mobile number / code hit sorts above fuzzy name matches.
+PREFIX_MATCH_BONUS = 1.0
+
+_trigram_available = {}
+
+
+def trigram_available(using="default"):
+    """True when the database is PostgreSQL with pg_trgm installed."""
+    if using not in _trigram_available:
+        connection = connections[using]
+        available = False
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                available = cursor.fetchone() is not None
+        _trigram_available[using] = available
+    return _trigram_available[using]
+
+
+def search_filter(query, fields, prefix_fields=()):
+    """
+    OR of ``icontains`` on ``fields`` and ``istartswith`` on ``prefix_fields``.
+    On PostgreSQL both compile to UPPER(col::text) LIKE ..., which the
+    indexes from create_search_indexes() serve.
+    """
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__icontains": query})
+    for field in prefix_fields:
+        condition |= Q(**{f"{field}__istartswith": query})
+    return condition
+
+
+def search_rank(query, fields, prefix_fields=(), using="default"):
+    """Trigram similarity over ``fields`` plus a bonus for a prefix hit."""
+    rank = Value(0.0, output_field=FloatField())
+    if prefix_fields:
+        rank = Case(
+            When(search_filter(query, (), prefix_fields), then=Value(PREFIX_MATCH_BONUS)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    if not fields or not trigram_available(using):
+        return rank
+
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    similarities = [TrigramSimilarity(field, query) for field in fields]
+    similarity = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+    return similarity + rank
+
+
+def apply_search(queryset, query, fields, prefix_fields=(), rank=False):
+    """
+    Filter ``queryset`` by the ``search`` text. With ``rank=True`` the best
+    matches come first (ties keep the queryset's own ordering).
+    """
+    query = (query or "").strip()
+    if not query:
+        return queryset
+    queryset = queryset.filter(search_filter(query, fields, prefix_fields))
+    if not rank:
+        return queryset
+    ordering = list(queryset.query.order_by) or ["-id"]
+    return queryset.annotate(
+        **{SEARCH_RANK_ALIAS: search_rank(query, fields, prefix_fields, queryset.db)}
+    ).order_by(f"-{SEARCH_RANK_ALIAS}", *ordering)
+
+
+def wants_ranking(request):
+    return request.GET.get("sort") == "relevance"
+
+
+# --- indexes (used from migrations) ---
+def _index_name(table, column, suffix):
+    return f"{table}_{column}_{suffix}"[:63]
+
+
+def _create_index_concurrently(schema_editor, name, definition):
+    quote = schema_editor.quote_name
+    # An interrupted CONCURRENTLY build leaves an INVALID index behind that
+    # IF NOT EXISTS would keep; rebuild it.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = %s AND NOT i.indisvalid",
+            [name],
+        )
+        invalid = cursor.fetchone() is not None
+    if invalid:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {quote(name)}")
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(name)} {definition}"
+    )
+
+
+def create_search_indexes(schema_editor, table, contains_columns=(), prefix_columns=()):
+    """
+    Create the pg_trgm GIN indexes behind ``icontains`` search and the
+    pattern-ops btree indexes behind ``istartswith`` prefix search, with
+    CREATE INDEX CONCURRENTLY so writes to ``table`` are not blocked while
+    they build; the calling migration must set ``atomic = False``.
+    A no-op on databases other than PostgreSQL.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in contains_columns:
+        _create_index_concurrently(
+            schema_editor,
+            _index_name(table, column, "trgm"),
+            f"ON {quote(table)} USING gin ((UPPER({quote(column)}::text)) gin_trgm_ops)",
+        )
+    for column in prefix_columns:
+        _create_index_concurrently(
+            schema_editor,
+            _index_name(table, column, "prefix"),
+            f"ON {quote(table)} ((UPPER({quote(column)}::text)) text_pattern_ops)",
+        )
+
+
+def drop_search_indexes(schema_editor, table, contains_columns=(), prefix_columns=()):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    for column in contains_columns:
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {quote(_index_name(table, column, 'trgm'))}"
+        )
+    for column in prefix_columns:
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {quote(_index_name(table, column, 'prefix'))}"
+        )
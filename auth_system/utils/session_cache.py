@@ -0,0 +1,187 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from auth_system.models.blacklist import BlackListedToken
+from auth_system.models.login_session import LoginSession
+
+DEFAULT_SESSION_CACHE_SETTINGS = {
+    "TTL": 300,
+    # Per-process entries never outlive this, shared backend or not: a
+    # logout only clears the local copy of the worker that handled it.
+    "LOCAL_TTL": 30,
+    "MAX_ENTRIES": 10000,
+    # Name of a Django cache alias (e.g. a Redis cache) shared by all workers.
+    "SHARED_BACKEND": None,
+}
+
+REQUEST_MEMO_ATTR = "_session_state"
+
+
+def get_session_cache_settings():
+    conf = dict(DEFAULT_SESSION_CACHE_SETTINGS)
+    conf.update(getattr(settings, "SESSION_STATE_CACHE", {}) or {})
+    return conf
+
+
+def token_hash(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class LocalLRUBackend:
+    """Per-process LRU with a TTL on every entry."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoCacheBackend:
+    """Shared backend on top of any configured Django cache alias."""
+
+    key_prefix = "auth:session_state:"
+
+    def __init__(self, alias, ttl):
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    def get(self, key):
+        return self.cache.get(self.key_prefix + key)
+
+    def set(self, key, value):
+        self.cache.set(self.key_prefix + key, value, self.ttl)
+
+    def delete(self, key):
+        self.cache.delete(self.key_prefix + key)
+
+
+class SessionStateCache:
+    """
+    Token-hash keyed cache of the LoginSession/blacklist state that
+    APILogMiddleware and IsTokenValid need on every request.
+
+    Lookup order is request memo -> local LRU -> shared backend -> database.
+    The local LRU always uses the shorter LOCAL_TTL, which bounds how long
+    another worker can keep serving a session that was logged out elsewhere.
+    """
+
+    def __init__(self, conf=None):
+        conf = conf or get_session_cache_settings()
+        self.shared = None
+        if conf["SHARED_BACKEND"]:
+            self.shared = DjangoCacheBackend(conf["SHARED_BACKEND"], conf["TTL"])
+        self.local = LocalLRUBackend(conf["MAX_ENTRIES"], min(conf["LOCAL_TTL"], conf["TTL"]))
+
+    def get_state(self, token, request=None):
+        memo_target = getattr(request, "_request", request)
+        if memo_target is not None:
+            memo = getattr(memo_target, REQUEST_MEMO_ATTR, None)
+            if memo and memo[0] == token:
+                return memo[1]
+
+        key = token_hash(token)
+        state = self.local.get(key)
+        if state is None and self.shared is not None:
+            state = self.shared.get(key)
+            if state is not None:
+                self.local.set(key, state)
+        if state is None:
+            state = self._load_state(token)
+            self.local.set(key, state)
+            if self.shared is not None:
+                self.shared.set(key, state)
+
+        if memo_target is not None:
+            setattr(memo_target, REQUEST_MEMO_ATTR, (token, state))
+        return state
+
+    def invalidate(self, *tokens):
+        for token in tokens:
+            if not token:
+                continue
+            key = token_hash(token)
+            self.local.delete(key)
+            if self.shared is not None:
+                self.shared.delete(key)
+                # Again once the logout is committed, in case another worker
+                # cached the old state from the database in between.
+                transaction.on_commit(lambda key=key: self.shared.delete(key))
+
+    def _load_state(self, token):
+        blacklisted_user_ids = list(
+            BlackListedToken.objects.filter(token=token).values_list(
+                "user_id", flat=True
+            )
+        )
+        session = (
+            LoginSession.objects.filter(
+                token=token, is_active=True, logout_at__isnull=True
+            )
+            .values("session_id", "user_id", "ip_address", "agent_browser")
+            .first()
+        )
+        if not session:
+            return {"active": False, "blacklisted_user_ids": blacklisted_user_ids}
+        return {
+            "active": True,
+            "session_id": str(session["session_id"]),
+            "user_id": session["user_id"],
+            "ip_address": session["ip_address"],
+            "agent_browser": session["agent_browser"],
+            "blacklisted_user_ids": blacklisted_user_ids,
+        }
+
+
+_session_cache = None
+_session_cache_lock = threading.Lock()
+
+
+def get_session_cache():
+    global _session_cache
+    if _session_cache is None:
+        with _session_cache_lock:
+            if _session_cache is None:
+                _session_cache = SessionStateCache()
+    return _session_cache
+
+
+def get_session_state(token, request=None):
+    return get_session_cache().get_state(token, request)
+
+
+def invalidate_session_state(*tokens):
+    get_session_cache().invalidate(*tokens)
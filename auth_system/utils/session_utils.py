@@ -4,6 +4,7 @@ from django.db import DatabaseError
 
 from auth_system.models.login_session import LoginSession
 from auth_system.models.user import TblUser
+from auth_system.utils.session_cache import invalidate_session_state
 from rest_framework_simplejwt.settings import api_settings
 
 refresh_token_lifetime = api_settings.REFRESH_TOKEN_LIFETIME
@@ -37,6 +38,7 @@ def create_login_session(
             is_active=True,
             expiry_at=timezone.now() + refresh_token_lifetime,
         )
+        invalidate_session_state(token)
 
         return session
 
@@ -64,5 +66,6 @@ def end_session(session):
         session.logout_at = timezone.now()
         session.is_active = False
         session.save()
+        invalidate_session_state(session.token)
     except DatabaseError as e:
         print(f"❌ Error ending session: {e}")
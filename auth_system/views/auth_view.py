@@ -1,7 +1,7 @@
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.hashers import make_password
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils import timezone
@@ -31,8 +31,8 @@ from auth_system.permissions.token_valid import (
     IsTokenValid,
 )
 from auth_system.utils.pagination import CustomPagination
+from auth_system.utils.session_cache import invalidate_session_state
 from auth_system.utils.session_utils import create_login_session
-from auth_system.utils.sms_utils import send_seized_emp_otp
 from auth_system.utils.token_utils import generate_token
 
 from constants import (
@@ -158,7 +158,7 @@ class LoginView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        if not check_password(password, user.password):
+        if not user.check_password(password):
             self._log_failed_attempt(user, username, ip_address, agent_browser)
             return Response(
                 {
@@ -467,6 +467,7 @@ class LogoutView(APIView):
                     BlackListedToken(token=refresh_token, user=user),
                 ]
             )
+            invalidate_session_state(access_token, refresh_token)
 
             return Response(
                 {
@@ -717,7 +718,7 @@ class DealerLoginView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        if not check_password(password, user.password):
+        if not user.check_password(password):
             self._log_failed_attempt(user, username, ip_address, agent_browser)
             return Response(
                 {
@@ -0,0 +1,65 @@
+import os
+
+from django.conf import settings
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_system.models.export_job import ExportJob
+from auth_system.permissions.token_valid import IsTokenValid
+from auth_system.utils.export_jobs import export_job_payload
+from constants import ExportJobStatus
+
+
+def get_user_export_job(request, job_id):
+    try:
+        return ExportJob.objects.get(pk=job_id, created_by=request.user.id)
+    except ExportJob.DoesNotExist:
+        raise NotFound(detail=f"Export job with id {job_id} not found.")
+
+
+class ExportJobDetailView(APIView):
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def get(self, request, job_id):
+        job = get_user_export_job(request, job_id)
+        return Response(
+            {
+                "success": True,
+                "message": "Export job status retrieved successfully.",
+                "data": export_job_payload(job),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ExportJobDownloadView(APIView):
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def get(self, request, job_id):
+        job = get_user_export_job(request, job_id)
+        if job.status != ExportJobStatus.COMPLETED:
+            return Response(
+                {
+                    "success": False,
+                    "message": f"Export is not ready yet ({job.get_status_display()}).",
+                    "data": export_job_payload(job),
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        full_path = job.file_path and os.path.join(settings.MEDIA_ROOT, job.file_path)
+        if not full_path or not os.path.exists(full_path):
+            return Response(
+                {"success": False, "message": "Export file has expired."},
+                status=status.HTTP_410_GONE,
+            )
+
+        return FileResponse(
+            open(full_path, "rb"),
+            as_attachment=True,
+            filename=f"{job.job_type}_{job.id}.{job.export_format}",
+        )
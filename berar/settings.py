@@ -112,6 +112,19 @@ DATABASES = {
         "PORT": "5432",
     },
 }
+# "shared" is seen by every worker and host (session state revocation).
+# The table is created by auth_system migration 0006; point it at Redis /
+# memcached instead where available.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "berar_shared_cache",
+    },
+}
+
 # DATABASES = {
 #     "default": {
 #         "ENGINE": "django.db.backends.postgresql",
@@ -145,6 +158,173 @@ SIMPLE_JWT = {
 }
 AUTH_USER_MODEL = "auth_system.TblUser"
 
+# APILogMiddleware audit pipeline. "async" queues log rows in-process and a
+# background writer bulk-inserts them; "sync" saves each row inline.
+# OVERFLOW_POLICY: "drop_newest", "drop_oldest" or "block" (waits BLOCK_TIMEOUT).
+API_LOG_PIPELINE = {
+    "MODE": "async",
+    "QUEUE_SIZE": 10000,
+    "BATCH_SIZE": 200,
+    "FLUSH_INTERVAL": 2.0,
+    "OVERFLOW_POLICY": "drop_newest",
+    "BLOCK_TIMEOUT": 0.05,
+}
+
+# Completed background exports (ExportJob) with identical filters are reused
+# for this many seconds instead of being regenerated; their files are
+# deleted after that.
+EXPORT_JOB_CACHE_SECONDS = 600
+# A RUNNING export without a progress update for this long is treated as
+# orphaned (worker killed) and queued again.
+EXPORT_JOB_STALE_SECONDS = 900
+
+# CustomPagination cursor mode (?pagination=cursor): how long an exact
+# ?count=exact is cached, and above which planner estimate ?count=estimate
+# stops counting.
+PAGINATION = {
+    "COUNT_CACHE_SECONDS": 60,
+    "ESTIMATE_COUNT_ABOVE": 10000,
+}
+
+# Shared MIS HTTP client (auth_system.utils.mis_client): keep-alive pool,
+# retries on connection errors / 502-504, and the circuit breaker that
+# answers 503 without calling MIS after FAILURE_THRESHOLD straight failures.
+MIS_CLIENT = {
+    "POOL_CONNECTIONS": 4,
+    "POOL_MAXSIZE": 20,
+    "ASYNC_MAX_CONNECTIONS": 200,
+    "CONNECT_TIMEOUT": 3,
+    "MAX_RETRIES": 2,
+    "BACKOFF_BASE": 0.2,
+    "BACKOFF_MAX": 2.0,
+    "FAILURE_THRESHOLD": 5,
+    "RESET_SECONDS": 30,
+}
+
+# Route the MIS proxy endpoints (cms customers, lead existing-data) to their
+# async views. Turn on only when served by an ASGI server (berar.asgi).
+MIS_ASYNC_VIEWS = False
+
+# Successful MIS customer lookups, cached per Session-Key: served as-is for
+# TTL seconds, then for STALE_TTL more while one request refreshes them.
+MIS_CACHE = {
+    "ENABLED": True,
+    "TTL": 60,
+    "STALE_TTL": 300,
+    "MAX_ENTRIES": 2000,
+}
+
+# OTP / link SMS and email delivery (auth_system.utils.message_dispatch).
+# MODE "thread" sends from a pool in the web process after the request
+# commits, and each web process sweeps the table every SWEEP_INTERVAL
+# seconds for due retries and messages a restart left behind; "worker"
+# leaves it all to `manage.py run_message_worker`, which must then run;
+# "sync" sends inside the request. Failed sends are retried up to
+# MAX_ATTEMPTS.
+MESSAGE_DISPATCH = {
+    "MODE": "thread",
+    "THREADS": 4,
+    "SMS_BACKEND": "auth_system.utils.message_backends.PinnacleSmsBackend",
+    "EMAIL_BACKEND": "auth_system.utils.message_backends.SmtpEmailBackend",
+    "TIMEOUT": 10,
+    "MAX_ATTEMPTS": 3,
+    "RETRY_BACKOFF": 15,
+    "CLAIM_TIMEOUT": 120,
+    "SWEEP_INTERVAL": 30,
+    "SWEEP_BATCH": 50,
+}
+
+# Code-of-conduct link campaigns (code_of_conduct.utils.link_campaign):
+# BATCH_SIZE messages per Pinnacle request, CONCURRENCY requests in flight,
+# at most RATE_PER_SECOND messages per second. LINK_URLS take the encrypted
+# row id as {id}; only deposit agents have a link page so far.
+LINK_CAMPAIGN = {
+    "LINK_URLS": {
+        "deposit_agent": "https://uatcws.berarfinance.com/deposit_agents/f1/?id={id}",
+    },
+    "BATCH_SIZE": 100,
+    "CONCURRENCY": 4,
+    "RATE_PER_SECOND": 100,
+}
+
+# Enquiry image / selfie processing (lead.utils.image_renditions): uploads
+# are re-encoded upright to MAX_DIMENSION px at QUALITY and get the SIZES
+# renditions, on THREADS background threads ("thread"), inline ("sync"), or
+# only via `manage.py process_enquiry_media` ("off").
+IMAGE_RENDITIONS = {
+    "MODE": "thread",
+    "THREADS": 2,
+    "MAX_DIMENSION": 2048,
+    "QUALITY": 82,
+    "SIZES": {
+        "thumbnail": [320, 70],
+        "preview": [1024, 78],
+    },
+}
+
+# Enquiry images, selfies and ticket attachments are stored once per
+# content under MEDIA_ROOT/<LOCATION>/ (lead.utils.media_store); duplicate
+# uploads share a blob. `manage.py gc_media_blobs` removes blobs nothing has
+# referenced for GC_GRACE_HOURS, `manage.py migrate_media_store` moves files
+# uploaded before. ENABLED False stores new uploads under upload_to again.
+MEDIA_STORE = {
+    "ENABLED": True,
+    "LOCATION": "cas",
+    "GC_GRACE_HOURS": 24,
+}
+
+# "Follow-up Scheduled" lead logs (lead.utils.followup_logs): the daily
+# `manage.py materialize_followup_logs` also covers the LOOKBACK_DAYS before
+# its date, so a missed run is caught up.
+FOLLOWUP_LOGS = {
+    "LOOKBACK_DAYS": 3,
+}
+
+# Resumable image / selfie uploads (lead.utils.resumable_upload): part files
+# under DIRECTORY (BASE_DIR/upload_sessions when None), chunks of at most
+# MAX_CHUNK_SIZE, unfinished sessions dropped TTL_HOURS after their last
+# chunk by `manage.py expire_upload_sessions`.
+RESUMABLE_UPLOADS = {
+    "DIRECTORY": None,
+    "CHUNK_SIZE": 512 * 1024,
+    "MAX_CHUNK_SIZE": 8 * 1024 * 1024,
+    "MAX_FILE_SIZE": 50 * 1024 * 1024,
+    "TTL_HOURS": 24,
+}
+
+# Authorized file endpoints of enquiry images / selfies / ticket attachments
+# (lead.utils.media_delivery). "python" serves with Range / ETag support
+# (os.sendfile under gunicorn); in production use "accel" behind nginx:
+#   location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+# or "sendfile" for X-Sendfile servers.
+PROTECTED_MEDIA = {
+    "MODE": "python",
+    "ACCEL_PREFIX": "/protected-media/",
+    "CACHE_CONTROL": "private, no-cache",
+}
+
+# Token-keyed LoginSession/blacklist state used by APILogMiddleware and
+# IsTokenValid. SHARED_BACKEND is a CACHES alias seen by all workers; each
+# worker's own copy lives at most LOCAL_TTL seconds, which bounds how long a
+# logged-out token keeps working on another worker.
+SESSION_STATE_CACHE = {
+    "TTL": 300,
+    "LOCAL_TTL": 30,
+    "MAX_ENTRIES": 10000,
+    "SHARED_BACKEND": "shared",
+}
+
+# Compiled role -> menu permission bitmasks (ems.utils.permission_matrix)
+# behind HasMenuPermission and /api/ems/permission-matrix/. SHARED_BACKEND is
+# the CACHES alias holding the role versions, so a role change reaches every
+# worker within LOCAL_TTL.
+PERMISSION_MATRIX_CACHE = {
+    "TTL": 300,
+    "LOCAL_TTL": 60,
+    "MAX_ENTRIES": 1000,
+    "SHARED_BACKEND": "shared",
+}
+
 SECURE_HSTS_SECONDS = 31536000
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
@@ -212,7 +392,9 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
-# Bulk import speed badhane ke liye MD5 allow kiya gaya hai
+# New passwords use PBKDF2 (first entry). MD5 stays only so accounts from
+# the old bulk import can still log in; they are upgraded on login or in
+# bulk with `manage.py rehash_md5_passwords`.
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
@@ -220,3 +402,10 @@ PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
+
+# Processes used to hash passwords during bulk provisioning (None = all cores)
+PASSWORD_HASH_WORKERS = None
+
+# A RUNNING master-data CSV upload with no chunk committed for this long is
+# treated as dead, and re-posting the same file resumes it
+MASTER_UPLOAD_STALE_SECONDS = 300
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent requests at a running MIS-proxy endpoint and report "
+        "throughput and latency, to compare a WSGI deployment with an ASGI one "
+        "(MIS_ASYNC_VIEWS = True)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            required=True,
+            help="Full endpoint URL, e.g. http://127.0.0.1:8000/api/cms/customers/count/",
+        )
+        parser.add_argument("--token", default="", help="JWT access token (Bearer).")
+        parser.add_argument("--session-key", default="", help="MIS Session-Key header.")
+        parser.add_argument("--requests", type=int, default=500, help="Total requests.")
+        parser.add_argument(
+            "--concurrency", type=int, default=100, help="Requests in flight at once."
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=60, help="Per-request timeout in seconds."
+        )
+        parser.add_argument(
+            "--vary-param",
+            default=None,
+            help="Query param given a distinct value per request, so the MIS "
+            "response cache cannot answer them (e.g. account_number).",
+        )
+
+    def handle(self, *args, **options):
+        result = asyncio.run(self.run(options))
+        total, elapsed, latencies, statuses, errors = result
+
+        latencies.sort()
+        self.stdout.write(f"requests:    {total} ({options['concurrency']} concurrent)")
+        self.stdout.write(f"elapsed:     {elapsed:.2f} s")
+        self.stdout.write(f"throughput:  {total / elapsed:.1f} req/s")
+        if latencies:
+            self.stdout.write(
+                "latency ms:  p50 {:.0f}  p95 {:.0f}  max {:.0f}".format(
+                    latencies[len(latencies) // 2] * 1000,
+                    latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+                    latencies[-1] * 1000,
+                )
+            )
+        self.stdout.write(
+            "statuses:    " + ", ".join(f"{k}: {v}" for k, v in sorted(statuses.items(), key=str))
+        )
+        for error, count in errors.most_common(5):
+            self.stdout.write(self.style.WARNING(f"{count} x {error}"))
+
+    async def run(self, options):
+        headers = {}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+        if options["session_key"]:
+            headers["Session-Key"] = options["session_key"]
+
+        total = options["requests"]
+        concurrency = max(options["concurrency"], 1)
+        latencies, statuses, errors = [], Counter(), Counter()
+        queue = asyncio.Queue()
+        for i in range(total):
+            queue.put_nowait(i)
+
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(
+            headers=headers, limits=limits, timeout=options["timeout"]
+        ) as client:
+
+            async def worker():
+                while True:
+                    try:
+                        i = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    params = {}
+                    if options["vary_param"]:
+                        params[options["vary_param"]] = f"LOADTEST{i}"
+                    started = time.perf_counter()
+                    try:
+                        response = await client.get(options["url"], params=params)
+                        statuses[response.status_code] += 1
+                    except httpx.HTTPError as e:
+                        errors[type(e).__name__] += 1
+                        statuses["error"] += 1
+                    latencies.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+
+        return total, elapsed, latencies, statuses, errors
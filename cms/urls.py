@@ -1,11 +1,23 @@
+from django.conf import settings
 from django.urls import path
 from cms.views.customer_view import (
+    AllCustomersAsyncView,
     AllCustomersView,
+    CustomerByAccountNumberAsyncView,
     CustomerByAccountNumberView,
+    CustomerCountAsyncView,
     CustomerCountView,
+    CustomerFlexibleSearchAsyncView,
     CustomerFlexibleSearchView,
+    MISClientMetricsView,
 )
 
+if settings.MIS_ASYNC_VIEWS:
+    AllCustomersView = AllCustomersAsyncView
+    CustomerCountView = CustomerCountAsyncView
+    CustomerFlexibleSearchView = CustomerFlexibleSearchAsyncView
+    CustomerByAccountNumberView = CustomerByAccountNumberAsyncView
+
 urlpatterns = [
     path("customers/", AllCustomersView.as_view(), name="all-customers"),
     path("customers/count/", CustomerCountView.as_view(), name="customer-count"),
@@ -15,4 +27,5 @@ urlpatterns = [
         name="customer-search",
     ),
     path("customers/getBy-account-number/", CustomerByAccountNumberView.as_view()),
+    path("mis/metrics/", MISClientMetricsView.as_view(), name="mis-client-metrics"),
 ]
@@ -5,6 +5,9 @@ from auth_system.utils.session_key_utils import get_mis_auth_headers
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
 from cms.utils.mis_helpers import call_mis_api
+from auth_system.utils.mis_client import get_mis_client
+from auth_system.utils.mis_async import acall_mis_api
+from auth_system.utils.async_views import AsyncAPIView
 from api_endpoints import (
     CUSTOMER_GET_ALL_URL,
     CUSTOMER_COUNT_URL,
@@ -47,12 +50,77 @@ class CustomerByAccountNumberView(APIView):
         account_number = request.query_params.get("account_number")
 
         if not account_number:
-            return Response(
-                {"detail": "account_number is required as a query parameter."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+            return account_number_missing_response()
 
         params = {"loanAccount": account_number}
         return call_mis_api(
             request, CUSTOMER_GET_BY_ACCOUNT_URL, params=params, timeout=30
         )
+
+
+def account_number_missing_response():
+    return Response(
+        {"detail": "account_number is required as a query parameter."},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+# --- async variants, routed when MIS_ASYNC_VIEWS is on (ASGI deployments) ---
+class AllCustomersAsyncView(AsyncAPIView):
+
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        return await acall_mis_api(
+            request, CUSTOMER_GET_ALL_URL, params=request.query_params, timeout=30
+        )
+
+
+class CustomerCountAsyncView(AsyncAPIView):
+
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        return await acall_mis_api(request, CUSTOMER_COUNT_URL)
+
+
+class CustomerFlexibleSearchAsyncView(AsyncAPIView):
+
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        return await acall_mis_api(
+            request, CUSTOMER_SEARCH_URL, params=request.query_params, timeout=30
+        )
+
+
+class CustomerByAccountNumberAsyncView(AsyncAPIView):
+
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        account_number = request.query_params.get("account_number")
+
+        if not account_number:
+            return account_number_missing_response()
+
+        params = {"loanAccount": account_number}
+        return await acall_mis_api(
+            request, CUSTOMER_GET_BY_ACCOUNT_URL, params=params, timeout=30
+        )
+
+
+class MISClientMetricsView(APIView):
+    """Circuit state and per-endpoint MIS latency for this worker process."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(
+            {
+                "success": True,
+                "message": "MIS client metrics retrieved.",
+                "data": get_mis_client().snapshot(),
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from auth_system.utils.message_dispatch import get_worker_id
+from code_of_conduct.utils.link_campaign import (
+    claim_next_campaign,
+    release_stale_campaigns,
+    run_campaign,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued code-of-conduct link campaigns (MESSAGE_DISPATCH MODE 'worker'). "
+        "Each campaign already sends with LINK_CAMPAIGN CONCURRENCY threads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when no campaign is pending.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the pending campaigns and exit instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        worker_id = get_worker_id()
+        self.stdout.write("Starting link campaign worker...")
+        while True:
+            close_old_connections()
+            release_stale_campaigns()
+            campaign = claim_next_campaign(worker_id)
+            if campaign:
+                self.stdout.write(f"Running campaign #{campaign.id}")
+                run_campaign(campaign)
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["poll_interval"])
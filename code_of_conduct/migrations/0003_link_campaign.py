@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 13:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_of_conduct', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('campaign_type', models.CharField(choices=[('deposit_agent', 'Deposit Agent'), ('dsa', 'DSA'), ('ras', 'RAS')], max_length=20)),
+                ('quarter_code', models.CharField(blank=True, max_length=50, null=True)),
+                ('status', models.IntegerField(choices=[(1, 'Pending'), (2, 'Running'), (3, 'Completed'), (4, 'Failed')], default=1)),
+                ('total_recipients', models.IntegerField(default=0)),
+                ('sent_count', models.IntegerField(default=0)),
+                ('failed_count', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('worker_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_by', models.IntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'code_of_conduct_link_campaign',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='code_of_con_status_37e4ed_idx')],
+            },
+        ),
+    ]
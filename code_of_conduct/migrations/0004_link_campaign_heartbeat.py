@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_of_conduct', '0003_link_campaign'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linkcampaign',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='linkcampaign',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', [1, 2])), fields=('campaign_type', 'quarter_code'), name='uniq_link_campaign_in_flight'),
+        ),
+    ]
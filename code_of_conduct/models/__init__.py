@@ -9,3 +9,4 @@ from .dsa_data import DsaData
 from .ras import Ras
 from .ras_data import RasData
 from .apilog import APILog
+from .link_campaign import LinkCampaign
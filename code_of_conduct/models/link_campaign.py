@@ -0,0 +1,40 @@
+from django.db import models
+from django.utils import timezone
+from constants import CAMPAIGN_TYPE_CHOICES, CampaignStatus
+
+
+class LinkCampaign(models.Model):
+    """One bulk send of code-of-conduct links to a quarter's agents."""
+
+    campaign_type = models.CharField(max_length=20, choices=CAMPAIGN_TYPE_CHOICES)
+    quarter_code = models.CharField(max_length=50, null=True, blank=True)
+    status = models.IntegerField(
+        choices=CampaignStatus.choices, default=CampaignStatus.PENDING
+    )
+    total_recipients = models.IntegerField(default=0)
+    sent_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    worker_id = models.CharField(max_length=100, null=True, blank=True)
+
+    created_by = models.IntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Touched by the running campaign as it writes and sends batches.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "code_of_conduct_link_campaign"
+        indexes = [models.Index(fields=["status", "created_at"])]
+        constraints = [
+            # One pending / running campaign per type and quarter.
+            models.UniqueConstraint(
+                fields=["campaign_type", "quarter_code"],
+                condition=models.Q(status__in=[CampaignStatus.PENDING, CampaignStatus.RUNNING]),
+                name="uniq_link_campaign_in_flight",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.campaign_type} {self.quarter_code} #{self.id} [{self.get_status_display()}]"
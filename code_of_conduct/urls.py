@@ -23,6 +23,7 @@ from code_of_conduct.views.ras_view import RasDownloadTemplate
 
 from code_of_conduct.views.assign_quarter_view import AssignQuarterListView
 from code_of_conduct.views.assign_quarter_view import (AssignQuarterCreateView,)    
+from code_of_conduct.views.link_campaign_view import LinkCampaignView, LinkCampaignDetailView
 
 
 
@@ -50,6 +51,8 @@ urlpatterns = [
     path("deposit_agents_data/<int:pk>/", DepositAgentsDataDetailView.as_view(), name="deposit_agents_data_detail"),
     path("deposit_agent/send_link/<int:pk>/", SendLink.as_view(), name="deposit_agent_send_link"),
     path("deposit_agent/send_link/", SendLinkToMobileView.as_view(), name="deposit_agent_send_link_to_mobile"),
+    path("link_campaign/", LinkCampaignView.as_view(), name="link_campaign"),
+    path("link_campaign/<int:pk>/", LinkCampaignDetailView.as_view(), name="link_campaign_detail"),
     # path("deposit_agent/leng_constent/", SendLinkToMobileView.as_view(), name="deposit_agent_leng_constent"),
 
     # dsa
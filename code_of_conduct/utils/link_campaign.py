@@ -0,0 +1,405 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from auth_system.models.sms_log import SmsLog
+from auth_system.utils.common import encrypt_id, generate_request_id
+from auth_system.utils.message_dispatch import (
+    MODE_SYNC,
+    MODE_WORKER,
+    SMS,
+    get_dispatch_settings,
+    get_worker_id,
+    load_backends,
+)
+from auth_system.utils.sms_utils import link_sms
+from code_of_conduct.models.deposit_agents_data import DepositAgentsData
+from code_of_conduct.models.link_campaign import LinkCampaign
+from constants import (
+    CAMPAIGN_DEPOSIT_AGENT,
+    CAMPAIGN_DSA,
+    CAMPAIGN_RAS,
+    CampaignStatus,
+    DeliveryStatus,
+    SmsType,
+)
+
+logger = logging.getLogger(__name__)
+
+# Campaign types that can be sent: each needs a link page backed by a view
+# that opens its rows (DepositAgentLinkView for deposit agents). DSA and RAS
+# have none yet.
+CAMPAIGN_MODELS = {
+    CAMPAIGN_DEPOSIT_AGENT: DepositAgentsData,
+}
+
+CAMPAIGN_SMS_TYPES = {
+    CAMPAIGN_DEPOSIT_AGENT: SmsType.DEPOSIT_AGENT_SEND_LINK,
+    CAMPAIGN_DSA: SmsType.DSA_SEND_LINK,
+    CAMPAIGN_RAS: SmsType.RAS_SEND_LINK,
+}
+
+DEFAULT_LINK_CAMPAIGN_SETTINGS = {
+    # {id} is the encrypted row id.
+    "LINK_URLS": {
+        CAMPAIGN_DEPOSIT_AGENT: "https://uatcws.berarfinance.com/deposit_agents/f1/?id={id}",
+    },
+    # Messages per gateway request (Pinnacle accepts a list in "message").
+    "BATCH_SIZE": 100,
+    # Gateway requests in flight at once.
+    "CONCURRENCY": 4,
+    # Messages per second across all requests of one campaign.
+    "RATE_PER_SECOND": 100,
+    # SmsLog rows written per bulk_create.
+    "INSERT_CHUNK_SIZE": 1000,
+    # A RUNNING campaign without a heartbeat for this long lost its process
+    # (restart, OOM) and is queued again; it resumes where it stopped.
+    "STALE_SECONDS": 600,
+}
+
+
+def get_link_campaign_settings():
+    conf = dict(DEFAULT_LINK_CAMPAIGN_SETTINGS)
+    conf.update(getattr(settings, "LINK_CAMPAIGN", {}) or {})
+    conf["LINK_URLS"] = {
+        **DEFAULT_LINK_CAMPAIGN_SETTINGS["LINK_URLS"],
+        **conf.get("LINK_URLS", {}),
+    }
+    return conf
+
+
+def build_link(campaign_type, pk, conf=None):
+    conf = conf or get_link_campaign_settings()
+    return conf["LINK_URLS"][campaign_type].format(id=encrypt_id(pk))
+
+
+def get_recipients(campaign_type, quarter_code):
+    return CAMPAIGN_MODELS[campaign_type].objects.filter(
+        quarter_code=quarter_code, deleted_at__isnull=True
+    )
+
+
+class RateLimiter:
+    """Token bucket shared by the sender threads of one campaign."""
+
+    def __init__(self, rate):
+        self.rate = float(rate)
+        self.tokens = self.rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, n):
+        # A batch larger than one second's worth waits for a full bucket.
+        n = min(n, self.rate)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                wait = (n - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# --- enqueue ---
+def start_campaign(campaign_type, quarter_code, user_id):
+    """
+    Queue a campaign, or return the one already pending / running for the
+    same type and quarter so a double click does not message everyone twice.
+    A campaign whose process died is queued again and resumed instead.
+    """
+    release_stale_campaigns(campaign_type=campaign_type, quarter_code=quarter_code)
+    in_flight = LinkCampaign.objects.filter(
+        campaign_type=campaign_type,
+        quarter_code=quarter_code,
+        status__in=[CampaignStatus.PENDING, CampaignStatus.RUNNING],
+    ).first()
+    if in_flight is None:
+        try:
+            with transaction.atomic():
+                in_flight = LinkCampaign.objects.create(
+                    campaign_type=campaign_type,
+                    quarter_code=quarter_code,
+                    created_by=user_id,
+                )
+        except IntegrityError:
+            # A concurrent request created it first (uniq_link_campaign_in_flight).
+            return LinkCampaign.objects.get(
+                campaign_type=campaign_type,
+                quarter_code=quarter_code,
+                status__in=[CampaignStatus.PENDING, CampaignStatus.RUNNING],
+            )
+
+    if in_flight.status == CampaignStatus.PENDING:
+        # Only one start wins claim_campaign, so repeating it is harmless.
+        schedule_campaign(in_flight.pk)
+    return in_flight
+
+
+def schedule_campaign(campaign_id):
+    mode = get_dispatch_settings()["MODE"]
+    if mode == MODE_SYNC:
+        transaction.on_commit(lambda: run_claimed_campaign(campaign_id))
+    elif mode != MODE_WORKER:
+        transaction.on_commit(
+            lambda: threading.Thread(
+                target=run_claimed_campaign,
+                args=(campaign_id,),
+                name=f"link-campaign-{campaign_id}",
+                daemon=True,
+            ).start()
+        )
+
+
+def release_stale_campaigns(conf=None, **filters):
+    """Queue again RUNNING campaigns whose process stopped heartbeating."""
+    conf = conf or get_link_campaign_settings()
+    return LinkCampaign.objects.filter(
+        status=CampaignStatus.RUNNING,
+        heartbeat_at__lt=timezone.now() - timedelta(seconds=conf["STALE_SECONDS"]),
+        **filters,
+    ).update(status=CampaignStatus.PENDING, worker_id=None)
+
+
+def heartbeat(campaign_id, worker_id):
+    """Stamp the campaign; False once it is no longer ours to run."""
+    return bool(
+        LinkCampaign.objects.filter(
+            pk=campaign_id, status=CampaignStatus.RUNNING, worker_id=worker_id
+        ).update(heartbeat_at=timezone.now())
+    )
+
+
+def claim_campaign(campaign_id, worker_id):
+    return bool(
+        LinkCampaign.objects.filter(pk=campaign_id, status=CampaignStatus.PENDING).update(
+            status=CampaignStatus.RUNNING,
+            worker_id=worker_id,
+            started_at=timezone.now(),
+            heartbeat_at=timezone.now(),
+        )
+    )
+
+
+def claim_next_campaign(worker_id):
+    """Oldest PENDING campaign, moved to RUNNING (SKIP LOCKED, like export jobs)."""
+    with transaction.atomic():
+        campaign = (
+            LinkCampaign.objects.select_for_update(skip_locked=True)
+            .filter(status=CampaignStatus.PENDING)
+            .order_by("created_at", "id")
+            .first()
+        )
+        if not campaign:
+            return None
+        campaign.status = CampaignStatus.RUNNING
+        campaign.worker_id = worker_id
+        campaign.started_at = timezone.now()
+        campaign.heartbeat_at = campaign.started_at
+        campaign.save(update_fields=["status", "worker_id", "started_at", "heartbeat_at"])
+        return campaign
+
+
+def run_claimed_campaign(campaign_id):
+    try:
+        # Per run, so a stuck thread and its replacement in the same
+        # process are told apart.
+        if claim_campaign(campaign_id, f"{get_worker_id()}:{threading.get_ident()}"):
+            run_campaign(LinkCampaign.objects.get(pk=campaign_id))
+    finally:
+        close_old_connections()
+
+
+# --- run ---
+def create_campaign_logs(campaign, conf):
+    """
+    Write one PENDING SmsLog per recipient, carrying its own link. Resumes
+    after the last recipient written by an earlier run of the campaign.
+    Returns the number of recipients.
+    """
+    written = SmsLog.objects.filter(campaign_id=campaign.id)
+    total = written.count()
+    last_recipient_id = written.aggregate(last=Max("recipient_id"))["last"]
+    if total and last_recipient_id is None:
+        # Written before recipient_id existed; nothing to resume from.
+        return total
+
+    rows = get_recipients(campaign.campaign_type, campaign.quarter_code)
+    if last_recipient_id is not None:
+        rows = rows.filter(id__gt=last_recipient_id)
+    rows = (
+        rows.order_by("id")
+        .values_list("id", "mobile_number")
+        .iterator(chunk_size=conf["INSERT_CHUNK_SIZE"])
+    )
+    chunk = []
+    for pk, mobile_number in rows:
+        text, template_id = link_sms(build_link(campaign.campaign_type, pk, conf))
+        chunk.append(
+            SmsLog(
+                user_id=campaign.created_by,
+                mobile_number=mobile_number,
+                message=text,
+                template_id=template_id,
+                sms_type=CAMPAIGN_SMS_TYPES[campaign.campaign_type],
+                request_id=generate_request_id(),
+                status=DeliveryStatus.PENDING,
+                campaign_id=campaign.id,
+                recipient_id=pk,
+            )
+        )
+        if len(chunk) >= conf["INSERT_CHUNK_SIZE"]:
+            SmsLog.objects.bulk_create(chunk)
+            total += len(chunk)
+            chunk = []
+            if not heartbeat(campaign.id, campaign.worker_id):
+                return total
+    if chunk:
+        SmsLog.objects.bulk_create(chunk)
+        total += len(chunk)
+    return total
+
+
+def send_batch(campaign_id, worker_id, batch, backend, limiter, dispatch_conf):
+    """
+    Send one gateway request for ``batch`` [(log_id, mobile, text, template_id)],
+    retrying the retryable part with the MESSAGE_DISPATCH backoff. Skipped
+    when the campaign was released and is now run by someone else.
+    """
+    if not heartbeat(campaign_id, worker_id):
+        close_old_connections()
+        return
+    outcome = {}
+    remaining = batch
+    attempt = 0
+    try:
+        while remaining:
+            attempt += 1
+            limiter.acquire(len(remaining))
+            # Every message of one campaign uses the same template.
+            results = backend.send_bulk_sms(
+                [(mobile, text) for _, mobile, text, _ in remaining], remaining[0][3]
+            )
+            retry = []
+            for row, result in zip(remaining, results):
+                if result.retryable and not result.delivered and attempt < dispatch_conf["MAX_ATTEMPTS"]:
+                    retry.append(row)
+                else:
+                    outcome[row[0]] = result
+            remaining = retry
+            if remaining:
+                time.sleep(dispatch_conf["RETRY_BACKOFF"] * 2 ** (attempt - 1))
+    except Exception as e:
+        logger.exception("Link campaign #%s batch failed", campaign_id)
+        for row in remaining:
+            outcome[row[0]] = (False, str(e), False)
+
+    record_batch(campaign_id, outcome, attempt)
+    close_old_connections()
+
+
+def record_batch(campaign_id, outcome, attempts):
+    now = timezone.now()
+    logs = []
+    sent = 0
+    for log_id, (delivered, response, _) in outcome.items():
+        sent += bool(delivered)
+        logs.append(
+            SmsLog(
+                pk=log_id,
+                status=DeliveryStatus.DELIVERED if delivered else DeliveryStatus.FAILED,
+                delivered_at=now if delivered else None,
+                response=response,
+                attempts=attempts,
+            )
+        )
+    with transaction.atomic():
+        SmsLog.objects.bulk_update(
+            logs, ["status", "delivered_at", "response", "attempts"]
+        )
+        LinkCampaign.objects.filter(pk=campaign_id).update(
+            sent_count=F("sent_count") + sent,
+            failed_count=F("failed_count") + len(logs) - sent,
+        )
+
+
+def iter_batches(campaign_id, batch_size):
+    pending = (
+        SmsLog.objects.filter(campaign_id=campaign_id, status=DeliveryStatus.PENDING)
+        .order_by("id")
+        .values_list("id", "mobile_number", "message", "template_id")
+        .iterator(chunk_size=batch_size * 10)
+    )
+    batch = []
+    for row in pending:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_campaign(campaign):
+    conf = get_link_campaign_settings()
+    dispatch_conf = get_dispatch_settings()
+    # Writes that end the run only apply while the campaign is still ours.
+    owned = LinkCampaign.objects.filter(
+        pk=campaign.pk, status=CampaignStatus.RUNNING, worker_id=campaign.worker_id
+    )
+    try:
+        total = create_campaign_logs(campaign, conf)
+        if not owned.update(total_recipients=total):
+            return
+
+        backend = load_backends(dispatch_conf)[SMS]
+        limiter = RateLimiter(conf["RATE_PER_SECOND"])
+        with ThreadPoolExecutor(
+            max_workers=conf["CONCURRENCY"], thread_name_prefix=f"campaign-{campaign.pk}"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    send_batch, campaign.pk, campaign.worker_id, batch, backend, limiter, dispatch_conf
+                )
+                for batch in iter_batches(campaign.pk, conf["BATCH_SIZE"])
+            ]
+            for future in futures:
+                future.result()
+    except Exception as e:
+        logger.exception("Link campaign #%s failed", campaign.pk)
+        owned.update(status=CampaignStatus.FAILED, error=str(e), finished_at=timezone.now())
+        return
+
+    owned.update(status=CampaignStatus.COMPLETED, finished_at=timezone.now())
+
+
+def campaign_payload(campaign):
+    done = campaign.sent_count + campaign.failed_count
+    total = campaign.total_recipients
+    return {
+        "campaign_id": campaign.id,
+        "campaign_type": campaign.campaign_type,
+        "quarter_code": campaign.quarter_code,
+        "status": campaign.get_status_display(),
+        "total_recipients": total,
+        "sent": campaign.sent_count,
+        "failed": campaign.failed_count,
+        "pending": max(total - done, 0),
+        "progress": int(done * 100 / total) if total else (
+            100 if campaign.status == CampaignStatus.COMPLETED else 0
+        ),
+        "error": campaign.error,
+        "created_at": campaign.created_at,
+        "started_at": campaign.started_at,
+        "finished_at": campaign.finished_at,
+        "status_url": f"/api/code_of_conduct/link_campaign/{campaign.id}/",
+    }
@@ -0,0 +1,62 @@
+from code_of_conduct.models.ras_data import RasData
+from auth_system.utils.export_jobs import iter_with_progress, write_export_file
+
+RAS_EXPORT_CHUNK_SIZE = 2000
+RAS_EXPORT_SHEET_TITLE = "Ras Data"
+
+RAS_EXPORT_COLUMNS = [
+    "ID", "Quarter Code", "Name", "Owner Name", "From Date", "To Date",
+    "Adhar Number", "PAN Number", "Mobile Number", "City", "Address",
+    "Created At", "Created By"
+]
+
+
+def get_ras_export_queryset():
+    return RasData.objects.filter(deleted_at__isnull=True).order_by("id")
+
+
+def iter_ras_rows(queryset):
+    """Yield RAS export rows, reading the table through a chunked cursor."""
+    values = queryset.values_list(
+        "id",
+        "quarter_code",
+        "name",
+        "owner_name",
+        "from_date",
+        "to_date",
+        "adhar_number",
+        "pan_number",
+        "mobile_number",
+        "city",
+        "address",
+        "created_at",
+        "created_by",
+    )
+    for (
+        pk, quarter_code, name, owner_name, from_date, to_date, adhar_number,
+        pan_number, mobile_number, city, address, created_at, created_by,
+    ) in values.iterator(chunk_size=RAS_EXPORT_CHUNK_SIZE):
+        yield [
+            pk,
+            quarter_code,
+            name,
+            owner_name,
+            from_date.strftime("%Y-%m-%d") if from_date else "",
+            to_date.strftime("%Y-%m-%d") if to_date else "",
+            adhar_number,
+            pan_number,
+            mobile_number,
+            city,
+            address,
+            created_at.strftime("%Y-%m-%d %H:%M:%S") if created_at else "",
+            created_by,
+        ]
+
+
+def run_ras_data_export(params, export_format, target_path, progress):
+    """Background export job handler for RasExportExcelDownload."""
+    queryset = get_ras_export_queryset()
+    rows = iter_with_progress(iter_ras_rows(queryset), queryset.count(), progress)
+    write_export_file(
+        RAS_EXPORT_COLUMNS, rows, export_format, target_path, RAS_EXPORT_SHEET_TITLE
+    )
@@ -18,9 +18,11 @@ import openpyxl
 from django.conf import settings
 from django.core.files.storage import default_storage
 from django.db.models import Q
-from auth_system.utils.common import encrypt_id, decrypt_id
+from code_of_conduct.utils.bulk_import import has_required_columns, import_quarterly_upload
+from auth_system.utils.common import decrypt_id
 from auth_system.utils.otp_utils import send_link_to_mobile
-from constants import LanguageType
+from code_of_conduct.utils.link_campaign import build_link
+from constants import CAMPAIGN_DEPOSIT_AGENT, LanguageType
 
 class DepositAgentsUploadView(APIView):
     permission_classes = [IsAuthenticated, IsTokenValid]
@@ -44,7 +46,7 @@ class DepositAgentsUploadView(APIView):
         page_size = request.query_params.get("page_size")
         page = request.query_params.get("page")
 
-        if page_size or page:
+        if page_size or page or paginator.is_cursor_mode(request):
             page_data = paginator.paginate_queryset(enquiries, request)
             serializer = DepositAgentsDataSerializer(page_data, many=True)
             return paginator.get_custom_paginated_response(
@@ -88,68 +90,19 @@ class DepositAgentsUploadView(APIView):
         try:
             df = pd.read_excel(full_path)
 
-            required_columns = {
-                'quarter_code', 'name', 'owner_name', 'from_date', 'to_date',
-                'adhar_number', 'pan_number', 'mobile_number', 'city', 'address'
-            }
-
-            if not required_columns.issubset(df.columns):
+            if not has_required_columns(df):
                 deposit_agent.delete()
                 return Response(
                     {"success": False, "message": "Excel columns are not valid."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            success_count = 0
-            duplicate_count = 0
-            error_rows = []
-
-            for index, row in df.iterrows():
-                try:
-                    quarter_code = str(row.get('quarter_code', '')).strip()
-                    adhar_number = str(row.get('adhar_number', '')).strip()
-
-                    # Validate mobile length
-                    mobile_number = str(row.get('mobile_number', '')).strip()[:15]
-                    adhar_number = adhar_number[:20]
-                    pan_number = str(row.get('pan_number', '')).strip()[:20]
-
-                    # Convert dates safely
-                    from_date = row.get('from_date') if pd.notnull(row.get('from_date')) else None
-                    to_date = row.get('to_date') if pd.notnull(row.get('to_date')) else None
-
-                    # Skip if duplicate
-                    if DepositAgentsData.objects.filter(quarter_code=quarter_code, adhar_number=adhar_number).exists():
-                        duplicate_count += 1
-                        continue
-
-                    DepositAgentsData.objects.create(
-                        quarter_code=quarter_code,
-                        name=str(row.get('name', '')).strip(),
-                        owner_name=str(row.get('owner_name', '')).strip(),
-                        from_date=from_date,
-                        to_date=to_date,
-                        adhar_number=adhar_number,
-                        pan_number=pan_number,
-                        mobile_number=mobile_number,
-                        city=str(row.get('city', '')).strip(),
-                        address=str(row.get('address', '')).strip(),
-                        created_by=request.user.id,
-                        created_at=timezone.now()
-                    )
-                    success_count += 1
-
-                except Exception as e:
-                    error_rows.append({"row": index + 2, "error": str(e)})
+            summary = import_quarterly_upload(DepositAgentsData, df, request.user.id)
 
             return Response({
                 "success": True,
                 "message": "Upload complete.",
-                "summary": {
-                    "added": success_count,
-                    "duplicates": duplicate_count,
-                    "errors": error_rows
-                }
+                "summary": summary
             })
 
         except Exception as e:
@@ -232,9 +185,7 @@ class SendLink(APIView):
         
         # otp_code, expiry = send_login_otp(user)
 
-        encrypted_id = encrypt_id(pk)
-        # Generate the link with the pk
-        url = f"https://uatcws.berarfinance.com/deposit_agents/f1/?id={encrypted_id}"
+        url = build_link(CAMPAIGN_DEPOSIT_AGENT, pk)
 
         return Response(
             {
@@ -265,15 +216,17 @@ class SendLinkToMobileView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        api_response  = send_link_to_mobile(request, mobile_number, link)
-        
+        queued = send_link_to_mobile(request, mobile_number, link)
+
+        # Delivery happens after the response; sms_log_id tracks its outcome.
         return Response(
             {
                 "success": True,
-                "message": "SMS sent successfully" if not api_response.get("error") else "SMS sending failed",
-                "sms_api_response": api_response,
+                "message": "SMS queued",
+                "request_id": queued["request_id"],
+                "sms_log_id": queued["sms_log_id"],
             },
-            status=status.HTTP_200_OK if not api_response.get("error") else status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status=status.HTTP_202_ACCEPTED,
         )
 
 
@@ -17,6 +17,7 @@ import openpyxl
 from django.conf import settings
 from django.core.files.storage import default_storage
 from django.db.models import Q
+from code_of_conduct.utils.bulk_import import has_required_columns, import_quarterly_upload
 
 
 class DsaUploadView(APIView):
@@ -41,7 +42,7 @@ class DsaUploadView(APIView):
         page_size = request.query_params.get("page_size")
         page = request.query_params.get("page")
 
-        if page_size or page:
+        if page_size or page or paginator.is_cursor_mode(request):
             page_data = paginator.paginate_queryset(enquiries, request)
             serializer = DsaDataSerializer(page_data, many=True)
             return paginator.get_custom_paginated_response(
@@ -88,68 +89,19 @@ class DsaUploadView(APIView):
         try:
             df = pd.read_excel(full_path)
 
-            required_columns = {
-                'quarter_code', 'name', 'owner_name', 'from_date', 'to_date',
-                'adhar_number', 'pan_number', 'mobile_number', 'city', 'address'
-            }
-
-            if not required_columns.issubset(df.columns):
+            if not has_required_columns(df):
                 dsa.delete()
                 return Response(
                     {"success": False, "message": "Excel columns are not valid."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            success_count = 0
-            duplicate_count = 0
-            error_rows = []
-
-            for index, row in df.iterrows():
-                try:
-                    quarter_code = str(row.get('quarter_code', '')).strip()
-                    adhar_number = str(row.get('adhar_number', '')).strip()
-
-                    # Validate mobile length
-                    mobile_number = str(row.get('mobile_number', '')).strip()[:15]
-                    adhar_number = adhar_number[:20]
-                    pan_number = str(row.get('pan_number', '')).strip()[:20]
-
-                    # Convert dates safely
-                    from_date = row.get('from_date') if pd.notnull(row.get('from_date')) else None
-                    to_date = row.get('to_date') if pd.notnull(row.get('to_date')) else None
-
-                    # Skip if duplicate
-                    if DsaData.objects.filter(quarter_code=quarter_code, adhar_number=adhar_number).exists():
-                        duplicate_count += 1
-                        continue
-
-                    DsaData.objects.create(
-                        quarter_code=quarter_code,
-                        name=str(row.get('name', '')).strip(),
-                        owner_name=str(row.get('owner_name', '')).strip(),
-                        from_date=from_date,
-                        to_date=to_date,
-                        adhar_number=adhar_number,
-                        pan_number=pan_number,
-                        mobile_number=mobile_number,
-                        city=str(row.get('city', '')).strip(),
-                        address=str(row.get('address', '')).strip(),
-                        created_by=request.user.id,
-                        created_at=timezone.now()
-                    )
-                    success_count += 1
-
-                except Exception as e:
-                    error_rows.append({"row": index + 2, "error": str(e)})
+            summary = import_quarterly_upload(DsaData, df, request.user.id)
 
             return Response({
                 "success": True,
                 "message": "Upload complete.",
-                "summary": {
-                    "added": success_count,
-                    "duplicates": duplicate_count,
-                    "errors": error_rows
-                }
+                "summary": summary
             })
 
         except Exception as e:
@@ -0,0 +1,91 @@
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_system.permissions.token_valid import IsTokenValid
+from code_of_conduct.models.link_campaign import LinkCampaign
+from code_of_conduct.utils.link_campaign import (
+    CAMPAIGN_MODELS,
+    campaign_payload,
+    get_recipients,
+    start_campaign,
+)
+
+
+class LinkCampaignView(APIView):
+    """
+    POST {"campaign_type": "deposit_agent", "quarter_code": "..."}
+    sends every agent of that quarter their code-of-conduct link in the
+    background; poll the returned status_url for progress.
+    """
+
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def get(self, request):
+        campaigns = LinkCampaign.objects.order_by("-created_at")
+        campaign_type = request.query_params.get("campaign_type")
+        if campaign_type:
+            campaigns = campaigns.filter(campaign_type=campaign_type)
+        return Response(
+            {
+                "success": True,
+                "message": "Link campaigns retrieved successfully.",
+                "data": [campaign_payload(c) for c in campaigns[:50]],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def post(self, request):
+        campaign_type = request.data.get("campaign_type")
+        quarter_code = request.data.get("quarter_code")
+
+        if campaign_type not in CAMPAIGN_MODELS or not quarter_code:
+            return Response(
+                {
+                    "success": False,
+                    "message": "Invalid request",
+                    "errors": "quarter_code and campaign_type ({}) are required".format(
+                        ", ".join(CAMPAIGN_MODELS)
+                    ),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not get_recipients(campaign_type, quarter_code).exists():
+            return Response(
+                {
+                    "success": False,
+                    "message": f"No {campaign_type} records found for quarter {quarter_code}.",
+                },
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        campaign = start_campaign(campaign_type, quarter_code, request.user.id)
+        return Response(
+            {
+                "success": True,
+                "message": "Link campaign queued.",
+                "data": campaign_payload(campaign),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class LinkCampaignDetailView(APIView):
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def get(self, request, pk):
+        try:
+            campaign = LinkCampaign.objects.get(pk=pk)
+        except LinkCampaign.DoesNotExist:
+            raise NotFound(detail=f"Link campaign with id {pk} not found.")
+        return Response(
+            {
+                "success": True,
+                "message": "Link campaign status retrieved successfully.",
+                "data": campaign_payload(campaign),
+            },
+            status=status.HTTP_200_OK,
+        )
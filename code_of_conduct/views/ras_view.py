@@ -1,4 +1,5 @@
 import os
+import tempfile
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from auth_system.permissions.token_valid import IsTokenValid
@@ -16,10 +17,27 @@ import pandas as pd
 import openpyxl
 from django.conf import settings
 from django.core.files.storage import default_storage
-from django.db.models import Q
+from code_of_conduct.utils.bulk_import import has_required_columns, import_quarterly_upload
 from openpyxl import Workbook
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from io import BytesIO
+from auth_system.utils.export_jobs import (
+    enqueue_export_job,
+    export_job_payload,
+    write_export_file,
+)
+from code_of_conduct.utils.ras_export import (
+    RAS_EXPORT_COLUMNS,
+    RAS_EXPORT_SHEET_TITLE,
+    get_ras_export_queryset,
+    iter_ras_rows,
+)
+from constants import EXPORT_JOB_RAS_DATA
+from auth_system.utils.search import apply_search, wants_ranking
+
+# Columns behind ?search= (indexed by migration 0002_search_indexes).
+RAS_SEARCH_FIELDS = ("name", "city")
+RAS_SEARCH_PREFIX_FIELDS = ("adhar_number", "mobile_number")
 
 
 
@@ -28,23 +46,20 @@ class RasUploadView(APIView):
 
     def get(self, request):
         search = request.query_params.get("search", None)
-        enquiries = RasData.objects.filter(deleted_at__isnull=True)
-        
-        if search:
-            enquiries = enquiries.filter(
-                Q(name__icontains=search) |
-                Q(adhar_number__icontains=search) |
-                Q(mobile_number__icontains=search) |
-                Q(city__icontains=search)
-            )
-
-        enquiries = enquiries.order_by("id")
+        enquiries = RasData.objects.filter(deleted_at__isnull=True).order_by("id")
+        enquiries = apply_search(
+            enquiries,
+            search,
+            RAS_SEARCH_FIELDS,
+            RAS_SEARCH_PREFIX_FIELDS,
+            rank=wants_ranking(request),
+        )
         
         paginator = CustomPagination()
         page_size = request.query_params.get("page_size")
         page = request.query_params.get("page")
 
-        if page_size or page:
+        if page_size or page or paginator.is_cursor_mode(request):
             page_data = paginator.paginate_queryset(enquiries, request)
             serializer = RasDataSerializer(page_data, many=True)
             return paginator.get_custom_paginated_response(
@@ -93,68 +108,19 @@ class RasUploadView(APIView):
         try:
             df = pd.read_excel(full_path)
 
-            required_columns = {
-                'quarter_code', 'name', 'owner_name', 'from_date', 'to_date',
-                'adhar_number', 'pan_number', 'mobile_number', 'city', 'address'
-            }
-
-            if not required_columns.issubset(df.columns):
+            if not has_required_columns(df):
                 ras.delete()
                 return Response(
                     {"success": False, "message": "Excel columns are not valid."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            success_count = 0
-            duplicate_count = 0
-            error_rows = []
-
-            for index, row in df.iterrows():
-                try:
-                    quarter_code = str(row.get('quarter_code', '')).strip()
-                    adhar_number = str(row.get('adhar_number', '')).strip()
-
-                    # Validate mobile length
-                    mobile_number = str(row.get('mobile_number', '')).strip()[:15]
-                    adhar_number = adhar_number[:20]
-                    pan_number = str(row.get('pan_number', '')).strip()[:20]
-
-                    # Convert dates safely
-                    from_date = row.get('from_date') if pd.notnull(row.get('from_date')) else None
-                    to_date = row.get('to_date') if pd.notnull(row.get('to_date')) else None
-
-                    # Skip if duplicate
-                    if RasData.objects.filter(quarter_code=quarter_code, adhar_number=adhar_number).exists():
-                        duplicate_count += 1
-                        continue
-
-                    RasData.objects.create(
-                        quarter_code=quarter_code,
-                        name=str(row.get('name', '')).strip(),
-                        owner_name=str(row.get('owner_name', '')).strip(),
-                        from_date=from_date,
-                        to_date=to_date,
-                        adhar_number=adhar_number,
-                        pan_number=pan_number,
-                        mobile_number=mobile_number,
-                        city=str(row.get('city', '')).strip(),
-                        address=str(row.get('address', '')).strip(),
-                        created_by=request.user.id,
-                        created_at=timezone.now()
-                    )
-                    success_count += 1
-
-                except Exception as e:
-                    error_rows.append({"row": index + 2, "error": str(e)})
+            summary = import_quarterly_upload(RasData, df, request.user.id)
 
             return Response({
                 "success": True,
                 "message": "Upload complete.",
-                "summary": {
-                    "added": success_count,
-                    "duplicates": duplicate_count,
-                    "errors": error_rows
-                }
+                "summary": summary
             })
 
         except Exception as e:
@@ -198,7 +164,7 @@ class RasExportExcelDownload(APIView):
 
     def get(self, request):
         try:
-            data = RasData.objects.filter(deleted_at__isnull=True)
+            data = get_ras_export_queryset()
 
             if not data.exists():
                 return Response({
@@ -206,48 +172,32 @@ class RasExportExcelDownload(APIView):
                     "message": "No data available to export."
                 }, status=status.HTTP_404_NOT_FOUND)
 
-            workbook = Workbook()
-            worksheet = workbook.active
-            worksheet.title = "Ras Data"
-
-            # Define headers
-            headers = [
-                "ID", "Quarter Code", "Name", "Owner Name", "From Date", "To Date",
-                "Adhar Number", "PAN Number", "Mobile Number", "City", "Address",
-                "Created At", "Created By"
-            ]
-            worksheet.append(headers)
-
-            # Append data rows
-            for item in data:
-                worksheet.append([
-                    item.id,
-                    item.quarter_code,
-                    item.name,
-                    item.owner_name,
-                    item.from_date.strftime("%Y-%m-%d") if item.from_date else "",
-                    item.to_date.strftime("%Y-%m-%d") if item.to_date else "",
-                    item.adhar_number,
-                    item.pan_number,
-                    item.mobile_number,
-                    item.city,
-                    item.address,
-                    item.created_at.strftime("%Y-%m-%d %H:%M:%S") if item.created_at else "",
-                    item.created_by,
-                ])
-
-            # Prepare file to return as HTTP response
-            excel_file = BytesIO()
-            workbook.save(excel_file)
+            if request.query_params.get("async") == "true":
+                job = enqueue_export_job(
+                    EXPORT_JOB_RAS_DATA, "xlsx", {}, request.user.id
+                )
+                return Response({
+                    "success": True,
+                    "message": "Export queued.",
+                    "data": export_job_payload(job),
+                }, status=status.HTTP_202_ACCEPTED)
+
+            excel_file = tempfile.TemporaryFile(suffix=".xlsx")
+            write_export_file(
+                RAS_EXPORT_COLUMNS,
+                iter_ras_rows(data),
+                "xlsx",
+                excel_file,
+                RAS_EXPORT_SHEET_TITLE,
+            )
             excel_file.seek(0)
 
-            response = HttpResponse(
+            return FileResponse(
                 excel_file,
+                as_attachment=True,
+                filename="ras_data.xlsx",
                 content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
             )
-            response['Content-Disposition'] = 'attachment; filename="ras_data.xlsx"'
-
-            return response
 
         except Exception as e:
             return Response({
@@ -132,6 +132,8 @@ class SmsType(models.IntegerChoices):
     EMPLOYEE_LOGIN_OTP = 3, "Employee Login OTP"
     LEAD_VERIFICATION_OTP = 4, "Lead Verification OTP"
     DEPOSIT_AGENT_SEND_LINK = 5, "Send Link"
+    DSA_SEND_LINK = 6, "DSA Send Link"
+    RAS_SEND_LINK = 7, "RAS Send Link"
 
 
 # -----------------------
@@ -306,3 +308,81 @@ class EmployeeStatus(models.IntegerChoices):
 
 
 PRIORITY_MAPPING = {"High": 1, "Medium": 2, "Low": 3}
+
+
+# -----------------------
+# Background Export Jobs
+# -----------------------
+class ExportJobStatus(models.IntegerChoices):
+    PENDING = 1, "Pending"
+    RUNNING = 2, "Running"
+    COMPLETED = 3, "Completed"
+    FAILED = 4, "Failed"
+
+
+EXPORT_JOB_ENQUIRY_REPORT = "enquiry_report"
+EXPORT_JOB_RAS_DATA = "ras_data"
+EXPORT_JOB_TYPE_CHOICES = [
+    (EXPORT_JOB_ENQUIRY_REPORT, "Enquiry Report"),
+    (EXPORT_JOB_RAS_DATA, "RAS Data"),
+]
+
+
+# -----------------------
+# Master CSV Uploads
+# -----------------------
+class MasterUploadStatus(models.IntegerChoices):
+    RUNNING = 1, "Running"
+    COMPLETED = 2, "Completed"
+    FAILED = 3, "Failed"
+
+
+MASTER_UPLOAD_BRANCH = "branch"
+MASTER_UPLOAD_DEPARTMENT = "department"
+MASTER_UPLOAD_DESIGNATION = "designation"
+MASTER_UPLOAD_DEALER = "dealer"
+MASTER_UPLOAD_SUBDEALER = "subdealer"
+MASTER_UPLOAD_TYPE_CHOICES = [
+    (MASTER_UPLOAD_BRANCH, "Branch"),
+    (MASTER_UPLOAD_DEPARTMENT, "Department"),
+    (MASTER_UPLOAD_DESIGNATION, "Designation"),
+    (MASTER_UPLOAD_DEALER, "Dealer"),
+    (MASTER_UPLOAD_SUBDEALER, "Sub Dealer"),
+]
+
+
+# -----------------------
+# Code of Conduct Link Campaigns
+# -----------------------
+class CampaignStatus(models.IntegerChoices):
+    PENDING = 1, "Pending"
+    RUNNING = 2, "Running"
+    COMPLETED = 3, "Completed"
+    FAILED = 4, "Failed"
+
+
+CAMPAIGN_DEPOSIT_AGENT = "deposit_agent"
+CAMPAIGN_DSA = "dsa"
+CAMPAIGN_RAS = "ras"
+CAMPAIGN_TYPE_CHOICES = [
+    (CAMPAIGN_DEPOSIT_AGENT, "Deposit Agent"),
+    (CAMPAIGN_DSA, "DSA"),
+    (CAMPAIGN_RAS, "RAS"),
+]
+
+
+# -----------------------
+# Resumable Lead Media Uploads
+# -----------------------
+class UploadSessionStatus(models.IntegerChoices):
+    UPLOADING = 1, "Uploading"
+    COMPLETED = 2, "Completed"
+    ABORTED = 3, "Aborted"
+
+
+UPLOAD_KIND_IMAGE = "image"
+UPLOAD_KIND_SELFIE = "selfie"
+UPLOAD_KIND_CHOICES = [
+    (UPLOAD_KIND_IMAGE, "Enquiry Image"),
+    (UPLOAD_KIND_SELFIE, "Enquiry Selfie"),
+]
@@ -2,7 +2,8 @@
 
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from ems.models import Role, RolePermission
+from ems.models import Role
+from ems.utils.role_permissions import upsert_role_permissions
 from constants import (
     EMS,
     USER,
@@ -178,23 +179,15 @@ class Command(BaseCommand):
             ]
 
             
+            grouped = {}
             for perm_data in permissions_to_create:
-                RolePermission.objects.update_or_create(
-                    role=perm_data["role"],
-                    portal_id=perm_data["portal_id"],
-                    menu_id=perm_data["menu_id"],
-                    defaults={
-                        "view": perm_data["view"],
-                        "add": perm_data["add"],
-                        "edit": perm_data["edit"],
-                        "delete": perm_data["delete"],
-                        "print": perm_data["print"],
-                        "export": perm_data["export"],
-                        "sms_send": perm_data["sms_send"],
-                        "api_limit": perm_data["api_limit"],
-                        "created_by": perm_data["created_by"],
-                    },
+                key = (perm_data["role"], perm_data["portal_id"])
+                grouped.setdefault(key, []).append(perm_data)
+            for (role, portal_id), perms in grouped.items():
+                summary = upsert_role_permissions(
+                    role, perms, ADMIN_EMPLOYEE_ID, portal_id=portal_id
                 )
+                self.stdout.write(f"{role.role_code}: {summary}")
 
             self.stdout.write(
                 self.style.SUCCESS("RolePermissions seeded successfully.")
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-18 12:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ems', '0003_tblbranch_state_group_code_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MasterUploadJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_type', models.CharField(choices=[('branch', 'Branch'), ('department', 'Department'), ('designation', 'Designation'), ('dealer', 'Dealer'), ('subdealer', 'Sub Dealer')], max_length=50)),
+                ('file_name', models.CharField(max_length=255)),
+                ('file_hash', models.CharField(max_length=64)),
+                ('status', models.IntegerField(choices=[(1, 'Running'), (2, 'Completed'), (3, 'Failed')], default=1)),
+                ('total_rows', models.IntegerField(default=0)),
+                ('next_row', models.IntegerField(default=0)),
+                ('success_count', models.IntegerField(default=0)),
+                ('failed_count', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_by', models.IntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('heartbeat_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'ems_master_upload_job',
+                'indexes': [models.Index(fields=['upload_type', 'file_hash', 'created_by', 'status'], name='ems_master__upload__165849_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MasterUploadFailedRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_number', models.IntegerField()),
+                ('reason', models.TextField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='failed_rows', to='ems.masteruploadjob')),
+            ],
+            options={
+                'db_table': 'ems_master_upload_failed_row',
+                'indexes': [models.Index(fields=['job', 'row_number'], name='ems_master__job_id_c1da26_idx')],
+            },
+        ),
+    ]
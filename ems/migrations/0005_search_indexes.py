@@ -0,0 +1,35 @@
+from django.db import migrations
+
+from auth_system.utils.search import create_search_indexes, drop_search_indexes
+
+# (model, icontains columns, istartswith columns) searched by the list views.
+SEARCH_INDEXES = [
+    ("TblEmpBasicProfile", ["name", "email", "gender"], ["employee_code", "mobile_number"]),
+    ("TblBranch", ["branch_name", "email"], ["branch_code", "branch_id", "mobile_number"]),
+    ("Menu", ["menu_name"], ["menu_code"]),
+]
+
+
+def add_indexes(apps, schema_editor):
+    for model_name, contains, prefix in SEARCH_INDEXES:
+        table = apps.get_model("ems", model_name)._meta.db_table
+        create_search_indexes(schema_editor, table, contains, prefix)
+
+
+def remove_indexes(apps, schema_editor):
+    for model_name, contains, prefix in SEARCH_INDEXES:
+        table = apps.get_model("ems", model_name)._meta.db_table
+        drop_search_indexes(schema_editor, table, contains, prefix)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("ems", "0004_masteruploadjob_masteruploadfailedrow"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
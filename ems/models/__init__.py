@@ -15,3 +15,5 @@ from .apilog import APILog
 from .dealer import Dealer
 from .sub_dealer import SubDealer
 from .location_master import City, Country, State
+from .master_upload_job import MasterUploadJob
+from .master_upload_failed_row import MasterUploadFailedRow
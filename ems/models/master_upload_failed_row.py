@@ -0,0 +1,17 @@
+from django.db import models
+from ems.models.master_upload_job import MasterUploadJob
+
+
+class MasterUploadFailedRow(models.Model):
+    job = models.ForeignKey(
+        MasterUploadJob, on_delete=models.CASCADE, related_name="failed_rows"
+    )
+    row_number = models.IntegerField()
+    reason = models.TextField()
+
+    class Meta:
+        db_table = "ems_master_upload_failed_row"
+        indexes = [models.Index(fields=["job", "row_number"])]
+
+    def __str__(self):
+        return f"Row {self.row_number}: {self.reason}"
@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils import timezone
+from constants import MASTER_UPLOAD_TYPE_CHOICES, MasterUploadStatus
+
+
+class MasterUploadJob(models.Model):
+    upload_type = models.CharField(max_length=50, choices=MASTER_UPLOAD_TYPE_CHOICES)
+    file_name = models.CharField(max_length=255)
+    file_hash = models.CharField(max_length=64)
+    status = models.IntegerField(
+        choices=MasterUploadStatus.choices, default=MasterUploadStatus.RUNNING
+    )
+    total_rows = models.IntegerField(default=0)
+    # Data rows (0-based) already committed; a resumed run starts here.
+    next_row = models.IntegerField(default=0)
+    success_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+
+    created_by = models.IntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "ems_master_upload_job"
+        indexes = [
+            models.Index(fields=["upload_type", "file_hash", "created_by", "status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.upload_type} upload #{self.id} [{self.get_status_display()}]"
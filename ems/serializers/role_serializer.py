@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from django.utils import timezone
 from ems.models.role import Role
-from ems.models.role_permission import RolePermission
 from ems.serializers.role_permission_serializer import RolePermissionSerializer
 from django.db import transaction
 from ems.models.portal import Portal
+from ems.utils.permission_matrix import invalidate_role_permissions
+from ems.utils.role_permissions import upsert_role_permissions
 
 
 class RoleSerializer(serializers.ModelSerializer):
@@ -50,15 +51,9 @@ class RoleSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         user_id = request.user.id if request and request.user.is_authenticated else None
 
-        role = Role.objects.create(created_by=user_id, **validated_data)
-
-        for perm in permissions_data:
-            RolePermission.objects.create(
-                role=role,
-                portal_id=role.portal_id,
-                created_by=user_id,
-                **{k: v for k, v in perm.items() if k != "portal_id"},
-            )
+        with transaction.atomic():
+            role = Role.objects.create(created_by=user_id, **validated_data)
+            upsert_role_permissions(role, permissions_data, user_id)
 
         return role
 
@@ -72,34 +67,8 @@ class RoleSerializer(serializers.ModelSerializer):
         instance.updated_at = timezone.now()
         instance.save()
         if permissions_data:
-            with transaction.atomic():
-                menu_ids = [
-                    perm.get("menu_id")
-                    for perm in permissions_data
-                    if perm.get("menu_id")
-                ]
-                RolePermission.objects.filter(
-                    role=instance,
-                    portal_id=instance.portal_id,
-                    menu_id__in=menu_ids,
-                    deleted_at__isnull=True,
-                ).delete()
-                for perm in permissions_data:
-                    menu_id = perm.get("menu_id")
-                    if not menu_id:
-                        continue
-                    RolePermission.objects.create(
-                        role=instance,
-                        portal_id=instance.portal_id,
-                        created_by=user_id,
-                        updated_by= user_id,
-                        updated_at= timezone.now(),
-                        **{
-                            k: v
-                            for k, v in perm.items()
-                            if k not in ["portal_id", "deleted_by", "deleted_at"]
-                        },
-                    )
+            upsert_role_permissions(instance, permissions_data, user_id)
+        invalidate_role_permissions(instance.id)
         return instance
 
     
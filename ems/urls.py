@@ -43,6 +43,7 @@ from ems.views.emp_official_information_view import (
 )
 
 from ems.views.role_permission_view import (
+    PermissionMatrixView,
     RolePermissionDetailView,
     RolePermissionListCreateView,
 )
@@ -150,6 +151,7 @@ urlpatterns = [
         RolePermissionDetailView.as_view(),
         name="role-permission-detail",
     ),
+    path("permission-matrix/", PermissionMatrixView.as_view(), name="permission-matrix"),
     path("dealers/", DealerListCreateView.as_view(), name="dealer-list-create"),
     path("dealers/<int:pk>/", DealerDetailView.as_view(), name="dealer-detail"),
     path(
@@ -0,0 +1,441 @@
+import logging
+import time
+from contextlib import contextmanager
+from decimal import Decimal, InvalidOperation
+
+import pandas as pd
+from django.db import connection, transaction
+from django.db.models.functions import Lower
+
+from auth_system.models import TblUser
+from auth_system.utils.password_hashing import hash_passwords
+from auth_system.utils.pg_copy import copy_into, copy_objects, copy_supported
+from ems.models.branch import TblBranch
+from ems.models.department import TblDepartment
+from ems.models.designation import TblDesignation
+from ems.models.emp_address_details import TblEmpAddressDetails
+from ems.models.emp_bank_details import TblEmpBankDetails
+from ems.models.emp_basic_profile import TblEmpBasicProfile
+from ems.models.emp_nominee_details import TblEmpNomineeDetails
+from ems.models.emp_official_information import TblEmpOfficialInformation
+from ems.models.role import Role
+
+logger = logging.getLogger(__name__)
+
+EMPTY_MARKERS = ["nan", "none", "", "null"]
+DATE_FORMATS = ("%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d")
+
+PROFILE_BATCH_SIZE = 2000
+CHILD_BATCH_SIZE = 500
+LOOKUP_CHUNK_SIZE = 5000
+
+STAGE_TABLE = "tmp_emp_import_stage"
+
+# Child table values copied from the CSV as-is (frame column -> CSV column).
+PASSTHROUGH_COLUMNS = {
+    "address": "address",
+    "city": "city",
+    "state": "state",
+    "pincode": "pincode",
+    "bank_name": "bank_name",
+    "bank_branch_name": "branch_name",
+    "account_number": "account_number",
+    "ifsc_code": "ifsc_code",
+    "nominee_name": "nominee_name",
+    "nominee_relation": "nominee_relation",
+    "remarks": "remarks",
+}
+
+
+class ImportProgress:
+    """Timing and row counts per import phase, also logged as they run."""
+
+    def __init__(self):
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name, rows):
+        started = time.monotonic()
+        logger.info("%s: %s rows", name, rows)
+        yield
+        seconds = round(time.monotonic() - started, 3)
+        self.phases.append({"phase": name, "rows": rows, "seconds": seconds})
+        logger.info("%s: done in %ss", name, seconds)
+
+
+def column(df, name, default=None):
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def sanitize_str(val, lower=False, is_mobile=False):
+    if val is None or pd.isna(val):
+        return None
+    s = str(val).strip()
+    if s.lower() in EMPTY_MARKERS:
+        return None
+    if is_mobile:
+        s = s.split(".")[0]
+    return s.lower() if lower else s
+
+
+def map_object(values, func):
+    # Series.map would infer a string dtype and turn None back into NaN.
+    return pd.Series([func(v) for v in values], index=values.index, dtype=object)
+
+
+def sanitize_series(values, lower=False, is_mobile=False):
+    return map_object(
+        values, lambda v: sanitize_str(v, lower=lower, is_mobile=is_mobile)
+    )
+
+
+def lookup_key(values):
+    """str(value).lower().strip(), as the master-data maps are keyed."""
+    return values.astype(object).map(str).str.lower().str.strip()
+
+
+def parse_date_series(values):
+    text = values.astype(object).map(
+        lambda v: None if v is None or pd.isna(v) or not v else str(v).strip()
+    )
+    parsed = pd.Series(None, index=values.index, dtype=object)
+    for fmt in DATE_FORMATS:
+        candidate = pd.to_datetime(text, format=fmt, errors="coerce")
+        fill = parsed.isnull() & candidate.notnull()
+        parsed[fill] = candidate[fill].dt.date
+    return parsed
+
+
+def parse_decimal(value):
+    if value is None or pd.isna(value) or str(value).strip().lower() in ["nan", "none", ""]:
+        return None
+    try:
+        return Decimal(str(value).strip())
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _none_if_nan(value):
+    return None if value is None or (not isinstance(value, str) and pd.isna(value)) else value
+
+
+def bulk_import_password(name, mobile_number):
+    """Initial password given to bulk-imported employees: Name@1234."""
+    name_p = name[:4].capitalize() if name else "User"
+    mobile_p = mobile_number[-4:] if mobile_number else "0000"
+    return f"{name_p}@{mobile_p}"
+
+
+def _fk(value):
+    value = _none_if_nan(value)
+    return None if value is None else int(value)
+
+
+class EmployeeCSVImporter:
+    """
+    Bulk employee onboarding behind UploadCSVView.
+
+    Validation runs on whole columns. Employee code, mobile and email
+    uniqueness is checked by loading the CSV keys into a temporary staging
+    table and joining it against TblEmpBasicProfile/TblUser (PostgreSQL), or
+    with chunked IN lookups elsewhere, instead of pulling every existing key
+    into Python. Initial passwords are hashed with the default hasher across
+    a process pool, profiles are bulk_created to get their ids back and the
+    five child tables are loaded with COPY.
+    """
+
+    def __init__(self, creator_id, progress=None):
+        self.creator_id = creator_id
+        self.progress = progress or ImportProgress()
+
+    def run(self, df):
+        with self.progress.phase("validate", len(df)):
+            frame = self.normalize(df)
+            reasons = self.static_reasons(frame)
+
+        with self.progress.phase("uniqueness", len(df)):
+            db_codes, db_mobiles, db_emails = self.existing_keys(frame)
+            self.add_db_reasons(frame, reasons, db_codes, db_mobiles, db_emails)
+            self.add_csv_duplicate_reasons(frame, reasons)
+
+        failed = reasons.notnull().any(axis=1)
+        valid = frame[~failed]
+
+        if len(valid):
+            # Hashing is the slow part, so it runs before the transaction opens.
+            with self.progress.phase("passwords", len(valid)):
+                hashed_passwords = self.hash_passwords(valid)
+            with transaction.atomic():
+                with self.progress.phase("profiles", len(valid)):
+                    profiles = self.create_profiles(valid)
+                with self.progress.phase("children", len(valid)):
+                    self.create_children(valid, profiles, hashed_passwords)
+
+        failed_records = []
+        if failed.any():
+            report = df[failed].copy()
+            report["error_reason"] = (
+                reasons[failed].stack().dropna().groupby(level=0).agg(" | ".join)
+            )
+            report["row_number"] = report.index + 2
+            failed_records = report.to_dict("records")
+        return {
+            "inserted": len(valid),
+            "failed_records": failed_records,
+            "phases": self.progress.phases,
+        }
+
+    # --- validation ---
+    def normalize(self, df):
+        branches = {
+            str(name).lower().strip(): pk
+            for pk, name in TblBranch.objects.values_list("id", "branch_name")
+        }
+        depts = {
+            str(name).lower().strip(): pk
+            for pk, name in TblDepartment.objects.values_list("id", "department_name")
+        }
+        desigs = {
+            str(name).lower().strip(): pk
+            for pk, name in TblDesignation.objects.values_list("id", "designation_name")
+        }
+        roles = {
+            str(name).lower().strip(): pk
+            for pk, name in Role.objects.values_list("id", "role_name")
+        }
+        # Resolved before the insert, so reporting_to only matches employees
+        # that already exist.
+        managers = {
+            str(name).lower().strip(): emp_id
+            for emp_id, name in TblEmpBasicProfile.objects.values_list("id", "name")
+        }
+
+        frame = pd.DataFrame(index=df.index)
+        frame["emp_name"] = sanitize_series(column(df, "name"))
+        frame["emp_code"] = sanitize_series(column(df, "employee_code"))
+        frame["mobile"] = sanitize_series(column(df, "mobile_number"), is_mobile=True)
+        frame["email"] = sanitize_series(column(df, "email"), lower=True)
+        frame["branch_label"] = column(df, "branch", "").astype(object).map(str).str.strip()
+        frame["branch_id"] = frame["branch_label"].str.lower().map(branches)
+        frame["dept_id"] = lookup_key(column(df, "department", "")).map(depts)
+        frame["desig_id"] = lookup_key(column(df, "designation", "")).map(desigs)
+        frame["role_id"] = lookup_key(column(df, "role", "")).map(roles)
+        frame["dob"] = parse_date_series(column(df, "dob"))
+        frame["gender"] = column(df, "gender", "Male").astype(object).map(str)
+        frame["reporting_to_id"] = lookup_key(column(df, "reporting_to", "")).map(managers)
+        for target, source in PASSTHROUGH_COLUMNS.items():
+            frame[target] = map_object(column(df, source), _none_if_nan)
+        frame["longitude"] = map_object(column(df, "longitude"), parse_decimal)
+        frame["latitude"] = map_object(column(df, "latitude"), parse_decimal)
+        frame["nominee_mobile"] = sanitize_series(column(df, "nominee_mobile"), is_mobile=True)
+        frame["nominee_email"] = sanitize_series(column(df, "nominee_email"), lower=True)
+        return frame
+
+    def static_reasons(self, frame):
+        reasons = pd.DataFrame(index=frame.index, columns=["code", "mobile", "email", "branch"], dtype=object)
+        reasons.loc[frame["emp_code"].isnull(), "code"] = "Emp Code Missing"
+        reasons.loc[frame["mobile"].isnull(), "mobile"] = "Mobile Missing"
+        missing_branch = frame["branch_id"].isnull()
+        reasons.loc[missing_branch, "branch"] = (
+            "Branch '" + frame.loc[missing_branch, "branch_label"] + "' not found"
+        )
+        return reasons
+
+    def add_db_reasons(self, frame, reasons, db_codes, db_mobiles, db_emails):
+        in_db = frame["emp_code"].notnull() & frame["emp_code"].isin(db_codes)
+        reasons.loc[in_db, "code"] = "Code '" + frame.loc[in_db, "emp_code"] + "' exists in DB"
+        in_db = frame["mobile"].notnull() & frame["mobile"].isin(db_mobiles)
+        reasons.loc[in_db, "mobile"] = "Mobile '" + frame.loc[in_db, "mobile"] + "' exists in DB"
+        in_db = frame["email"].notnull() & frame["email"].isin(db_emails)
+        reasons.loc[in_db, "email"] = "Email '" + frame.loc[in_db, "email"] + "' exists in DB"
+
+    def add_csv_duplicate_reasons(self, frame, reasons):
+        """
+        A row only clashes with earlier rows that were accepted, so this part
+        stays sequential, but it only walks rows sharing a code, mobile or
+        email with another row.
+        """
+        shared = pd.Series(False, index=frame.index)
+        for key in ["emp_code", "mobile", "email"]:
+            values = frame[key]
+            shared |= values.notnull() & values.duplicated(keep=False)
+        if not shared.any():
+            return
+
+        seen = {"emp_code": set(), "mobile": set(), "email": set()}
+        labels = {"emp_code": ("code", "Code"), "mobile": ("mobile", "Mobile"), "email": ("email", "Email")}
+        candidates = frame.loc[shared, ["emp_code", "mobile", "email"]]
+        for index, code, mobile, email in candidates.itertuples(name=None):
+            for key, value in (("emp_code", code), ("mobile", mobile), ("email", email)):
+                reason_col, label = labels[key]
+                if value is not None and pd.isna(reasons.at[index, reason_col]) and value in seen[key]:
+                    reasons.at[index, reason_col] = f"{label} '{value}' duplicate in CSV"
+            if reasons.loc[index].notnull().any():
+                continue
+            seen["emp_code"].add(code)
+            seen["mobile"].add(mobile)
+            if email:
+                seen["email"].add(email)
+
+    # --- uniqueness against the database ---
+    def existing_keys(self, frame):
+        stage = frame[["emp_code", "mobile", "email"]]
+        stage = stage[stage.notnull().any(axis=1)]
+        if copy_supported():
+            return self._existing_keys_staged(stage)
+        return self._existing_keys_chunked(stage)
+
+    def _existing_keys_staged(self, stage):
+        profile_table = TblEmpBasicProfile._meta.db_table
+        user_table = TblUser._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE {STAGE_TABLE} "
+                "(employee_code text, mobile_number text, email text) ON COMMIT DROP"
+            )
+            copy_into(
+                cursor,
+                STAGE_TABLE,
+                ["employee_code", "mobile_number", "email"],
+                stage.itertuples(index=False, name=None),
+            )
+            cursor.execute(f"ANALYZE {STAGE_TABLE}")
+            cursor.execute(
+                f"""
+                SELECT 'code', s.employee_code FROM {STAGE_TABLE} s
+                JOIN {profile_table} p ON p.employee_code = s.employee_code
+                UNION
+                SELECT 'mobile', s.mobile_number FROM {STAGE_TABLE} s
+                JOIN {profile_table} p ON split_part(p.mobile_number, '.', 1) = s.mobile_number
+                UNION
+                SELECT 'email', s.email FROM {STAGE_TABLE} s
+                JOIN {profile_table} p ON lower(p.email) = s.email
+                UNION
+                SELECT 'email', s.email FROM {STAGE_TABLE} s
+                JOIN {user_table} u ON lower(u.email) = s.email
+                """
+            )
+            found = {"code": set(), "mobile": set(), "email": set()}
+            for kind, value in cursor.fetchall():
+                found[kind].add(value)
+        return found["code"], found["mobile"], found["email"]
+
+    def _existing_keys_chunked(self, stage):
+        codes, mobiles, emails = set(), set(), set()
+        for start in range(0, len(stage), LOOKUP_CHUNK_SIZE):
+            chunk = stage.iloc[start : start + LOOKUP_CHUNK_SIZE]
+            chunk_codes = chunk["emp_code"].dropna().tolist()
+            chunk_mobiles = chunk["mobile"].dropna().tolist()
+            chunk_emails = chunk["email"].dropna().tolist()
+            codes.update(
+                TblEmpBasicProfile.objects.filter(employee_code__in=chunk_codes)
+                .values_list("employee_code", flat=True)
+            )
+            mobiles.update(
+                str(m).split(".")[0]
+                for m in TblEmpBasicProfile.objects.filter(
+                    mobile_number__in=chunk_mobiles + [f"{m}.0" for m in chunk_mobiles]
+                ).values_list("mobile_number", flat=True)
+            )
+            for model in (TblEmpBasicProfile, TblUser):
+                emails.update(
+                    model.objects.annotate(email_lower=Lower("email"))
+                    .filter(email_lower__in=chunk_emails)
+                    .values_list("email_lower", flat=True)
+                )
+        return codes, mobiles, emails
+
+    # --- inserts ---
+    def create_profiles(self, valid):
+        profiles = [
+            TblEmpBasicProfile(
+                employee_code=row.emp_code,
+                name=row.emp_name or "Unknown",
+                email=row.email,
+                mobile_number=row.mobile,
+                dob=_none_if_nan(row.dob) or "1900-01-01",
+                gender=row.gender,
+                created_by=self.creator_id,
+            )
+            for row in valid.itertuples()
+        ]
+        return TblEmpBasicProfile.objects.bulk_create(profiles, batch_size=PROFILE_BATCH_SIZE)
+
+    def hash_passwords(self, valid):
+        return hash_passwords(
+            bulk_import_password(row.emp_name or "Unknown", row.mobile)
+            for row in valid.itertuples()
+        )
+
+    def create_children(self, valid, profiles, hashed_passwords):
+        users, addresses, banks, nominees, officials = [], [], [], [], []
+        for row, p, hashed_pwd in zip(valid.itertuples(), profiles, hashed_passwords):
+            users.append(
+                TblUser(
+                    full_name=p.name,
+                    mobile_number=p.mobile_number,
+                    email=p.email or f"u_{p.employee_code}@company.com",
+                    password=hashed_pwd,
+                    employee_id=p.id,
+                    employee_code=p.employee_code,
+                    branch_id_id=_fk(row.branch_id),
+                    department_id_id=_fk(row.dept_id),
+                    designation_id_id=_fk(row.desig_id),
+                    role_id_id=_fk(row.role_id),
+                    is_active=True,
+                    created_by=self.creator_id,
+                )
+            )
+            addresses.append(
+                TblEmpAddressDetails(
+                    employee_id=p,
+                    address=row.address,
+                    city=row.city,
+                    state=row.state,
+                    pincode=row.pincode,
+                    created_by=self.creator_id,
+                    longitude=row.longitude,
+                    latitude=row.latitude,
+                )
+            )
+            banks.append(
+                TblEmpBankDetails(
+                    employee_id=p,
+                    bank_name=row.bank_name,
+                    branch_name=row.bank_branch_name,
+                    account_number=row.account_number,
+                    ifsc_code=row.ifsc_code,
+                    created_by=self.creator_id,
+                )
+            )
+            nominees.append(
+                TblEmpNomineeDetails(
+                    employee_id=p,
+                    nominee_name=row.nominee_name,
+                    nominee_relation=row.nominee_relation,
+                    nominee_mobile=row.nominee_mobile,
+                    nominee_email=row.nominee_email,
+                    created_by=self.creator_id,
+                )
+            )
+            officials.append(
+                TblEmpOfficialInformation(
+                    employee_id=p,
+                    employment_status=1,
+                    reporting_to_id=_fk(row.reporting_to_id),
+                    remarks=row.remarks,
+                    created_by=self.creator_id,
+                )
+            )
+
+        for model, objs in (
+            (TblUser, users),
+            (TblEmpAddressDetails, addresses),
+            (TblEmpBankDetails, banks),
+            (TblEmpNomineeDetails, nominees),
+            (TblEmpOfficialInformation, officials),
+        ):
+            if not copy_objects(model, objs):
+                model.objects.bulk_create(objs, batch_size=CHILD_BATCH_SIZE)
@@ -0,0 +1,588 @@
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework.validators import UniqueValidator
+
+from constants import (
+    MASTER_UPLOAD_BRANCH,
+    MASTER_UPLOAD_DEALER,
+    MASTER_UPLOAD_DEPARTMENT,
+    MASTER_UPLOAD_DESIGNATION,
+    MASTER_UPLOAD_SUBDEALER,
+    PRIORITY_MAPPING,
+    MasterUploadStatus,
+)
+from ems.models import (
+    Dealer,
+    MasterUploadFailedRow,
+    MasterUploadJob,
+    SubDealer,
+    TblBranch,
+    TblDepartment,
+    TblDesignation,
+)
+from ems.serializers.branch_serializers import TblBranchSerializer
+from ems.serializers.dealer_serializer import DealerSerializer
+from ems.serializers.department_serializers import TblDepartmentSerializer
+from ems.serializers.subdealer_serializer import SubDealerSerializer
+
+MASTER_IMPORT_CHUNK_SIZE = 500
+
+
+class MasterUploadInProgress(Exception):
+    def __init__(self, job):
+        self.job = job
+        super().__init__(
+            f"This file is already being processed (row {job.next_row} of {job.total_rows})."
+        )
+
+
+def get_stale_window():
+    return timedelta(seconds=getattr(settings, "MASTER_UPLOAD_STALE_SECONDS", 300))
+
+
+def clean_csv_row(row):
+    return {k.strip().lower(): (v.strip() if v else None) for k, v in row.items() if k}
+
+
+def serializer_errors_text(serializer, title=False):
+    return " | ".join(
+        f"{k.title() if title else k}: {v[0]}" for k, v in serializer.errors.items()
+    )
+
+
+def without_unique_validators(serializer, *field_names):
+    # These fields are already checked against the database once per chunk.
+    for name in field_names:
+        field = serializer.fields[name]
+        field.validators = [
+            v for v in field.validators if not isinstance(v, UniqueValidator)
+        ]
+    return serializer
+
+
+def first_id_by_lower_name(model, field, names, value_field="id"):
+    """{lower(name): value} for the lowest-id match, like filter(iexact).first()."""
+    names = {name.lower() for name in names if name}
+    if not names:
+        return {}
+    found = {}
+    rows = (
+        model.objects.annotate(lower_name=Lower(field))
+        .filter(lower_name__in=names)
+        .order_by("id")
+        .values_list("lower_name", value_field)
+    )
+    for lower_name, value in rows:
+        found.setdefault(lower_name, value)
+    return found
+
+
+class MasterCSVImport(ABC):
+    """
+    Chunked import shared by the ems master-data CSV uploads.
+
+    Every chunk does its duplicate and lookup checks with one set-based query
+    per key, validates its rows in Python and commits the new rows, the failed
+    rows and the job's progress in one transaction. If the worker dies, posting
+    the same file again picks the job up after the last committed chunk. The
+    earlier chunks are re-validated without writing, which refills the in-file
+    duplicate trackers only partly: their committed rows now fail the database
+    checks first. A later row that clashes with one of them therefore still
+    fails, but may report a database conflict instead of an in-file duplicate.
+
+    Subclasses implement prefetch(), validate() and failed_row().
+    """
+
+    upload_type = None
+    model = None
+    chunk_size = MASTER_IMPORT_CHUNK_SIZE
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.claimed = {}
+
+    # --- hooks ---
+    def prefetch(self, cleaned_rows):
+        return {}
+
+    @abstractmethod
+    def validate(self, raw, clean, ctx):
+        """Return an unsaved model instance, or raise with the failure reason."""
+
+    @abstractmethod
+    def failed_row(self, raw, row_number, reason):
+        """The row as written to the failed-rows report."""
+
+    def finalize(self, raw_rows):
+        pass
+
+    def claim(self, field, value, message):
+        """
+        Reserve a unique value for a row that passed validation. Rows used to
+        be saved one at a time, so the serializer's database check caught a
+        clash with an earlier row of the same file; within a chunk nothing is
+        saved yet, so the clash is caught here instead.
+        """
+        claimed = self.claimed.setdefault(field, set())
+        if value in claimed:
+            raise ValueError(message)
+        claimed.add(value)
+
+    # --- job handling ---
+    def start_job(self, file_name, file_bytes, total_rows):
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                MasterUploadJob.objects.select_for_update()
+                .filter(
+                    upload_type=self.upload_type,
+                    file_hash=file_hash,
+                    created_by=self.user_id,
+                    status__in=[MasterUploadStatus.RUNNING, MasterUploadStatus.FAILED],
+                )
+                .order_by("-id")
+                .first()
+            )
+            if job:
+                if (
+                    job.status == MasterUploadStatus.RUNNING
+                    and job.heartbeat_at > now - get_stale_window()
+                ):
+                    raise MasterUploadInProgress(job)
+                job.status = MasterUploadStatus.RUNNING
+                job.heartbeat_at = now
+                job.error = None
+                job.save(update_fields=["status", "heartbeat_at", "error"])
+                return job
+            return MasterUploadJob.objects.create(
+                upload_type=self.upload_type,
+                file_name=file_name,
+                file_hash=file_hash,
+                total_rows=total_rows,
+                created_by=self.user_id,
+            )
+
+    def run(self, raw_rows, file_name, file_bytes):
+        job = self.start_job(file_name, file_bytes, len(raw_rows))
+        try:
+            for start in range(0, len(raw_rows), self.chunk_size):
+                chunk = raw_rows[start : start + self.chunk_size]
+                outcomes = self.validate_chunk(chunk, start)
+                if start + len(chunk) <= job.next_row:
+                    continue
+                self.commit_chunk(job, start + len(chunk), outcomes)
+            self.finalize(raw_rows)
+        except Exception as e:
+            MasterUploadJob.objects.filter(pk=job.pk).update(
+                status=MasterUploadStatus.FAILED, error=str(e)
+            )
+            raise
+
+        MasterUploadJob.objects.filter(pk=job.pk).update(
+            status=MasterUploadStatus.COMPLETED, finished_at=timezone.now()
+        )
+        job.refresh_from_db()
+        failed_rows = [
+            self.failed_row(raw_rows[row_number - 2], row_number, reason)
+            for row_number, reason in job.failed_rows.order_by(
+                "row_number", "id"
+            ).values_list("row_number", "reason")
+        ]
+        return {
+            "job_id": job.id,
+            "success_count": job.success_count,
+            "failed_rows": failed_rows,
+        }
+
+    def validate_chunk(self, chunk, start):
+        cleaned = [clean_csv_row(raw) for raw in chunk]
+        ctx = self.prefetch(cleaned)
+        outcomes = []
+        for offset, (raw, clean) in enumerate(zip(chunk, cleaned)):
+            row_number = start + offset + 2
+            try:
+                outcomes.append((row_number, self.validate(raw, clean, ctx), None))
+            except Exception as e:
+                outcomes.append((row_number, None, str(e)))
+        return outcomes
+
+    def commit_chunk(self, job, end, outcomes):
+        to_save = [(n, obj) for n, obj, reason in outcomes if obj is not None]
+        failures = [(n, reason) for n, obj, reason in outcomes if reason is not None]
+        with transaction.atomic():
+            saved, save_failures = self.save_objects(to_save)
+            failures.extend(save_failures)
+            MasterUploadFailedRow.objects.bulk_create(
+                [
+                    MasterUploadFailedRow(job_id=job.pk, row_number=n, reason=reason)
+                    for n, reason in failures
+                ]
+            )
+            MasterUploadJob.objects.filter(pk=job.pk).update(
+                next_row=end,
+                success_count=F("success_count") + saved,
+                failed_count=F("failed_count") + len(failures),
+                heartbeat_at=timezone.now(),
+            )
+        job.next_row = end
+
+    def save_objects(self, to_save):
+        if not to_save:
+            return 0, []
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create([obj for _, obj in to_save])
+            return len(to_save), []
+        except Exception:
+            pass
+
+        # Something in the chunk hit a constraint; save row by row so only
+        # the offending rows fail, as the per-row upload did.
+        saved = 0
+        failures = []
+        for row_number, obj in to_save:
+            obj.pk = None
+            try:
+                with transaction.atomic():
+                    obj.save(force_insert=True)
+                saved += 1
+            except Exception as e:
+                failures.append((row_number, str(e)))
+        return saved, failures
+
+
+def _report_row(raw, extra):
+    row = dict(raw)
+    row.update(extra)
+    return row
+
+
+class BranchCSVImport(MasterCSVImport):
+    upload_type = MASTER_UPLOAD_BRANCH
+    model = TblBranch
+
+    def __init__(self, user_id):
+        super().__init__(user_id)
+        self.seen_codes = set()
+
+    def prefetch(self, cleaned_rows):
+        codes = {row.get("branch_code") for row in cleaned_rows if row.get("branch_code")}
+        return {
+            "existing_codes": set(
+                TblBranch.objects.filter(branch_code__in=codes).values_list(
+                    "branch_code", flat=True
+                )
+            )
+        }
+
+    def validate(self, raw, clean, ctx):
+        branch_code = clean.get("branch_code")
+        if not branch_code:
+            raise ValueError("branch_code is required but found empty.")
+        if branch_code in self.seen_codes:
+            raise ValueError(
+                f"Duplicate branch_code '{branch_code}' found inside this CSV file."
+            )
+        self.seen_codes.add(branch_code)
+        if branch_code in ctx["existing_codes"]:
+            raise ValueError(
+                f"Branch with code '{branch_code}' already exists in database."
+            )
+
+        email = clean.get("email")
+        if email and email.lower() not in ["null", "nan", "none"]:
+            try:
+                validate_email(email)
+            except ValidationError:
+                raise ValueError(f"Invalid email format: {email}")
+
+        serializer = without_unique_validators(
+            TblBranchSerializer(data=clean), "branch_code"
+        )
+        if not serializer.is_valid():
+            raise ValueError(serializer_errors_text(serializer))
+        branch_id = serializer.validated_data.get("branch_id")
+        if branch_id:
+            self.claim(
+                "branch_id",
+                branch_id,
+                "branch_id: tbl branch with this branch id already exists.",
+            )
+        return TblBranch(**serializer.validated_data, created_by=self.user_id)
+
+    def failed_row(self, raw, row_number, reason):
+        return _report_row(raw, {"upload_status_reason": reason})
+
+
+class DepartmentCSVImport(MasterCSVImport):
+    upload_type = MASTER_UPLOAD_DEPARTMENT
+    model = TblDepartment
+
+    def __init__(self, user_id):
+        super().__init__(user_id)
+        self.seen_names = set()
+
+    def prefetch(self, cleaned_rows):
+        names = [row.get("department_name") for row in cleaned_rows]
+        return {
+            "existing_names": set(
+                first_id_by_lower_name(TblDepartment, "department_name", names)
+            )
+        }
+
+    def validate(self, raw, clean, ctx):
+        dept_name = clean.get("department_name")
+        if not dept_name:
+            raise ValueError("department_name is missing or empty.")
+        if dept_name.lower() in self.seen_names:
+            raise ValueError(f"Duplicate department '{dept_name}' found inside this CSV.")
+        self.seen_names.add(dept_name.lower())
+        if dept_name.lower() in ctx["existing_names"]:
+            raise ValueError(f"Department '{dept_name}' already exists in the system.")
+
+        serializer = TblDepartmentSerializer(data=clean)
+        if not serializer.is_valid():
+            raise ValueError(serializer_errors_text(serializer))
+        email = serializer.validated_data.get("department_email")
+        if email:
+            self.claim(
+                "department_email",
+                email.lower(),
+                "department_email: This email is already used by another department.",
+            )
+        return TblDepartment(**serializer.validated_data, created_by=self.user_id)
+
+    def failed_row(self, raw, row_number, reason):
+        return _report_row(raw, {"upload_status_reason": reason, "Row Number": row_number})
+
+
+class DesignationCSVImport(MasterCSVImport):
+    upload_type = MASTER_UPLOAD_DESIGNATION
+    model = TblDesignation
+
+    def __init__(self, user_id):
+        super().__init__(user_id)
+        self.seen_names = set()
+        self.seen_codes = set()
+
+    def prefetch(self, cleaned_rows):
+        names = [row.get("designation_name") for row in cleaned_rows]
+        codes = {
+            row["designation_code"].lower()
+            for row in cleaned_rows
+            if row.get("designation_code")
+        }
+        existing_codes = set()
+        if codes:
+            existing_codes = set(
+                TblDesignation.objects.annotate(lower_code=Lower("designation_code"))
+                .filter(lower_code__in=codes)
+                .values_list("lower_code", flat=True)
+            )
+        return {
+            "existing_names": set(
+                first_id_by_lower_name(TblDesignation, "designation_name", names)
+            ),
+            "existing_codes": existing_codes,
+            "departments": first_id_by_lower_name(
+                TblDepartment,
+                "department_name",
+                [row.get("department_name") for row in cleaned_rows],
+            ),
+        }
+
+    def validate(self, raw, clean, ctx):
+        d_name = clean.get("designation_name")
+        d_code = clean.get("designation_code")
+        dept_name = clean.get("department_name")
+
+        if not d_name or not dept_name:
+            raise ValueError("Designation name and Department name are required.")
+
+        if d_name.lower() in self.seen_names:
+            raise ValueError(
+                f"Duplicate Name: '{d_name}' exists multiple times in this CSV."
+            )
+        if d_name.lower() in ctx["existing_names"]:
+            raise ValueError(f"Name Conflict: '{d_name}' already exists in database.")
+        self.seen_names.add(d_name.lower())
+
+        if d_code:
+            if d_code.lower() in self.seen_codes:
+                raise ValueError(
+                    f"Duplicate Code: '{d_code}' exists multiple times in this CSV."
+                )
+            if d_code.lower() in ctx["existing_codes"]:
+                raise ValueError(
+                    f"Code Conflict: Code '{d_code}' is already assigned in database."
+                )
+            self.seen_codes.add(d_code.lower())
+
+        department_id = ctx["departments"].get(dept_name.lower())
+        if not department_id:
+            raise ValueError(f"Department '{dept_name}' not found in system.")
+
+        p_str = (clean.get("designation_priority") or "Medium").capitalize()
+        return TblDesignation(
+            designation_name=d_name,
+            designation_code=d_code,
+            department_id=department_id,
+            designation_priority=PRIORITY_MAPPING.get(p_str, 1),
+            parent_designation_id=0,
+            created_by=self.user_id,
+        )
+
+    def finalize(self, raw_rows):
+        """Link parents once every chunk is in, with one UPDATE per parent."""
+        links = {}
+        for raw in raw_rows:
+            clean = clean_csv_row(raw)
+            d_name = clean.get("designation_name")
+            parent_name = clean.get("parent_designation_name")
+            if d_name and parent_name and parent_name not in ["0", "None", "null", ""]:
+                links[d_name.lower()] = parent_name.lower()
+        if not links:
+            return
+
+        parents = first_id_by_lower_name(
+            TblDesignation, "designation_name", set(links.values())
+        )
+        children_by_parent = {}
+        for child, parent in links.items():
+            if parent in parents:
+                children_by_parent.setdefault(parents[parent], []).append(child)
+        for parent_id, children in children_by_parent.items():
+            TblDesignation.objects.annotate(
+                lower_name=Lower("designation_name")
+            ).filter(lower_name__in=children).update(parent_designation_id=parent_id)
+
+    def failed_row(self, raw, row_number, reason):
+        return _report_row(raw, {"Row Number": row_number, "upload_status_reason": reason})
+
+
+class DealerCSVImport(MasterCSVImport):
+    upload_type = MASTER_UPLOAD_DEALER
+    model = Dealer
+
+    def __init__(self, user_id):
+        super().__init__(user_id)
+        self.seen_codes = set()
+
+    def prefetch(self, cleaned_rows):
+        codes = {row.get("code") for row in cleaned_rows if row.get("code")}
+        return {
+            "existing_codes": set(
+                Dealer.objects.filter(code__in=codes).values_list("code", flat=True)
+            ),
+            "branches": first_id_by_lower_name(
+                TblBranch,
+                "branch_name",
+                [row.get("branch") for row in cleaned_rows],
+                value_field="branch_id",
+            ),
+        }
+
+    def validate(self, raw, clean, ctx):
+        row_code = clean.get("code")
+        branch_name = clean.get("branch")
+        if not row_code or not branch_name:
+            raise ValueError("Code and Branch name are mandatory fields.")
+        if row_code in self.seen_codes:
+            raise ValueError(f"Duplicate Code '{row_code}' found within this CSV file.")
+        self.seen_codes.add(row_code)
+        if row_code in ctx["existing_codes"]:
+            raise ValueError(f"Dealer with code '{row_code}' already exists in the system.")
+        if branch_name.lower() not in ctx["branches"]:
+            raise ValueError(f"Branch '{branch_name}' does not exist in the database.")
+
+        serializer_data = dict(raw)
+        serializer_data["branch_id"] = ctx["branches"][branch_name.lower()]
+        serializer = without_unique_validators(DealerSerializer(data=serializer_data), "code")
+        if not serializer.is_valid():
+            raise ValueError(serializer_errors_text(serializer, title=True))
+        return Dealer(**serializer.validated_data, created_by=self.user_id)
+
+    def failed_row(self, raw, row_number, reason):
+        return _report_row(raw, {"Failure Reason": reason, "Row Number": row_number})
+
+
+class SubDealerCSVImport(MasterCSVImport):
+    upload_type = MASTER_UPLOAD_SUBDEALER
+    model = SubDealer
+
+    def __init__(self, user_id):
+        super().__init__(user_id)
+        self.seen_codes = set()
+
+    def prefetch(self, cleaned_rows):
+        codes = {row.get("code") for row in cleaned_rows if row.get("code")}
+        return {
+            "existing_codes": set(
+                SubDealer.objects.filter(code__in=codes).values_list("code", flat=True)
+            ),
+            "dealers": first_id_by_lower_name(
+                Dealer, "name", [row.get("dealer_name") for row in cleaned_rows]
+            ),
+            "branches": first_id_by_lower_name(
+                TblBranch,
+                "branch_name",
+                [row.get("branch_name") for row in cleaned_rows],
+                value_field="branch_id",
+            ),
+        }
+
+    def validate(self, raw, clean, ctx):
+        subdealer_code = clean.get("code")
+        if not subdealer_code:
+            raise ValueError("Sub-dealer code is missing.")
+        if subdealer_code in self.seen_codes:
+            raise ValueError(
+                f"Duplicate code '{subdealer_code}' found within this CSV file."
+            )
+        self.seen_codes.add(subdealer_code)
+        if subdealer_code in ctx["existing_codes"]:
+            raise ValueError(
+                f"Sub-dealer with code '{subdealer_code}' is already registered."
+            )
+
+        email = clean.get("email")
+        if email:
+            try:
+                validate_email(email)
+            except ValidationError:
+                raise ValueError(f"Invalid email format: {email}")
+
+        mobile = clean.get("mobile_number")
+        if mobile and not re.match(r"^\d{10}$", mobile):
+            raise ValueError(f"Invalid mobile number: {mobile}. Must be 10 digits.")
+
+        d_name = clean.get("dealer_name")
+        dealer_id = ctx["dealers"].get(d_name.lower()) if d_name else None
+        if not dealer_id:
+            raise ValueError(f"Dealer '{d_name}' does not exist in the database.")
+
+        b_name = clean.get("branch_name")
+        if not b_name or b_name.lower() not in ctx["branches"]:
+            raise ValueError(f"Branch '{b_name}' does not exist.")
+
+        data_to_save = {k: v.strip() if v else v for k, v in raw.items()}
+        data_to_save["dealer_id"] = dealer_id
+        data_to_save["branch_id"] = str(ctx["branches"][b_name.lower()])
+        serializer = without_unique_validators(SubDealerSerializer(data=data_to_save), "code")
+        if not serializer.is_valid():
+            raise ValueError(serializer_errors_text(serializer))
+        return SubDealer(**serializer.validated_data, created_by=self.user_id)
+
+    def failed_row(self, raw, row_number, reason):
+        return _report_row(raw, {"Row Number": row_number, "Failure Reason": reason})
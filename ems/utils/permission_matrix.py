@@ -0,0 +1,202 @@
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from auth_system.utils.session_cache import LocalLRUBackend
+from ems.models.role_permission import RolePermission
+
+# Bit i of a menu's mask is PERMISSION_ACTIONS[i].
+PERMISSION_ACTIONS = ("view", "add", "edit", "delete", "print", "export", "sms_send")
+PERMISSION_BITS = {action: 1 << i for i, action in enumerate(PERMISSION_ACTIONS)}
+
+DEFAULT_PERMISSION_MATRIX_SETTINGS = {
+    "TTL": 300,
+    "LOCAL_TTL": 60,
+    "MAX_ENTRIES": 1000,
+    # Name of a Django cache alias shared by all workers. Without one, a
+    # change made in another process shows up here after TTL at the latest.
+    "SHARED_BACKEND": None,
+}
+
+REQUEST_MEMO_ATTR = "_permission_matrix"
+
+
+def get_permission_matrix_settings():
+    conf = dict(DEFAULT_PERMISSION_MATRIX_SETTINGS)
+    conf.update(getattr(settings, "PERMISSION_MATRIX_CACHE", {}) or {})
+    return conf
+
+
+# by_portal: {(portal_id, menu_id): mask}; by_menu: {menu_id: mask over all portals}
+RoleMatrix = namedtuple("RoleMatrix", ["by_portal", "by_menu"])
+EMPTY_MATRIX = RoleMatrix({}, {})
+
+
+def compile_role_matrix(role_id):
+    rows = RolePermission.objects.filter(
+        role_id=role_id,
+        deleted_at__isnull=True,
+        role__deleted_at__isnull=True,
+    ).values_list("portal_id", "menu_id", *PERMISSION_ACTIONS)
+    by_portal = {}
+    by_menu = {}
+    for portal_id, menu_id, *flags in rows:
+        mask = 0
+        for flag, bit in zip(flags, PERMISSION_BITS.values()):
+            if flag:
+                mask |= bit
+        if mask:
+            by_portal[(portal_id, menu_id)] = mask
+            by_menu[menu_id] = by_menu.get(menu_id, 0) | mask
+    return RoleMatrix(by_portal, by_menu)
+
+
+class PermissionMatrixCache:
+    """
+    Role id -> (version, compiled matrix).
+
+    Every change to a role's permissions bumps the role's version. With a
+    shared backend the version lives there, so all workers notice a change
+    on their next lookup and compiled matrices are shared per version;
+    the local copy is re-checked against the shared version every
+    LOCAL_TTL seconds. Without one, the local copy is simply dropped in
+    the process that made the change.
+    """
+
+    version_prefix = "ems:perm_version:"
+    matrix_prefix = "ems:perm_matrix:"
+
+    def __init__(self, conf=None):
+        conf = conf or get_permission_matrix_settings()
+        self.ttl = conf["TTL"]
+        self.shared = caches[conf["SHARED_BACKEND"]] if conf["SHARED_BACKEND"] else None
+        local_ttl = min(conf["LOCAL_TTL"], conf["TTL"]) if self.shared else conf["TTL"]
+        self.local = LocalLRUBackend(conf["MAX_ENTRIES"], local_ttl)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _local_version(self, role_id):
+        with self._lock:
+            return self._versions.get(role_id, 1)
+
+    def _shared_version(self, role_id):
+        key = f"{self.version_prefix}{role_id}"
+        version = self.shared.get(key)
+        if version is None:
+            # add() so two workers starting together agree on one value.
+            self.shared.add(key, 1, None)
+            version = self.shared.get(key) or 1
+        return version
+
+    def get(self, role_id):
+        entry = self.local.get(role_id)
+        if entry is not None:
+            return entry
+
+        if self.shared is None:
+            version = self._local_version(role_id)
+            entry = (version, compile_role_matrix(role_id))
+            # Skip caching a matrix that was invalidated while compiling.
+            if self._local_version(role_id) == version:
+                self.local.set(role_id, entry)
+            return entry
+
+        version = self._shared_version(role_id)
+        matrix_key = f"{self.matrix_prefix}{role_id}:{version}"
+        matrix = self.shared.get(matrix_key)
+        if matrix is None:
+            matrix = compile_role_matrix(role_id)
+            self.shared.set(matrix_key, matrix, self.ttl)
+        entry = (version, matrix)
+        self.local.set(role_id, entry)
+        return entry
+
+    def invalidate(self, role_id):
+        with self._lock:
+            self._versions[role_id] = self._versions.get(role_id, 1) + 1
+        self.local.delete(role_id)
+        if self.shared is not None:
+            key = f"{self.version_prefix}{role_id}"
+            try:
+                self.shared.incr(key)
+            except ValueError:
+                self.shared.set(key, 2, None)
+
+
+_matrix_cache = None
+_matrix_cache_lock = threading.Lock()
+
+
+def get_matrix_cache():
+    global _matrix_cache
+    if _matrix_cache is None:
+        with _matrix_cache_lock:
+            if _matrix_cache is None:
+                _matrix_cache = PermissionMatrixCache()
+    return _matrix_cache
+
+
+def get_role_matrix(role_id):
+    """(version, RoleMatrix); empty for no role."""
+    if not role_id:
+        return 0, EMPTY_MATRIX
+    return get_matrix_cache().get(role_id)
+
+
+def invalidate_role_permissions(*role_ids):
+    """Drop the compiled matrices once the current transaction commits."""
+    role_ids = [role_id for role_id in dict.fromkeys(role_ids) if role_id]
+
+    def invalidate():
+        cache = get_matrix_cache()
+        for role_id in role_ids:
+            cache.invalidate(role_id)
+
+    if role_ids:
+        transaction.on_commit(invalidate)
+
+
+def get_user_matrix(user, request=None):
+    """The user's role matrix, looked up at most once per request."""
+    memo_target = getattr(request, "_request", request)
+    if memo_target is not None:
+        memo = getattr(memo_target, REQUEST_MEMO_ATTR, None)
+        if memo is not None:
+            return memo
+    result = get_role_matrix(getattr(user, "role_id_id", None))
+    if memo_target is not None:
+        setattr(memo_target, REQUEST_MEMO_ATTR, result)
+    return result
+
+
+def has_menu_permission(user, menu_id, action="view", portal_id=None, request=None):
+    """
+    True when the user's role grants ``action`` (one of PERMISSION_ACTIONS)
+    on ``menu_id``; on any portal unless ``portal_id`` is given. Superusers
+    always pass.
+    """
+    if not user or not user.is_authenticated:
+        return False
+    if user.is_superuser:
+        return True
+    bit = PERMISSION_BITS[action]
+    _, matrix = get_user_matrix(user, request)
+    if portal_id is not None:
+        return bool(matrix.by_portal.get((portal_id, menu_id), 0) & bit)
+    return bool(matrix.by_menu.get(menu_id, 0) & bit)
+
+
+def matrix_payload(role_id, version, matrix):
+    return {
+        "role_id": role_id,
+        "version": version,
+        "actions": list(PERMISSION_ACTIONS),
+        # [portal_id, menu_id, mask]; bit i of mask is actions[i]
+        "menus": sorted(
+            [portal_id, menu_id, mask]
+            for (portal_id, menu_id), mask in matrix.by_portal.items()
+        ),
+    }
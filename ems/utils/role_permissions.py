@@ -0,0 +1,93 @@
+from django.db import transaction
+from django.utils import timezone
+
+from ems.models.role_permission import RolePermission
+from ems.utils.permission_matrix import PERMISSION_ACTIONS, invalidate_role_permissions
+
+# Columns an upsert may change on an existing row.
+PERMISSION_FIELDS = PERMISSION_ACTIONS + ("api_limit",)
+UPSERT_UPDATE_FIELDS = list(PERMISSION_FIELDS) + [
+    "updated_by",
+    "updated_at",
+    "deleted_at",
+    "deleted_by",
+]
+
+
+def permission_values(perm):
+    """The permission columns of ``perm``, model defaults for the missing ones."""
+    return {
+        field: perm[field] if field in perm else RolePermission._meta.get_field(field).get_default()
+        for field in PERMISSION_FIELDS
+    }
+
+
+def _unchanged(existing, values):
+    return existing.deleted_at is None and all(
+        getattr(existing, field) == value for field, value in values.items()
+    )
+
+
+def upsert_role_permissions(role, permissions, user_id, portal_id=None):
+    """
+    Write ``permissions`` ([{"menu_id": .., "view": .., ...}, ...]) for
+    ``role`` on ``portal_id`` (the role's portal by default) in one
+    transaction.
+
+    Rows that already match are left alone. New and changed rows,
+    including soft-deleted ones being restored, go out as a single
+    INSERT ... ON CONFLICT (unique_role_portal_menu) DO UPDATE. A listed
+    menu is replaced as a whole: flags it leaves out reset to their
+    defaults. Menus not listed keep their current permissions.
+
+    Returns {"created": n, "updated": n, "unchanged": n}.
+    """
+    portal_id = portal_id or role.portal_id
+    by_menu = {}
+    for perm in permissions:
+        if perm.get("menu_id"):
+            by_menu[perm["menu_id"]] = perm
+
+    summary = {"created": 0, "updated": 0, "unchanged": 0}
+    if not by_menu:
+        return summary
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {
+            row.menu_id: row
+            for row in RolePermission.objects.filter(
+                role=role, portal_id=portal_id, menu_id__in=list(by_menu)
+            )
+        }
+        rows = []
+        for menu_id, perm in by_menu.items():
+            current = existing.get(menu_id)
+            values = permission_values(perm)
+            if current is not None and _unchanged(current, values):
+                summary["unchanged"] += 1
+                continue
+            summary["updated" if current is not None else "created"] += 1
+            rows.append(
+                RolePermission(
+                    role=role,
+                    portal_id=portal_id,
+                    menu_id=menu_id,
+                    created_by=user_id,
+                    updated_by=user_id,
+                    updated_at=now,
+                    deleted_at=None,
+                    deleted_by=0,
+                    **values,
+                )
+            )
+
+        if rows:
+            RolePermission.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["role", "portal", "menu_id"],
+                update_fields=UPSERT_UPDATE_FIELDS,
+            )
+            invalidate_role_permissions(role.id)
+    return summary
@@ -8,8 +8,12 @@ from auth_system.permissions.token_valid import IsTokenValid
 from ems.models import TblBranch
 from ems.serializers import TblBranchSerializer
 from auth_system.utils.pagination import CustomPagination
+from auth_system.utils.search import apply_search, wants_ranking
 from django.db import IntegrityError
-from django.db.models import Q
+
+# Columns behind ?search= (indexed by migration 0005_search_indexes).
+BRANCH_SEARCH_FIELDS = ("branch_name", "email")
+BRANCH_SEARCH_PREFIX_FIELDS = ("branch_code", "branch_id", "mobile_number")
 
 
 class TblBranchListCreateView(APIView):
@@ -18,18 +22,15 @@ class TblBranchListCreateView(APIView):
     def get(self, request):
         search_query = request.GET.get("search", "")
 
-        branches = TblBranch.objects.filter(deleted_at__isnull=True)
-
-        if search_query:
-            branches = branches.filter(
-                Q(branch_name__icontains=search_query)
-                | Q(branch_code__icontains=search_query)
-                | Q(branch_id__icontains=search_query)
-                | Q(email__icontains=search_query)
-                | Q(mobile_number__icontains=search_query)
-            )
+        branches = TblBranch.objects.filter(deleted_at__isnull=True).order_by("id")
+        branches = apply_search(
+            branches,
+            search_query,
+            BRANCH_SEARCH_FIELDS,
+            BRANCH_SEARCH_PREFIX_FIELDS,
+            rank=wants_ranking(request),
+        )
 
-        branches = branches.order_by("id")
         paginator = CustomPagination()
         page = paginator.paginate_queryset(branches, request)
         serializer = TblBranchSerializer(page, many=True)
@@ -4,7 +4,6 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound
 from django.utils import timezone
-from django.db.models import Q
 from auth_system.permissions.authentication import SkipPortalCheckJWTAuthentication
 from ems.models.emp_basic_profile import TblEmpBasicProfile
 from ems.serializers.emp_basic_profile_serializers import (
@@ -13,6 +12,11 @@ from ems.serializers.emp_basic_profile_serializers import (
 )
 from auth_system.permissions.token_valid import IsTokenValid
 from auth_system.utils.pagination import CustomPagination
+from auth_system.utils.search import apply_search, wants_ranking
+
+# Columns behind ?search= (indexed by migration 0005_search_indexes).
+EMPLOYEE_SEARCH_FIELDS = ("name", "email", "gender")
+EMPLOYEE_SEARCH_PREFIX_FIELDS = ("employee_code", "mobile_number")
 
 
 class EmpBasicProfileListCreateView(APIView):
@@ -21,18 +25,15 @@ class EmpBasicProfileListCreateView(APIView):
     def get(self, request):
         search_query = request.GET.get("search", "").strip()
 
-        queryset = TblEmpBasicProfile.objects.filter(deleted_at__isnull=True)
-
-        if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query)
-                | Q(employee_code__icontains=search_query)
-                | Q(email__icontains=search_query)
-                | Q(mobile_number__icontains=search_query)
-                | Q(gender__icontains=search_query)
-            )
+        queryset = TblEmpBasicProfile.objects.filter(deleted_at__isnull=True).order_by("id")
+        queryset = apply_search(
+            queryset,
+            search_query,
+            EMPLOYEE_SEARCH_FIELDS,
+            EMPLOYEE_SEARCH_PREFIX_FIELDS,
+            rank=wants_ranking(request),
+        )
 
-        queryset = queryset.order_by("id")
         paginator = CustomPagination()
         page = paginator.paginate_queryset(queryset, request)
 
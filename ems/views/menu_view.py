@@ -10,7 +10,11 @@ from ems.models import Menu
 from ems.serializers import MenuSerializer
 from auth_system.utils.pagination import CustomPagination
 from auth_system.permissions.token_valid import IsTokenValid
-from django.db.models import Q
+from auth_system.utils.search import apply_search, wants_ranking
+
+# Columns behind ?search= (indexed by migration 0005_search_indexes).
+MENU_SEARCH_FIELDS = ("menu_name",)
+MENU_SEARCH_PREFIX_FIELDS = ("menu_code",)
 
 
 class MenuListCreateView(APIView):
@@ -18,16 +22,15 @@ class MenuListCreateView(APIView):
 
     def get(self, request):
         search_query = request.GET.get("search", "") 
-        menus = Menu.objects.filter(deleted_at__isnull=True)
-
-        if search_query:
-            menus = menus.filter(
-                Q(menu_name__icontains=search_query)
-                | Q(menu_code__icontains=search_query)
-               
-            )
+        menus = Menu.objects.filter(deleted_at__isnull=True).order_by("id")
+        menus = apply_search(
+            menus,
+            search_query,
+            MENU_SEARCH_FIELDS,
+            MENU_SEARCH_PREFIX_FIELDS,
+            rank=wants_ranking(request),
+        )
 
-        menus = menus.order_by("id")
         paginator = CustomPagination()
         page = paginator.paginate_queryset(menus, request)
         serializer = MenuSerializer(page, many=True)
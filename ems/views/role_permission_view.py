@@ -5,10 +5,33 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound
 from django.utils import timezone
 
-from ems.models import RolePermission
+from ems.models import Menu, RolePermission
 from ems.serializers.role_serializer import RolePermissionSerializer
 from auth_system.permissions.token_valid import IsTokenValid
 from auth_system.utils.pagination import CustomPagination
+from ems.utils.permission_matrix import (
+    get_role_matrix,
+    get_user_matrix,
+    has_menu_permission,
+    invalidate_role_permissions,
+    matrix_payload,
+)
+
+# Menus (seed_menus codes) whose view permission allows reading another
+# role's permission matrix: Role and RolePermission.
+ROLE_MENU_CODES = ("RO0001", "RP0001")
+
+
+def can_view_role_permissions(request):
+    if request.user.is_superuser:
+        return True
+    menu_ids = Menu.objects.filter(
+        menu_code__in=ROLE_MENU_CODES, deleted_at__isnull=True
+    ).values_list("id", flat=True)
+    return any(
+        has_menu_permission(request.user, menu_id, "view", request=request)
+        for menu_id in menu_ids
+    )
 
 
 class RolePermissionListCreateView(APIView):
@@ -33,7 +56,8 @@ class RolePermissionListCreateView(APIView):
     def post(self, request):
         serializer = RolePermissionSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(created_by=request.user.id)
+            permission = serializer.save(created_by=request.user.id)
+            invalidate_role_permissions(permission.role_id)
             return Response(
                 {
                     "success": True,
@@ -79,7 +103,9 @@ class RolePermissionDetailView(APIView):
             permission, data=request.data, partial=True
         )
         if serializer.is_valid():
+            old_role_id = permission.role_id
             serializer.save(updated_by=request.user.id, updated_at=timezone.now())
+            invalidate_role_permissions(old_role_id, permission.role_id)
             return Response(
                 {
                     "success": True,
@@ -102,7 +128,50 @@ class RolePermissionDetailView(APIView):
         permission.deleted_at = timezone.now()
         permission.deleted_by = request.user.id
         permission.save()
+        invalidate_role_permissions(permission.role_id)
         return Response(
             {"success": True, "message": "Role permission deleted successfully."},
             status=status.HTTP_200_OK,
         )
+
+
+class PermissionMatrixView(APIView):
+    """
+    The compiled menu permissions of the caller's role, one bitmask per
+    portal/menu. ?role_id= for another role needs a superuser or view
+    permission on the Role / RolePermission menu. Served from the permission
+    matrix cache; the version changes whenever the role's permissions do.
+    """
+
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def get(self, request):
+        role_id = request.query_params.get("role_id")
+        if role_id:
+            if not role_id.isdigit():
+                return Response(
+                    {"success": False, "message": "role_id must be an integer."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            role_id = int(role_id)
+            if role_id != request.user.role_id_id and not can_view_role_permissions(request):
+                return Response(
+                    {
+                        "success": False,
+                        "message": "You do not have permission to view this role's permissions.",
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            version, matrix = get_role_matrix(role_id)
+        else:
+            role_id = request.user.role_id_id
+            version, matrix = get_user_matrix(request.user, request)
+
+        return Response(
+            {
+                "success": True,
+                "message": "Permission matrix retrieved successfully.",
+                "data": matrix_payload(role_id, version, matrix),
+            },
+            status=status.HTTP_200_OK,
+        )
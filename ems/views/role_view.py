@@ -8,6 +8,7 @@ from django.db import IntegrityError
 
 from ems.models.role import Role
 from ems.serializers.role_serializer import RoleSerializer
+from ems.utils.permission_matrix import invalidate_role_permissions
 from auth_system.permissions.token_valid import IsTokenValid
 from auth_system.utils.pagination import CustomPagination
 from django.db.models import Q
@@ -124,6 +125,7 @@ class RoleDetailView(APIView):
         role.deleted_at = timezone.now()
         role.deleted_by = request.user.id
         role.save()
+        invalidate_role_permissions(role.id)
 
         return Response(
             {
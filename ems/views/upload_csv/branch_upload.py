@@ -1,19 +1,14 @@
 import csv
 import io
 import os
-import re
 from datetime import datetime
 from django.conf import settings
-from django.db import transaction
-from django.core.validators import validate_email
-from django.core.exceptions import ValidationError
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from ems.models import TblBranch
-from ems.serializers.branch_serializers import TblBranchSerializer
+from ems.utils.master_import import BranchCSVImport, MasterUploadInProgress
 
 
 class BranchCSVUploadView(APIView):
@@ -26,13 +21,9 @@ class BranchCSVUploadView(APIView):
                 {"error": "No file provided."}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        success_count = 0
-        error_count = 0
-        all_failed_rows = []
-        internal_code_tracker = set()
-
         try:
-            decoded_file = file.read().decode("utf-8-sig")
+            file_bytes = file.read()
+            decoded_file = file_bytes.decode("utf-8-sig")
             csv_reader = csv.DictReader(io.StringIO(decoded_file))
 
             # --- 1. Required Headers Check ---
@@ -51,59 +42,17 @@ class BranchCSVUploadView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # --- 2. Row Processing ---
-            for index, row in enumerate(csv_reader, start=2):
-                clean_row = {
-                    k.strip().lower(): (v.strip() if v else None)
-                    for k, v in row.items()
-                }
-
-                try:
-                    with transaction.atomic():
-                        branch_code = clean_row.get("branch_code")
-
-                        # A. Missing Data Check
-                        if not branch_code:
-                            raise ValueError("branch_code is required but found empty.")
-
-                        # B. Internal CSV Duplicate Check
-                        if branch_code in internal_code_tracker:
-                            raise ValueError(
-                                f"Duplicate branch_code '{branch_code}' found inside this CSV file."
-                            )
-                        internal_code_tracker.add(branch_code)
-
-                        # C. Database Duplicate Check
-                        if TblBranch.objects.filter(branch_code=branch_code).exists():
-                            raise ValueError(
-                                f"Branch with code '{branch_code}' already exists in database."
-                            )
-
-                        # D. Email & Mobile Format Validation
-                        email = clean_row.get("email")
-                        if email and email.lower() not in ["null", "nan", "none"]:
-                            try:
-                                validate_email(email)
-                            except ValidationError:
-                                raise ValueError(f"Invalid email format: {email}")
-
-                        # E. Serializer Validation & Save
-                        serializer = TblBranchSerializer(data=clean_row)
-                        if serializer.is_valid():
-                            serializer.save(created_by=request.user.id)
-                            success_count += 1
-                        else:
-                            # Capturing Serializer/Model errors (like max_length)
-                            err_msg = " | ".join(
-                                [f"{k}: {v[0]}" for k, v in serializer.errors.items()]
-                            )
-                            raise ValueError(err_msg)
-
-                except Exception as e:
-                    error_count += 1
-                    row_err = dict(row)
-                    row_err["upload_status_reason"] = str(e)
-                    all_failed_rows.append(row_err)
+            # --- 2. Row Processing (chunked, resumable) ---
+            try:
+                result = BranchCSVImport(request.user.id).run(
+                    list(csv_reader), file.name, file_bytes
+                )
+            except MasterUploadInProgress as e:
+                return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+
+            success_count = result["success_count"]
+            all_failed_rows = result["failed_rows"]
+            error_count = len(all_failed_rows)
 
             # --- 3. Generate Error Report with Specific Filename ---
             report_url = None
@@ -3,7 +3,6 @@ import io
 import os
 from django.conf import settings
 from django.utils import timezone
-from django.db import transaction
 from django.core.files.storage import default_storage
 from rest_framework import status
 from rest_framework.views import APIView
@@ -11,8 +10,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from datetime import datetime
 
-from ems.models import Dealer, TblBranch
-from ems.serializers.dealer_serializer import DealerSerializer
+from ems.utils.master_import import DealerCSVImport, MasterUploadInProgress
 
 
 class DealerCSVUploadView(APIView):
@@ -32,15 +30,12 @@ class DealerCSVUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        success_count = 0
-        failed_rows = []
-        internal_code_tracker = set()  # To catch duplicates inside the CSV file
-
         try:
-            # 2. Stream Reading (Memory Efficient for large files)
+            # 2. Read the upload once; its hash lets a re-upload of the same
+            # file resume an interrupted import.
             # utf-8-sig handles the Byte Order Mark (BOM) from Excel CSVs
-            csv_file = io.TextIOWrapper(file.file, encoding="utf-8-sig")
-            reader = csv.DictReader(csv_file)
+            file_bytes = file.read()
+            reader = csv.DictReader(io.StringIO(file_bytes.decode("utf-8-sig")))
 
             # 3. Dynamic Header Validation
             # Clean headers: remove spaces and convert to lowercase
@@ -69,75 +64,18 @@ class DealerCSVUploadView(APIView):
                     },
                     status=status.HTTP_400_BAD_REQUEST,
                 )
+            rows = list(reader)
+
+            # 4. Process Rows (chunked, resumable)
+            try:
+                result = DealerCSVImport(request.user.id).run(
+                    rows, file.name, file_bytes
+                )
+            except MasterUploadInProgress as e:
+                return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
 
-            # 4. Process Each Row
-            for index, row in enumerate(reader, start=2):  # Row 2 matches Excel row 2
-                # Clean row data (strip spaces)
-                clean_data = {
-                    k.strip().lower(): (v.strip() if v else None)
-                    for k, v in row.items()
-                }
-
-                # Extract clean values using the lowercase map
-                row_code = clean_data.get("code")
-                branch_name = clean_data.get("branch")
-
-                try:
-                    with transaction.atomic():
-                        # --- Logic A: Row Integrity ---
-                        if not row_code or not branch_name:
-                            raise ValueError(
-                                "Code and Branch name are mandatory fields."
-                            )
-
-                        # --- Logic B: Internal Duplicate Check (CSV Level) ---
-                        if row_code in internal_code_tracker:
-                            raise ValueError(
-                                f"Duplicate Code '{row_code}' found within this CSV file."
-                            )
-                        internal_code_tracker.add(row_code)
-
-                        # --- Logic C: Database Duplicate Check ---
-                        if Dealer.objects.filter(code=row_code).exists():
-                            raise ValueError(
-                                f"Dealer with code '{row_code}' already exists in the system."
-                            )
-
-                        # --- Logic D: Relationship Validation ---
-                        branch_obj = TblBranch.objects.filter(
-                            branch_name__iexact=branch_name
-                        ).first()
-                        if not branch_obj:
-                            raise ValueError(
-                                f"Branch '{branch_name}' does not exist in the database."
-                            )
-
-                        # --- Logic E: Data Format Validation (Serializer) ---
-                        # Inject the branch ID into data for the serializer
-                        serializer_data = {
-                            k: v for k, v in row.items()
-                        }  # Use original row for serializer
-                        serializer_data["branch_id"] = branch_obj.branch_id
-
-                        serializer = DealerSerializer(data=serializer_data)
-                        if serializer.is_valid():
-                            serializer.save(created_by=request.user.id)
-                            success_count += 1
-                        else:
-                            # Convert serializer errors into a readable string
-                            err_msg = " | ".join(
-                                [
-                                    f"{k.title()}: {v[0]}"
-                                    for k, v in serializer.errors.items()
-                                ]
-                            )
-                            raise ValueError(err_msg)
-
-                except Exception as e:
-                    # Append error info to the row and add to failed list
-                    row["Failure Reason"] = str(e)
-                    row["Row Number"] = index
-                    failed_rows.append(row)
+            success_count = result["success_count"]
+            failed_rows = result["failed_rows"]
 
             # 5. Handle Error File Generation
             error_file_url = None
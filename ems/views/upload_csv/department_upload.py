@@ -3,14 +3,12 @@ import io
 import os
 from datetime import datetime
 from django.conf import settings
-from django.db import transaction, IntegrityError
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from ems.models.department import TblDepartment
-from ems.serializers.department_serializers import TblDepartmentSerializer
+from ems.utils.master_import import DepartmentCSVImport, MasterUploadInProgress
 
 
 class DepartmentCSVUploadView(APIView):
@@ -30,13 +28,10 @@ class DepartmentCSVUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        success_count = 0
-        all_failed_rows = []
-        internal_name_tracker = set()
-
         try:
             # handle BOM and decode
-            decoded_file = file.read().decode("utf-8-sig")
+            file_bytes = file.read()
+            decoded_file = file_bytes.decode("utf-8-sig")
             csv_reader = csv.DictReader(io.StringIO(decoded_file))
 
             # --- 2. HEADER VALIDATION ---
@@ -51,54 +46,18 @@ class DepartmentCSVUploadView(APIView):
                     },
                     status=status.HTTP_400_BAD_REQUEST,
                 )
+            rows = list(csv_reader)
+
+            # --- 3. ROW PROCESSING (chunked, resumable) ---
+            try:
+                result = DepartmentCSVImport(request.user.id).run(
+                    rows, file.name, file_bytes
+                )
+            except MasterUploadInProgress as e:
+                return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
 
-            # --- 3. ROW PROCESSING ---
-            for index, row in enumerate(csv_reader, start=2):
-                # Clean data
-                clean_row = {
-                    k.strip().lower(): (v.strip() if v else None)
-                    for k, v in row.items()
-                    if k
-                }
-                dept_name = clean_row.get("department_name")
-
-                try:
-                    with transaction.atomic():
-                        # A. Missing Check
-                        if not dept_name:
-                            raise ValueError("department_name is missing or empty.")
-
-                        # B. Internal CSV Duplicate Check
-                        if dept_name.lower() in internal_name_tracker:
-                            raise ValueError(
-                                f"Duplicate department '{dept_name}' found inside this CSV."
-                            )
-                        internal_name_tracker.add(dept_name.lower())
-
-                        # C. Database Duplicate Check
-                        if TblDepartment.objects.filter(
-                            department_name__iexact=dept_name
-                        ).exists():
-                            raise ValueError(
-                                f"Department '{dept_name}' already exists in the system."
-                            )
-
-                        # D. Serializer Save
-                        serializer = TblDepartmentSerializer(data=clean_row)
-                        if serializer.is_valid():
-                            serializer.save(created_by=request.user.id)
-                            success_count += 1
-                        else:
-                            readable_errors = " | ".join(
-                                [f"{k}: {v[0]}" for k, v in serializer.errors.items()]
-                            )
-                            raise ValueError(readable_errors)
-
-                except Exception as e:
-                    row_err = dict(row)
-                    row_err["upload_status_reason"] = str(e)
-                    row_err["Row Number"] = index
-                    all_failed_rows.append(row_err)
+            success_count = result["success_count"]
+            all_failed_rows = result["failed_rows"]
 
             # --- 4. ERROR REPORT GENERATION ---
             report_file_url = None
@@ -3,14 +3,12 @@ import io
 import os
 from datetime import datetime
 from django.conf import settings
-from django.db import transaction
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from constants import PRIORITY_MAPPING
-from ems.models import TblDesignation, TblDepartment
+from ems.utils.master_import import DesignationCSVImport, MasterUploadInProgress
 
 
 class DesignationCSVUploadView(APIView):
@@ -23,15 +21,9 @@ class DesignationCSVUploadView(APIView):
                 {"error": "No file provided."}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        success_count = 0
-        all_failed_rows = []
-
-        # Trackers for file-level duplication
-        internal_name_tracker = set()
-        internal_code_tracker = set()
-
         try:
-            decoded_file = file.read().decode("utf-8-sig")
+            file_bytes = file.read()
+            decoded_file = file_bytes.decode("utf-8-sig")
             csv_reader = csv.DictReader(io.StringIO(decoded_file))
             rows = list(csv_reader)
 
@@ -52,107 +44,16 @@ class DesignationCSVUploadView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # --- 2. PASS 1: VALIDATION & CREATION ---
-            for index, row in enumerate(rows, start=2):
-                clean_row = {
-                    k.strip().lower(): (v.strip() if v else None)
-                    for k, v in row.items()
-                    if k
-                }
-                d_name = clean_row.get("designation_name")
-                d_code = clean_row.get("designation_code")
-                dept_name = clean_row.get("department_name")
-
-                try:
-                    with transaction.atomic():
-                        # A. Mandatory Fields Check
-                        if not d_name or not dept_name:
-                            raise ValueError(
-                                "Designation name and Department name are required."
-                            )
-
-                        # B. Designation Name: File & DB Duplicate Check
-                        if d_name.lower() in internal_name_tracker:
-                            raise ValueError(
-                                f"Duplicate Name: '{d_name}' exists multiple times in this CSV."
-                            )
-                        if TblDesignation.objects.filter(
-                            designation_name__iexact=d_name
-                        ).exists():
-                            raise ValueError(
-                                f"Name Conflict: '{d_name}' already exists in database."
-                            )
-                        internal_name_tracker.add(d_name.lower())
-
-                        # C. Designation Code: File & DB Duplicate Check (Model: unique=True)
-                        if d_code:
-                            if d_code.lower() in internal_code_tracker:
-                                raise ValueError(
-                                    f"Duplicate Code: '{d_code}' exists multiple times in this CSV."
-                                )
-                            if TblDesignation.objects.filter(
-                                designation_code__iexact=d_code
-                            ).exists():
-                                raise ValueError(
-                                    f"Code Conflict: Code '{d_code}' is already assigned in database."
-                                )
-                            internal_code_tracker.add(d_code.lower())
-
-                        # D. Department Lookup
-                        dept_obj = TblDepartment.objects.filter(
-                            department_name__iexact=dept_name
-                        ).first()
-                        if not dept_obj:
-                            raise ValueError(
-                                f"Department '{dept_name}' not found in system."
-                            )
-
-                        # E. Priority Mapping
-                        p_str = (
-                            clean_row.get("designation_priority") or "Medium"
-                        ).capitalize()
-                        priority_val = PRIORITY_MAPPING.get(p_str, 1)
-
-                        # F. Initial Create (Parent ID = 0)
-                        TblDesignation.objects.create(
-                            designation_name=d_name,
-                            designation_code=d_code,
-                            department=dept_obj,
-                            designation_priority=priority_val,
-                            parent_designation_id=0,
-                            created_by=request.user.id,
-                        )
-                        success_count += 1
-
-                except Exception as e:
-                    row_err = dict(row)
-                    row_err["Row Number"] = index
-                    row_err["upload_status_reason"] = str(e)
-                    all_failed_rows.append(row_err)
-
-            # --- 3. PASS 2: HIERARCHY LINKING ---
-            for row in rows:
-                clean_row = {
-                    k.strip().lower(): (v.strip() if v else None)
-                    for k, v in row.items()
-                    if k
-                }
-                d_name = clean_row.get("designation_name")
-                parent_name = clean_row.get("parent_designation_name")
+            # --- 2. VALIDATION, CREATION & HIERARCHY LINKING (chunked, resumable) ---
+            try:
+                result = DesignationCSVImport(request.user.id).run(
+                    rows, file.name, file_bytes
+                )
+            except MasterUploadInProgress as e:
+                return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
 
-                # "0" logic handle: Agar parent valid name hai tabhi link karein
-                if (
-                    d_name
-                    and parent_name
-                    and parent_name not in ["0", "None", "null", ""]
-                ):
-                    parent_obj = TblDesignation.objects.filter(
-                        designation_name__iexact=parent_name
-                    ).first()
-                    if parent_obj:
-                        TblDesignation.objects.filter(
-                            designation_name__iexact=d_name
-                        ).update(parent_designation_id=parent_obj.id)
+            success_count = result["success_count"]
+            all_failed_rows = result["failed_rows"]
 
             # --- 4. ERROR REPORT GENERATION ---
             report_url = None
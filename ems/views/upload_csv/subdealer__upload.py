@@ -2,19 +2,14 @@ import csv
 from datetime import datetime
 import io
 import os
-import re
 from django.conf import settings
 from django.utils import timezone
-from django.db import transaction
-from django.core.validators import validate_email
-from django.core.exceptions import ValidationError
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from ems.models import SubDealer, Dealer, TblBranch
-from ems.serializers.subdealer_serializer import SubDealerSerializer
+from ems.utils.master_import import MasterUploadInProgress, SubDealerCSVImport
 
 
 class SubDealerCSVUploadView(APIView):
@@ -33,13 +28,10 @@ class SubDealerCSVUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        success_count = 0
-        failed_rows = []
-        internal_code_tracker = set()
-
         try:
             # handle BOM and decode
-            decoded_file = file.read().decode("utf-8-sig")
+            file_bytes = file.read()
+            decoded_file = file_bytes.decode("utf-8-sig")
             csv_data = io.StringIO(decoded_file)
             csv_reader = csv.DictReader(csv_data)
 
@@ -70,88 +62,18 @@ class SubDealerCSVUploadView(APIView):
                     },
                     status=status.HTTP_400_BAD_REQUEST,
                 )
+            rows = list(csv_reader)
+
+            # 2. Row Processing (chunked, resumable)
+            try:
+                result = SubDealerCSVImport(request.user.id).run(
+                    rows, file.name, file_bytes
+                )
+            except MasterUploadInProgress as e:
+                return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
 
-            # 2. Validation: Row Processing
-            for index, row in enumerate(csv_reader, start=2):
-                # Clean keys and values
-                clean_row = {
-                    k.strip().lower(): (v.strip() if v else None)
-                    for k, v in row.items()
-                }
-
-                try:
-                    with transaction.atomic():
-                        subdealer_code = clean_row.get("code")
-
-                        # --- Basic Field Validations ---
-                        if not subdealer_code:
-                            raise ValueError("Sub-dealer code is missing.")
-
-                        # File-level duplicate check
-                        if subdealer_code in internal_code_tracker:
-                            raise ValueError(
-                                f"Duplicate code '{subdealer_code}' found within this CSV file."
-                            )
-                        internal_code_tracker.add(subdealer_code)
-
-                        # Database-level duplicate check
-                        if SubDealer.objects.filter(code=subdealer_code).exists():
-                            raise ValueError(
-                                f"Sub-dealer with code '{subdealer_code}' is already registered."
-                            )
-
-                        # Email format check
-                        email = clean_row.get("email")
-                        if email:
-                            try:
-                                validate_email(email)
-                            except ValidationError:
-                                raise ValueError(f"Invalid email format: {email}")
-
-                        # Mobile number check (Basic 10 digits)
-                        mobile = clean_row.get("mobile_number")
-                        if mobile and not re.match(r"^\d{10}$", mobile):
-                            raise ValueError(
-                                f"Invalid mobile number: {mobile}. Must be 10 digits."
-                            )
-
-                        # --- Relationship Lookups ---
-                        d_name = clean_row.get("dealer_name")
-                        dealer_obj = Dealer.objects.filter(name__iexact=d_name).first()
-                        if not dealer_obj:
-                            raise ValueError(
-                                f"Dealer '{d_name}' does not exist in the database."
-                            )
-
-                        b_name = clean_row.get("branch_name")
-                        branch_obj = TblBranch.objects.filter(
-                            branch_name__iexact=b_name
-                        ).first()
-                        if not branch_obj:
-                            raise ValueError(f"Branch '{b_name}' does not exist.")
-
-                        # --- Serialization and Saving ---
-                        data_to_save = {
-                            k: v.strip() if v else v for k, v in row.items()
-                        }
-                        data_to_save["dealer_id"] = dealer_obj.id
-                        data_to_save["branch_id"] = str(branch_obj.branch_id)
-
-                        serializer = SubDealerSerializer(data=data_to_save)
-                        if serializer.is_valid():
-                            serializer.save(created_by=request.user.id)
-                            success_count += 1
-                        else:
-                            error_text = " | ".join(
-                                [f"{k}: {v[0]}" for k, v in serializer.errors.items()]
-                            )
-                            raise ValueError(error_text)
-
-                except Exception as e:
-                    row_err = dict(row)
-                    row_err["Row Number"] = index
-                    row_err["Failure Reason"] = str(e)
-                    failed_rows.append(row_err)
+            success_count = result["success_count"]
+            failed_rows = result["failed_rows"]
 
             # 3. Final Report & Response
             error_file_url = (
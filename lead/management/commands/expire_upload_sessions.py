@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from lead.utils.resumable_upload import expire_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        "Abort resumable enquiry uploads that received no chunk for "
+        "RESUMABLE_UPLOADS TTL_HOURS and delete their part files. Meant for cron."
+    )
+
+    def handle(self, *args, **options):
+        count = expire_sessions()
+        self.stdout.write(f"Expired {count} upload sessions.")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from lead.utils.media_store import collect_garbage, get_media_store_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconcile media store reference counts against EnquiryImages, "
+        "EnquirySelfie and EnquiryTickets, then delete blobs nothing has "
+        "referenced for the grace period and stray files under the store."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=None,
+            help="Keep unreferenced blobs younger than this "
+            "(MEDIA_STORE GC_GRACE_HOURS by default).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        grace_hours = options["grace_hours"]
+        if grace_hours is None:
+            grace_hours = get_media_store_settings()["GC_GRACE_HOURS"]
+        summary = collect_garbage(grace_hours=grace_hours, dry_run=options["dry_run"])
+        prefix = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            f"Corrected {summary['recounted']} reference counts. {prefix} {summary['deleted']} "
+            f"blobs ({summary['bytes_freed'] / 1048576:.1f} MB) and "
+            f"{summary['strays']} stray files."
+        )
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from lead.utils.followup_logs import (
+    get_followup_log_settings,
+    materialize_followup_logs,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Create the missing "Follow-up Scheduled" lead logs for a day\'s '
+        "follow-ups and the few days before it. Schedule it once a day (e.g. "
+        "from cron, just after midnight); a missed run is caught up by the next one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="Materialize follow-ups up to this date (YYYY-MM-DD). Defaults to today.",
+        )
+        parser.add_argument(
+            "--lookback-days",
+            type=int,
+            help=(
+                "Also cover follow-ups this many days before --date. Defaults to "
+                "FOLLOWUP_LOGS['LOOKBACK_DAYS']; pass a large value to backfill."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        day = date.today()
+        if options["date"]:
+            day = parse_date(options["date"])
+            if not day:
+                raise CommandError("--date must be in YYYY-MM-DD format.")
+
+        lookback_days = options["lookback_days"]
+        if lookback_days is None:
+            lookback_days = get_followup_log_settings()["LOOKBACK_DAYS"]
+        if lookback_days < 0:
+            raise CommandError("--lookback-days must not be negative.")
+        since = day - timedelta(days=lookback_days)
+
+        created = materialize_followup_logs(day, since=since)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} follow-up log(s) for {since} to {day}."
+            )
+        )
@@ -0,0 +1,95 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import Q, Sum
+
+from lead.models.media_blob import MediaBlob
+from lead.utils.media_store import (
+    REFERENCE_FIELDS,
+    file_digest,
+    get_media_store,
+    iter_names,
+    migrate_row,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move enquiry images, selfies (with their renditions) and ticket "
+        "attachments stored before the content-addressed media store into it. "
+        "Rows are repointed one at a time, so it is safe to run while serving "
+        "and to re-run after an interruption."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=sorted(REFERENCE_FIELDS),
+            help="Only migrate this model.",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=None, help="Stop after this many rows per model."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Hash the files and report how much deduplication would save.",
+        )
+
+    def handle(self, *args, **options):
+        store = get_media_store()
+        labels = [options["model"]] if options["model"] else list(REFERENCE_FIELDS)
+        if options["dry_run"]:
+            return self.report(store, labels, options["limit"])
+
+        blob_bytes = MediaBlob.objects.aggregate(total=Sum("size"))["total"] or 0
+        for label in labels:
+            model = apps.get_model(label)
+            file_field = REFERENCE_FIELDS[label][0]
+            ids = list(
+                self.legacy_rows(model, file_field, store)
+                .order_by("id")
+                .values_list("id", flat=True)[: options["limit"]]
+            )
+            moved = missing = size = 0
+            for pk in ids:
+                summary = migrate_row(label, pk, store)
+                moved += summary["moved"]
+                missing += summary["missing"]
+                size += summary["bytes"]
+            close_old_connections()
+            self.stdout.write(
+                f"{label}: {len(ids)} rows, {moved} files moved "
+                f"({size / 1048576:.1f} MB), {missing} missing on disk"
+            )
+
+        added = (MediaBlob.objects.aggregate(total=Sum("size"))["total"] or 0) - blob_bytes
+        self.stdout.write(f"Blob store grew by {added / 1048576:.1f} MB.")
+
+    def legacy_rows(self, model, file_field, store):
+        # Rows whose upload is still a plain file; renditions follow it.
+        return (
+            model._base_manager.exclude(**{f"{file_field}__startswith": store.prefix})
+            .exclude(Q(**{file_field: ""}) | Q(**{f"{file_field}__isnull": True}))
+        )
+
+    def report(self, store, labels, limit):
+        files = total = 0
+        unique = {}
+        for label in labels:
+            model = apps.get_model(label)
+            fields = REFERENCE_FIELDS[label]
+            rows = self.legacy_rows(model, fields[0], store).order_by("id")
+            for row in rows.values_list(*fields)[:limit]:
+                for value in row:
+                    for name in iter_names(value):
+                        if store.is_blob(name) or not store.exists(name):
+                            continue
+                        sha256, size = file_digest(store, name)
+                        files += 1
+                        total += size
+                        unique[sha256] = size
+        self.stdout.write(
+            f"{files} files, {total / 1048576:.1f} MB; {len(unique)} distinct, "
+            f"{sum(unique.values()) / 1048576:.1f} MB after deduplication."
+        )
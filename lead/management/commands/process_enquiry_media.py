@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from lead.utils.image_renditions import MEDIA_MODELS, get_image_rendition_settings, process_media
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-encode enquiry images / selfies and build their thumbnail and preview "
+        "renditions. Without --force only rows never processed are touched, so it "
+        "also backfills uploads made before the pipeline existed, or with "
+        "IMAGE_RENDITIONS MODE 'off'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            choices=sorted(MEDIA_MODELS),
+            help="Only process this kind of media.",
+        )
+        parser.add_argument(
+            "--threads", type=int, default=4, help="Images processed in parallel."
+        )
+        parser.add_argument(
+            "--limit", type=int, default=None, help="Stop after this many rows per kind."
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Also re-process rows that already have renditions.",
+        )
+
+    def handle(self, *args, **options):
+        conf = get_image_rendition_settings()
+        kinds = [options["kind"]] if options["kind"] else list(MEDIA_MODELS)
+
+        def run(job):
+            try:
+                return process_media(*job, conf)
+            finally:
+                close_old_connections()
+
+        for kind in kinds:
+            model, field_name = MEDIA_MODELS[kind]
+            rows = model.objects.exclude(**{field_name: ""}).exclude(
+                **{f"{field_name}__isnull": True}
+            )
+            if not options["force"]:
+                rows = rows.filter(processed_at__isnull=True)
+            ids = list(rows.order_by("id").values_list("id", flat=True)[: options["limit"]])
+
+            before = after = done = 0
+            with ThreadPoolExecutor(max_workers=max(options["threads"], 1)) as executor:
+                for renditions in executor.map(run, [(kind, pk) for pk in ids]):
+                    if renditions:
+                        done += 1
+                        before += renditions["original_bytes"]
+                        after += renditions["bytes"]
+
+            self.stdout.write(
+                f"{kind}: {done}/{len(ids)} processed, "
+                f"{before / 1048576:.1f} MB -> {after / 1048576:.1f} MB"
+            )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from lead.utils.enquiry_counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the materialized enquiry dashboard counters from Enquiry and "
+        "EnquiryLoanDetails and fix any drift. Run it periodically (e.g. from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the drift; do not change the counters.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        drift = reconcile_counters(dry_run=dry_run)
+
+        for (dimension, key, status, is_deleted), delta in sorted(drift.items()):
+            deleted = " deleted" if is_deleted else ""
+            self.stdout.write(
+                f"{dimension}:{key or '-'} status={status}{deleted}: {delta:+d}"
+            )
+
+        verb = "Found" if dry_run else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drift)} drifted counter(s)."))
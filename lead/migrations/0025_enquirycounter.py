@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+def build_counters(apps, schema_editor):
+    from lead.utils.enquiry_counters import reconcile_counters
+
+    reconcile_counters(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lead', '0024_enquiry_unique_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnquiryCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=20)),
+                ('key', models.CharField(blank=True, default='', max_length=50)),
+                ('status', models.IntegerField()),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('count', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'lead_enquiry_counters',
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key', 'status', 'is_deleted'), name='uniq_enquiry_counter')],
+            },
+        ),
+        migrations.RunPython(build_counters, migrations.RunPython.noop),
+    ]
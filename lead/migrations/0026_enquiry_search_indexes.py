@@ -0,0 +1,33 @@
+from django.db import migrations
+
+from auth_system.utils.search import create_search_indexes, drop_search_indexes
+
+# (model, icontains columns, istartswith columns) searched by the list views.
+SEARCH_INDEXES = [
+    ("Enquiry", ["name"], ["mobile_number"]),
+]
+
+
+def add_indexes(apps, schema_editor):
+    for model_name, contains, prefix in SEARCH_INDEXES:
+        table = apps.get_model("lead", model_name)._meta.db_table
+        create_search_indexes(schema_editor, table, contains, prefix)
+
+
+def remove_indexes(apps, schema_editor):
+    for model_name, contains, prefix in SEARCH_INDEXES:
+        table = apps.get_model("lead", model_name)._meta.db_table
+        drop_search_indexes(schema_editor, table, contains, prefix)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("lead", "0025_enquirycounter"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
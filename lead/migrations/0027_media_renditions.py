@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lead', '0026_enquiry_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enquiryimages',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='enquiryimages',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='enquiryselfie',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='enquiryselfie',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
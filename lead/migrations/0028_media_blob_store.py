@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-18 13:35
+
+import django.utils.timezone
+import lead.models.enquiry_images
+import lead.models.enquiry_selfie
+import lead.models.enquiry_tickets
+import lead.utils.media_store
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lead', '0027_media_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='enquiryimages',
+            name='media_file',
+            field=models.FileField(storage=lead.utils.media_store.get_media_store, upload_to=lead.models.enquiry_images.image_upload_path),
+        ),
+        migrations.AlterField(
+            model_name='enquiryselfie',
+            name='selfie',
+            field=models.ImageField(blank=True, null=True, storage=lead.utils.media_store.get_media_store, upload_to=lead.models.enquiry_selfie.selfies_upload_path),
+        ),
+        migrations.AlterField(
+            model_name='enquirytickets',
+            name='attachment',
+            field=models.FileField(storage=lead.utils.media_store.get_media_store, upload_to=lead.models.enquiry_tickets.attachment_path),
+        ),
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_referenced_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'lead_media_blob',
+                'indexes': [models.Index(fields=['ref_count', 'last_referenced_at'], name='lead_media__ref_cou_cfb177_idx')],
+            },
+        ),
+    ]
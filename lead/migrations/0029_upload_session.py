@@ -0,0 +1,41 @@
+# Generated by Django 5.2 on 2026-10-18 13:39
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lead', '0028_media_blob_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('kind', models.CharField(choices=[('image', 'Enquiry Image'), ('selfie', 'Enquiry Selfie')], max_length=20)),
+                ('file_name', models.CharField(max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('total_size', models.BigIntegerField()),
+                ('received_size', models.BigIntegerField(default=0)),
+                ('sha256', models.CharField(blank=True, max_length=64, null=True)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('status', models.IntegerField(choices=[(1, 'Uploading'), (2, 'Completed'), (3, 'Aborted')], default=1)),
+                ('result_id', models.IntegerField(blank=True, null=True)),
+                ('created_by', models.IntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField()),
+                ('enquiry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='lead.enquiry')),
+            ],
+            options={
+                'db_table': 'lead_upload_session',
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='lead_upload_status_33b36c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-18 13:44
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+# Step row model -> flag; every row counts, deleted or not, as the
+# existence checks these flags replace did.
+STEP_FLAGS = {
+    'EnquiryAddress': 'has_address',
+    'EnquiryLoanDetails': 'has_loan_details',
+    'EnquiryImages': 'has_images',
+    'EnquirySelfie': 'has_selfie',
+}
+
+
+def backfill_step_flags(apps, schema_editor):
+    Enquiry = apps.get_model('lead', 'Enquiry')
+    for model_name, flag in STEP_FLAGS.items():
+        rows = apps.get_model('lead', model_name).objects.filter(enquiry=OuterRef('pk'))
+        Enquiry.objects.filter(Exists(rows)).update(**{flag: True})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lead', '0029_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enquiry',
+            name='has_address',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='enquiry',
+            name='has_images',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='enquiry',
+            name='has_loan_details',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='enquiry',
+            name='has_selfie',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_step_flags, migrations.RunPython.noop),
+    ]
@@ -5,6 +5,7 @@ from .property_document import PropertyDocument  # ✅ Add this line
 from .loan_amount_range import LoanAmountRange  # 👈 Add this line
 from .enquiry import Enquiry
 from .enquiry_loan_details import EnquiryLoanDetails        
+from .media_blob import MediaBlob
 from .enquiry_images import EnquiryImages
 from .enquiry_selfie import EnquirySelfie
 from .enquiry_address import EnquiryAddress
@@ -15,3 +16,5 @@ from .enquiry_lead_assign_log import LeadAssignLog
 from .apilog import APILog
 from .enquiry_tickets import EnquiryTickets
 from .enquiry_end_user import EnquiryEnduser
+from .enquiry_counter import EnquiryCounter
+from .upload_session import UploadSession
@@ -9,6 +9,10 @@ from constants import  KycStatus
 
 from ems.models.emp_basic_profile import TblEmpBasicProfile
 from lead.models.nature_of_business import NatureOfBusiness
+
+STEP_FLAG_FIELDS = ("has_address", "has_loan_details", "has_images", "has_selfie")
+
+
 class Enquiry(models.Model):
 
     unique_code = models.CharField(max_length=100, unique=True, null=True, blank=True)
@@ -40,6 +44,11 @@ class Enquiry(models.Model):
     is_steps = models.IntegerField(choices=PercentageStatus.choices, default=PercentageStatus.ENQUIRY_BASIC)    
     is_status = models.IntegerField(choices=EnquiryStatus.choices,default=EnquiryStatus.DRAFT)
     assign_to = models.ForeignKey(TblEmpBasicProfile, on_delete=models.SET_NULL, null=True, blank=True)
+    # Set once the step has a row (lead.utils.enquiry_steps); never cleared.
+    has_address = models.BooleanField(default=False)
+    has_loan_details = models.BooleanField(default=False)
+    has_images = models.BooleanField(default=False)
+    has_selfie = models.BooleanField(default=False)
     created_by = models.IntegerField()
     created_at = models.DateTimeField(default=timezone.now)
     updated_by = models.IntegerField(null=True, blank=True, default=0)
@@ -47,5 +56,16 @@ class Enquiry(models.Model):
     deleted_by = models.IntegerField(null=True, blank=True, default=0)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    def save(self, *args, **kwargs):
+        # Step flags are only written by lead.utils.enquiry_steps, so saving
+        # an instance loaded before a step was written cannot clear them.
+        if not self._state.adding and not kwargs.get("force_insert") and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in STEP_FLAG_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.id} - {self.name} -{self.mobile_number}"
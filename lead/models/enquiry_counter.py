@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class EnquiryCounter(models.Model):
+    """
+    Materialized enquiry counts for the dashboard count endpoints, kept up to
+    date by lead.signals and rebuilt by `manage.py reconcile_enquiry_counters`.
+    """
+
+    dimension = models.CharField(max_length=20)
+    key = models.CharField(max_length=50, default="", blank=True)
+    status = models.IntegerField()
+    is_deleted = models.BooleanField(default=False)
+    count = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "lead_enquiry_counters"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dimension", "key", "status", "is_deleted"],
+                name="uniq_enquiry_counter",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}:{self.key} [{self.status}] = {self.count}"
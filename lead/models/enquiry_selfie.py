@@ -3,6 +3,7 @@ from datetime import datetime
 from lead.models.enquiry import Enquiry
 from django.utils import timezone
 import uuid
+from lead.utils.media_store import get_media_store
 
 def selfies_upload_path(instance, filename):
     
@@ -24,7 +25,10 @@ class EnquirySelfie(models.Model):
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
 
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
-    selfie = models.ImageField(upload_to=selfies_upload_path, null=True, blank=True)  
+    selfie = models.ImageField(upload_to=selfies_upload_path, storage=get_media_store, null=True, blank=True)  
+    # Set by lead.utils.image_renditions: {"thumbnail": path, "preview": path, ...}
+    renditions = models.JSONField(default=dict, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
 
     created_by = models.IntegerField()
     created_at = models.DateTimeField(default=timezone.now)
@@ -35,11 +39,14 @@ class EnquirySelfie(models.Model):
     deleted_by = models.IntegerField(null=True, blank=True, default=0)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    def stamp_capture(self):
+        now = datetime.now()
+        self.capture_date = now.date()
+        self.capture_time = now.time()
+
     def save(self, *args, **kwargs):
         if not self.id:
-            now = datetime.now()
-            self.capture_date = now.date()
-            self.capture_time = now.time()
+            self.stamp_capture()
         super().save(*args, **kwargs)
 
     def __str__(self):
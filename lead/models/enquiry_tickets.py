@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils import timezone
 import uuid
+from lead.utils.media_store import get_media_store
 from constants import TicketStatus, TicketPriority
 
 def attachment_path(instance, filename):
@@ -12,7 +13,7 @@ class EnquiryTickets(models.Model):
 
     title = models.CharField(max_length=255)
     description = models.TextField()
-    attachment = models.FileField(upload_to=attachment_path)
+    attachment = models.FileField(upload_to=attachment_path, storage=get_media_store)
     priority = models.IntegerField(choices=TicketPriority.choices)
     status = models.IntegerField(choices=TicketStatus.choices, default=TicketStatus.TICKET_OPEN)
 
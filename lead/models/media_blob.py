@@ -0,0 +1,28 @@
+from django.db import models
+from django.utils import timezone
+
+
+class MediaBlob(models.Model):
+    """
+    One stored file of the content-addressed media store
+    (lead.utils.media_store), shared by every EnquiryImages, EnquirySelfie
+    and EnquiryTickets row that uploaded the same bytes.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    # Storage name, e.g. "cas/ab/cd/abcd...ef.jpg"
+    name = models.CharField(max_length=255)
+    size = models.BigIntegerField(default=0)
+    # Maintained on save / delete, reconciled against the referencing rows
+    # by `manage.py gc_media_blobs`.
+    ref_count = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    last_referenced_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "lead_media_blob"
+        indexes = [models.Index(fields=["ref_count", "last_referenced_at"])]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
@@ -0,0 +1,46 @@
+import uuid
+
+from django.db import models
+from django.utils import timezone
+
+from constants import UPLOAD_KIND_CHOICES, UploadSessionStatus
+from lead.models.enquiry import Enquiry
+
+
+class UploadSession(models.Model):
+    """
+    One resumable upload of an enquiry image or selfie
+    (lead.utils.resumable_upload). Chunks are appended to a part file on
+    disk; finalize attaches it like the regular upload endpoints.
+    """
+
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    enquiry = models.ForeignKey(Enquiry, on_delete=models.CASCADE, related_name="upload_sessions")
+    kind = models.CharField(max_length=20, choices=UPLOAD_KIND_CHOICES)
+
+    file_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, null=True, blank=True)
+    total_size = models.BigIntegerField()
+    received_size = models.BigIntegerField(default=0)
+    # Optional hex SHA-256 of the whole file, checked on finalize.
+    sha256 = models.CharField(max_length=64, null=True, blank=True)
+    # The other form fields of the upload (premises_type, latitude, ...).
+    metadata = models.JSONField(default=dict, blank=True)
+
+    status = models.IntegerField(
+        choices=UploadSessionStatus.choices, default=UploadSessionStatus.UPLOADING
+    )
+    # EnquiryImages / EnquirySelfie id once finalized.
+    result_id = models.IntegerField(null=True, blank=True)
+
+    created_by = models.IntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "lead_upload_session"
+        indexes = [models.Index(fields=["status", "expires_at"])]
+
+    def __str__(self):
+        return f"{self.kind} upload {self.upload_id} ({self.received_size}/{self.total_size})"
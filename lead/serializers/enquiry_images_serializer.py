@@ -1,7 +1,31 @@
 from rest_framework import serializers
 from ..models.enquiry_images import EnquiryImages
+from lead.utils.image_renditions import MEDIA_MODELS, media_kind, media_url, rendition_url
 
-class EnquiryImageSerializer(serializers.ModelSerializer):
+class RenditionUrlsMixin(serializers.Serializer):
+    """
+    thumbnail_url / preview_url of an EnquiryImages or EnquirySelfie row; the
+    file field itself is rendered as its authorized file endpoint too.
+    """
+
+    thumbnail_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+
+    def get_thumbnail_url(self, obj):
+        return rendition_url(obj, "thumbnail", self.context.get("request"))
+
+    def get_preview_url(self, obj):
+        return rendition_url(obj, "preview", self.context.get("request"))
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        _, field_name = MEDIA_MODELS[media_kind(instance)]
+        if field_name in data:
+            data[field_name] = media_url(instance, request=self.context.get("request"))
+        return data
+
+
+class EnquiryImageSerializer(RenditionUrlsMixin, serializers.ModelSerializer):
     file_url = serializers.SerializerMethodField()
 
     class Meta:
@@ -13,10 +37,10 @@ class EnquiryImageSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "deleted_at",
+            "renditions",
+            "processed_at",
         )
         read_only_fields = ("enquiry",)
 
     def get_file_url(self, obj):
-        if obj.media_file:
-            return obj.media_file.url   # this gives /media/... directly
-        return None
+        return media_url(obj, request=self.context.get("request"))
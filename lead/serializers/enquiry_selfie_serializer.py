@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from ..models.enquiry_selfie import EnquirySelfie
+from lead.serializers.enquiry_images_serializer import RenditionUrlsMixin
 
 
-class EnquirySelfieSerializer(serializers.ModelSerializer):
+class EnquirySelfieSerializer(RenditionUrlsMixin, serializers.ModelSerializer):
     selfie = serializers.ImageField(allow_empty_file=False, use_url=True)
 
     class Meta:
@@ -14,5 +15,7 @@ class EnquirySelfieSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "deleted_at",
+            "renditions",
+            "processed_at",
         )
         read_only_fields = ("enquiry",)
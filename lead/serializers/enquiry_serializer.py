@@ -1,10 +1,13 @@
+from django.db.models import Manager, Prefetch, prefetch_related_objects
 from rest_framework import serializers
+from auth_system.models.user import TblUser
 from lead.models.enquiry import Enquiry
 from lead.models.enquiry_address import EnquiryAddress
 from lead.models.enquiry_loan_details import EnquiryLoanDetails
 from lead.models.enquiry_verifications import EnquiryVerification
 from lead.models.enquiry_images import EnquiryImages
 from lead.models.enquiry_selfie import EnquirySelfie
+from lead.serializers.enquiry_images_serializer import RenditionUrlsMixin
 from ems.models.emp_basic_profile import TblEmpBasicProfile
 
 
@@ -65,15 +68,51 @@ class EnquiryVerificationSerializer(serializers.ModelSerializer):
         return obj.get_email_status_display() if obj.email_status is not None else None
 
 
-class EnquiryImagesSerializer(serializers.ModelSerializer):
+class EnquiryImagesSerializer(RenditionUrlsMixin, serializers.ModelSerializer):
     class Meta:
         model = EnquiryImages
-        exclude = ("created_by", "updated_by", "deleted_by", "created_at", "updated_at", "deleted_at")
+        exclude = ("created_by", "updated_by", "deleted_by", "created_at", "updated_at", "deleted_at", "renditions", "processed_at")
 
-class EnquirySelfieSerializer(serializers.ModelSerializer):
+class EnquirySelfieSerializer(RenditionUrlsMixin, serializers.ModelSerializer):
     class Meta:
         model = EnquirySelfie
-        exclude = ("created_by", "updated_by", "deleted_by", "created_at", "updated_at", "deleted_at")
+        exclude = ("created_by", "updated_by", "deleted_by", "created_at", "updated_at", "deleted_at", "renditions", "processed_at")
+
+# Relations rendered by EnquirySerializer, loaded once per page in list mode.
+ENQUIRY_LIST_PREFETCH = [
+    "nature_of_business",
+    "enquiry_verification",
+    "enquiry_addresses",
+    Prefetch(
+        "enquiry_loan_details",
+        queryset=EnquiryLoanDetails.objects.select_related(
+            "loan_type",
+            "loan_amount_range",
+            "property_type",
+            "property_document_type",
+            "end_user",
+        ),
+    ),
+    "enquiry_images",
+    "enquiry_selfies",
+]
+
+
+class EnquiryListSerializer(serializers.ListSerializer):
+    """
+    Serializes a page of enquiries with a fixed number of queries: nested
+    relations are prefetched and creator profile/department lookups are
+    resolved in one batch instead of per row.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, Manager) else data
+        instances = list(iterable)
+        if instances:
+            prefetch_related_objects(instances, *ENQUIRY_LIST_PREFETCH)
+            self.child.load_creator_maps(instances)
+        return super().to_representation(instances)
+
 
 class EnquirySerializer(serializers.ModelSerializer):
     # loan_type_display = serializers.SerializerMethodField()
@@ -99,6 +138,7 @@ class EnquirySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Enquiry
+        list_serializer_class = EnquiryListSerializer
 
         fields = [
             "id",
@@ -155,30 +195,43 @@ class EnquirySerializer(serializers.ModelSerializer):
     def get_kyc_document_display(self, obj):
         return obj.get_kyc_document_display() if obj.kyc_document else None
 
+    def load_creator_maps(self, instances):
+        creator_ids = {obj.created_by for obj in instances if obj.created_by}
+        self._creator_ids = creator_ids
+        self._creator_profiles = {}
+        self._creator_departments = {}
+        if not creator_ids:
+            return
+        self._creator_profiles = {
+            emp["id"]: emp
+            for emp in TblEmpBasicProfile.objects.filter(id__in=creator_ids).values(
+                "id", "name", "employee_code"
+            )
+        }
+        self._creator_departments = dict(
+            TblUser.objects.filter(id__in=creator_ids).values_list(
+                "id", "department_id__department_name"
+            )
+        )
+
+    def to_representation(self, instance):
+        # Single-object use: resolve the creator maps for just this row.
+        if not hasattr(self, "_creator_ids") or (
+            instance.created_by and instance.created_by not in self._creator_ids
+        ):
+            self.load_creator_maps([instance])
+        return super().to_representation(instance)
+
     def get_created_by_name(self, obj):
-        if obj.created_by:
-            emp = TblEmpBasicProfile.objects.filter(id=obj.created_by).first()
-            return emp.name if emp else None
-        return None
+        emp = self._creator_profiles.get(obj.created_by)
+        return emp["name"] if emp else None
 
     def get_created_by_code(self, obj):
-        if obj.created_by:
-            emp = TblEmpBasicProfile.objects.filter(id=obj.created_by).first()
-            return emp.employee_code if emp else None
-        return None
+        emp = self._creator_profiles.get(obj.created_by)
+        return emp["employee_code"] if emp else None
 
     def get_created_at(self, obj):
         return obj.created_at.strftime("%Y-%m-%d") if obj.created_at else None
+
     def get_department_name(self, obj):
-            if obj.created_by:
-                try:
-                    from auth_system.models import TblUser
-                    # User dhundiye aur uska department fetch kijiye
-                    user = TblUser.objects.filter(id=obj.created_by).select_related('department_id').first()
-                    
-                    if user and user.department_id:
-                        # Aapke model ke hisab se field ka naam 'department_name' hai
-                        return user.department_id.department_name
-                except Exception:
-                    return None
-            return None
+        return self._creator_departments.get(obj.created_by)
@@ -1,5 +1,6 @@
 
 
+from django.urls import reverse
 from rest_framework import serializers
 from ..models.enquiry_tickets import EnquiryTickets
 
@@ -23,6 +24,17 @@ class EnquiryTicketSerializer(serializers.ModelSerializer):
             "deleted_at",
         )
         read_only_fields = ("id",)
+
+    def to_representation(self, instance):
+        # The authorized attachment endpoint, not the public /media/ path.
+        data = super().to_representation(instance)
+        if instance.attachment:
+            url = reverse("enquiries-ticket-attachment", kwargs={"ticket_id": instance.pk})
+            request = self.context.get("request")
+            data["attachment"] = request.build_absolute_uri(url) if request is not None else url
+        return data
+
+
 def get_attachment(self, obj):
     # Return only relative media path like "attachments/file.pdf"
     return obj.attachment.name if obj.attachment else None
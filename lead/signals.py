@@ -0,0 +1,120 @@
+from datetime import date
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from lead.models.enquiry import Enquiry
+from lead.models.enquiry_address import EnquiryAddress
+from lead.models.enquiry_images import EnquiryImages
+from lead.models.enquiry_loan_details import EnquiryLoanDetails
+from lead.models.enquiry_selfie import EnquirySelfie
+from lead.utils.enquiry_counters import (
+    apply_changes,
+    enquiry_is_deleted,
+    enquiry_keys_for,
+    followup_keys,
+    stored_enquiry_keys,
+)
+from lead.utils.enquiry_steps import mark_step_row
+from lead.utils.followup_logs import materialize_followup_logs
+
+# Keeps lead.EnquiryCounter in step with every Enquiry / EnquiryLoanDetails
+# save and delete. Queryset .update() and bulk writes bypass these; the
+# periodic `manage.py reconcile_enquiry_counters` run corrects that drift.
+
+
+@receiver(pre_save, sender=Enquiry)
+def remember_enquiry_counters(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance._counter_keys = stored_enquiry_keys(instance.pk) if instance.pk else []
+
+
+@receiver(post_save, sender=Enquiry)
+def update_enquiry_counters(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old_keys = getattr(instance, "_counter_keys", [])
+    new_keys = enquiry_keys_for(instance)
+    apply_changes(old_keys, new_keys)
+
+    # Follow-up counts are split by whether the enquiry is deleted.
+    was_deleted = old_keys[0][3] if old_keys else False
+    is_deleted = instance.deleted_at is not None
+    if old_keys and was_deleted != is_deleted:
+        dates = EnquiryLoanDetails.objects.filter(
+            enquiry_id=instance.pk, followup_pickup_date__isnull=False
+        ).values_list("followup_pickup_date", flat=True)
+        removed, added = [], []
+        for followup_date in dates:
+            removed += followup_keys(followup_date, was_deleted)
+            added += followup_keys(followup_date, is_deleted)
+        apply_changes(removed, added)
+
+
+@receiver(post_delete, sender=Enquiry)
+def remove_enquiry_counters(sender, instance, **kwargs):
+    apply_changes(enquiry_keys_for(instance), [])
+
+
+@receiver(pre_save, sender=EnquiryLoanDetails)
+def remember_followup_counters(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance._followup_state = None
+    if instance.pk:
+        instance._followup_state = (
+            EnquiryLoanDetails.objects.filter(pk=instance.pk)
+            .values_list("followup_pickup_date", "enquiry_id")
+            .first()
+        )
+
+
+@receiver(post_save, sender=EnquiryLoanDetails)
+def update_followup_counters(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old_date, old_enquiry_id = getattr(instance, "_followup_state", None) or (None, None)
+    new_date = instance.followup_pickup_date
+    if not old_date and not new_date:
+        return
+
+    removed = []
+    if old_date:
+        removed = followup_keys(old_date, enquiry_is_deleted(old_enquiry_id))
+    added = followup_keys(new_date, enquiry_is_deleted(instance.enquiry_id))
+    apply_changes(removed, added)
+
+    # The daily materialize_followup_logs run has already passed for a
+    # follow-up set to today or earlier, so log it now.
+    if new_date and new_date != old_date and new_date <= date.today():
+        enquiry_id = instance.enquiry_id
+        transaction.on_commit(
+            lambda: materialize_followup_logs(
+                new_date, since=new_date, enquiry_id=enquiry_id
+            )
+        )
+
+
+@receiver(post_delete, sender=EnquiryLoanDetails)
+def remove_followup_counters(sender, instance, **kwargs):
+    if instance.followup_pickup_date:
+        apply_changes(
+            followup_keys(
+                instance.followup_pickup_date, enquiry_is_deleted(instance.enquiry_id)
+            ),
+            [],
+        )
+
+
+# Enquiry.has_address / has_loan_details / has_images / has_selfie are set
+# by the first row of each step; bulk_create paths call mark_enquiry_step.
+@receiver(post_save, sender=EnquiryAddress)
+@receiver(post_save, sender=EnquiryLoanDetails)
+@receiver(post_save, sender=EnquiryImages)
+@receiver(post_save, sender=EnquirySelfie)
+def mark_enquiry_step_written(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    mark_step_row(instance)
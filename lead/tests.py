@@ -0,0 +1,96 @@
+import datetime
+
+from django.test import TestCase
+
+from auth_system.models.user import TblUser
+from ems.models.emp_basic_profile import TblEmpBasicProfile
+from lead.models.enquiry import Enquiry
+from lead.models.enquiry_address import EnquiryAddress
+from lead.models.enquiry_images import EnquiryImages
+from lead.models.enquiry_loan_details import EnquiryLoanDetails
+from lead.models.enquiry_selfie import EnquirySelfie
+from lead.models.product_type import ProductType
+from lead.serializers.enquiry_serializer import EnquirySerializer
+
+# Queries to render one page of EnquirySerializer(many=True), whatever its
+# size: the enquiries, six prefetches (nature of business, verification,
+# addresses, loan details with their lookups, images, selfies), creator
+# profiles and creator departments.
+ENQUIRY_PAGE_QUERIES = 9
+
+
+class EnquirySerializerQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        creators = []
+        for i in range(3):
+            profile = TblEmpBasicProfile.objects.create(
+                name=f"Employee {i}",
+                employee_code=f"EMP{i}",
+                email=f"employee{i}@example.com",
+                mobile_number=f"900000000{i}",
+                dob=datetime.date(1990, 1, 1),
+                gender="M",
+                created_by=1,
+            )
+            TblUser.objects.create(
+                id=profile.id,
+                full_name=f"Employee {i}",
+                email=f"user{i}@example.com",
+                mobile_number=f"800000000{i}",
+                employee_id=100 + i,
+            )
+            creators.append(profile.id)
+
+        product_type = ProductType.objects.create(name="Home Loan", created_by=1)
+        for n in range(30):
+            enquiry = Enquiry.objects.create(
+                name=f"Enquiry {n}",
+                mobile_number=f"70000000{n:02d}",
+                created_by=creators[n % len(creators)],
+            )
+            EnquiryAddress.objects.create(
+                enquiry=enquiry,
+                premises_type="Residence",
+                premises_status="Owned",
+                address="Address",
+                pincode="440001",
+                state="Maharashtra",
+                district="Nagpur",
+                area="Area",
+                created_by=1,
+            )
+            EnquiryLoanDetails.objects.create(
+                enquiry=enquiry, loan_type=product_type, created_by=1
+            )
+            EnquiryImages.objects.create(
+                enquiry=enquiry,
+                document_types=1,
+                premises_type="Residence",
+                media_file="enquiry_images/test.jpg",
+                created_by=1,
+            )
+            EnquirySelfie.objects.create(
+                enquiry=enquiry,
+                premises_type="Residence",
+                selfie="enquiry_selfies/test.jpg",
+                created_by=1,
+            )
+
+    def render_page(self, size):
+        return EnquirySerializer(Enquiry.objects.order_by("-id")[:size], many=True).data
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        for size in (10, 30):
+            with self.subTest(page_size=size):
+                with self.assertNumQueries(ENQUIRY_PAGE_QUERIES):
+                    data = self.render_page(size)
+                self.assertEqual(len(data), size)
+
+    def test_page_renders_nested_relations_and_creator(self):
+        row = self.render_page(10)[0]
+        self.assertEqual(row["created_by_code"], "EMP2")
+        self.assertEqual(len(row["enquiry_addresses"]), 1)
+        self.assertEqual(len(row["enquiry_loan_details"]), 1)
+        self.assertEqual(len(row["enquiry_images"]), 1)
+        self.assertEqual(len(row["enquiry_selfies"]), 1)
@@ -10,13 +10,13 @@ from lead.views.property_document_views import PropertyDocumentListCreateView, P
 
 from lead.views.loan_amount_range_views import LoanAmountRangeListCreateView, LoanAmountRangeDetailView
 
-from lead.views.enquirey_view import EnquiryListCreateAPIView, EnquiryDetailView, EnquiryExistingDataAPIView, EnquiryDraftAPIView, EnquiryTodayDraftAPIView
+from lead.views.enquirey_view import EnquiryListCreateAPIView, EnquiryDetailView, EnquiryExistingDataAPIView, EnquiryExistingDataAsyncAPIView, EnquiryDraftAPIView, EnquiryTodayDraftAPIView
 from lead.views.enquiry_address_view import EnquiryAddressCreateAPIView
 
 from lead.views.enquiry_loan_details_view import EnquiryLoanDetailsCreateAPIView
-from lead.views.enquiry_images_view import EnquiryImagesCreateAPIView, EnquiryImagesGetAPIView,EnquiryImagesDeleteAPIView,EnquiryImagesListAPIView
+from lead.views.enquiry_images_view import EnquiryImagesCreateAPIView, EnquiryImagesGetAPIView,EnquiryImagesDeleteAPIView,EnquiryImagesListAPIView, EnquiryImageFileAPIView
 
-from lead.views.enquiry_selfie_view import EnquirySelfieCreateAPIView, EnquirySelfieReplaceAPIView,  EnquirySelfieDeleteAPIView, EnquirySelfieListAPIView,  EnquirySelfieGetAPIView
+from lead.views.enquiry_selfie_view import EnquirySelfieCreateAPIView, EnquirySelfieReplaceAPIView,  EnquirySelfieDeleteAPIView, EnquirySelfieListAPIView,  EnquirySelfieGetAPIView, EnquirySelfieFileAPIView
 
 from lead.views.enquiry_verification_view import EnquiryVerificationCreateAPIView , otpVerificationAPIView,EnquiryVerificationCompleteAPIView
 
@@ -26,10 +26,11 @@ from lead.views.enquiry_followup import EnquiryFollowUpCountAPIView, FollowUpUpd
 
 from lead.views.enquiry_lead_assign_view import LeadAssignView, GetBranchAndFilterEmployeesAPIView, GetAssigned, GetAssignedCount
 
-from lead.views.enquiry_ticket_view import EnquiryTicketCreateAPIView, EnquiryTicketDetailAPIView
+from lead.views.enquiry_ticket_view import EnquiryTicketCreateAPIView, EnquiryTicketDetailAPIView, EnquiryTicketAttachmentAPIView
 from lead.views.enquiry_end_user_view import EnquiryEndUserCreateView, EnquiryEnduserDetailView
 
 from lead.views.enquiry_reports import EnquiryReportAPIView, EnquiryReportDownloadAPIView
+from lead.views.enquiry_upload_view import EnquiryUploadInitiateAPIView, EnquiryUploadAPIView, EnquiryUploadFinalizeAPIView
 
 urlpatterns = [
 
@@ -69,6 +70,7 @@ urlpatterns = [
 
     path("enquiries/<int:enquiry_id>/images/<int:image_id>", EnquiryImagesGetAPIView.as_view(), name="enquiry-images-get"),
     path("enquiries/<int:enquiry_id>/images", EnquiryImagesListAPIView.as_view(), name="enquiry-images-get-all"),
+    path("enquiries/<int:enquiry_id>/images/<int:image_id>/file/", EnquiryImageFileAPIView.as_view(), name="enquiry-images-file"),
 
     #Lead Selfie
     path("enquiries/<int:enquiry_id>/selfie/", EnquirySelfieCreateAPIView.as_view(), name="enquiry-selfie-create"),
@@ -77,8 +79,14 @@ urlpatterns = [
     path("enquiries/<int:enquiry_id>/delete-selfie/<int:selfie_id>/", EnquirySelfieDeleteAPIView.as_view(), name="enquiry-selfie-delete"),
 
     path("enquiries/<int:enquiry_id>/get-selfie/<int:selfie_id>/", EnquirySelfieGetAPIView.as_view(), name="enquiry-selfie-get"),
+    path("enquiries/<int:enquiry_id>/get-selfie/<int:selfie_id>/file/", EnquirySelfieFileAPIView.as_view(), name="enquiry-selfie-file"),
     path("enquiries/<int:enquiry_id>/get-all-selfie/", EnquirySelfieListAPIView.as_view(), name="enquiry-selfie-get-all"),
 
+    #Lead Resumable Uploads (images / selfies)
+    path("enquiries/<int:enquiry_id>/uploads/", EnquiryUploadInitiateAPIView.as_view(), name="enquiry-upload-initiate"),
+    path("enquiries/<int:enquiry_id>/uploads/<uuid:upload_id>/", EnquiryUploadAPIView.as_view(), name="enquiry-upload"),
+    path("enquiries/<int:enquiry_id>/uploads/<uuid:upload_id>/finalize/", EnquiryUploadFinalizeAPIView.as_view(), name="enquiry-upload-finalize"),
+
     #Lead Verification
     path("enquiries/<int:enquiry_id>/verification/", EnquiryVerificationCreateAPIView.as_view(), name="enquiry-verification-create"),
     path("enquiries/<int:enquiry_id>/otp_verification/", otpVerificationAPIView.as_view(), name="opt-verification"),
@@ -86,7 +94,15 @@ urlpatterns = [
     path("enquiries/<int:enquiry_id>/verification/complete/", EnquiryVerificationCompleteAPIView.as_view(), name="enquiry-verification-complete"),
 
     # path("enquiries/<int:enquiry_id>/skip_verification/", SkipMobileOtpAPIView.as_view(), name="skip-verification"),
-    path("enquiries/existing-data/", EnquiryExistingDataAPIView.as_view(), name="enquiry-existing-data"),
+    path(
+        "enquiries/existing-data/",
+        (
+            EnquiryExistingDataAsyncAPIView
+            if settings.MIS_ASYNC_VIEWS
+            else EnquiryExistingDataAPIView
+        ).as_view(),
+        name="enquiry-existing-data",
+    ),
 
     #Lead Configruation
     path("configruation/", ConfigurationListCreateAPIView.as_view(), name="configruation-list-create"),
@@ -114,6 +130,7 @@ urlpatterns = [
     #LEAD ENQUIRY TICKETS
     path("enquiries/ticket/", EnquiryTicketCreateAPIView.as_view(), name="enquiries-ticket-create"),
     path("enquiries/ticket/<int:ticket_id>/", EnquiryTicketDetailAPIView.as_view(), name="enquiries-ticket-get-by-id"),
+    path("enquiries/ticket/<int:ticket_id>/attachment/", EnquiryTicketAttachmentAPIView.as_view(), name="enquiries-ticket-attachment"),
     
      #END USER 
     path("enquiries/end-user/", EnquiryEndUserCreateView.as_view(), name="property-type-list-create"),
@@ -0,0 +1,289 @@
+from collections import Counter
+from datetime import datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from constants import EnquiryStatus
+
+from lead.models.enquiry import Enquiry
+from lead.models.enquiry_counter import EnquiryCounter
+from lead.models.enquiry_loan_details import EnquiryLoanDetails
+
+# Counter dimensions. Every enquiry adds one to its status, created_day,
+# created_month and (when assigned) assignee rows; every loan detail with a
+# follow-up date adds one to its followup_day row.
+STATUS = "status"
+ASSIGNEE = "assignee"
+CREATED_DAY = "created_day"
+CREATED_MONTH = "created_month"
+FOLLOWUP_DAY = "followup_day"
+
+# Follow-up rows are not split by enquiry status.
+ANY_STATUS = -1
+
+_created_at_field = Enquiry._meta.get_field("created_at")
+_followup_field = EnquiryLoanDetails._meta.get_field("followup_pickup_date")
+
+
+def _local_date(value):
+    if isinstance(value, str):
+        value = _created_at_field.to_python(value)
+    if not isinstance(value, datetime):
+        return value  # already a date (TruncDate)
+    if timezone.is_aware(value):
+        return timezone.localdate(value)
+    return value.date()
+
+
+def enquiry_keys(is_status, assign_to_id, created_at, is_deleted):
+    created = _local_date(created_at)
+    keys = [
+        (STATUS, "", is_status, is_deleted),
+        (CREATED_DAY, created.isoformat(), is_status, is_deleted),
+        (CREATED_MONTH, created.strftime("%Y-%m"), is_status, is_deleted),
+    ]
+    if assign_to_id:
+        keys.append((ASSIGNEE, str(assign_to_id), is_status, is_deleted))
+    return keys
+
+
+def enquiry_keys_for(enquiry):
+    return enquiry_keys(
+        int(enquiry.is_status),
+        enquiry.assign_to_id,
+        enquiry.created_at,
+        enquiry.deleted_at is not None,
+    )
+
+
+def stored_enquiry_keys(enquiry_id):
+    """Counter keys of the enquiry as currently saved in the database."""
+    row = (
+        Enquiry.objects.filter(pk=enquiry_id)
+        .values_list("is_status", "assign_to_id", "created_at", "deleted_at")
+        .first()
+    )
+    if not row:
+        return []
+    is_status, assign_to_id, created_at, deleted_at = row
+    return enquiry_keys(is_status, assign_to_id, created_at, deleted_at is not None)
+
+
+def followup_keys(followup_date, is_deleted):
+    followup_date = _followup_field.to_python(followup_date)
+    if not followup_date:
+        return []
+    return [(FOLLOWUP_DAY, followup_date.isoformat(), ANY_STATUS, is_deleted)]
+
+
+def enquiry_is_deleted(enquiry_id):
+    deleted_at = (
+        Enquiry.objects.filter(pk=enquiry_id).values_list("deleted_at", flat=True).first()
+    )
+    return deleted_at is not None
+
+
+def bump(key, delta):
+    dimension, counter_key, status, is_deleted = key
+    rows = EnquiryCounter.objects.filter(
+        dimension=dimension, key=counter_key, status=status, is_deleted=is_deleted
+    )
+    if rows.update(count=F("count") + delta, updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            EnquiryCounter.objects.create(
+                dimension=dimension,
+                key=counter_key,
+                status=status,
+                is_deleted=is_deleted,
+                count=delta,
+            )
+    except IntegrityError:
+        # Another writer created the row first.
+        rows.update(count=F("count") + delta, updated_at=timezone.now())
+
+
+def apply_changes(removed_keys, added_keys):
+    """Move counts from ``removed_keys`` to ``added_keys``; unchanged keys cost nothing."""
+    deltas = Counter(added_keys)
+    deltas.subtract(Counter(removed_keys))
+    # Sorted so concurrent writers lock counter rows in the same order.
+    for key, delta in sorted(deltas.items()):
+        if delta:
+            bump(key, delta)
+
+
+# --- reads ---
+def counter_sum(dimension, keys=None, statuses=None, deleted=False, key_from=None):
+    """
+    Sum of the matching counter rows. ``deleted=None`` counts soft-deleted
+    enquiries too; ``key_from`` selects keys >= it (ISO dates sort as text).
+    """
+    rows = EnquiryCounter.objects.filter(dimension=dimension)
+    if keys is not None:
+        rows = rows.filter(key__in=keys)
+    if key_from is not None:
+        rows = rows.filter(key__gte=key_from)
+    if statuses is not None:
+        rows = rows.filter(status__in=statuses)
+    if deleted is not None:
+        rows = rows.filter(is_deleted=deleted)
+    return rows.aggregate(total=Sum("count"))["total"] or 0
+
+
+def status_count(*statuses):
+    return counter_sum(STATUS, keys=[""], statuses=statuses)
+
+
+def created_on_count(day, *statuses):
+    return counter_sum(CREATED_DAY, keys=[day.isoformat()], statuses=statuses or None)
+
+
+def followups_on_count(day):
+    return counter_sum(FOLLOWUP_DAY, keys=[day.isoformat()])
+
+
+def assigned_count(assign_to_id):
+    return counter_sum(ASSIGNEE, keys=[str(assign_to_id)], deleted=None)
+
+
+def dashboard_counts(today):
+    """The AllCountAPIView numbers, from one read of the live counters."""
+    today_key = today.isoformat()
+    rows = EnquiryCounter.objects.filter(is_deleted=False).filter(
+        Q(dimension=STATUS)
+        | Q(dimension=CREATED_DAY, key=today_key)
+        | Q(dimension=CREATED_MONTH, key=today.strftime("%Y-%m"))
+        | Q(dimension=FOLLOWUP_DAY, key__gte=today_key)
+    )
+    by_status = {STATUS: Counter(), CREATED_DAY: Counter(), CREATED_MONTH: Counter()}
+    followups_today = followups_ahead = 0
+    for dimension, key, status, count in rows.values_list(
+        "dimension", "key", "status", "count"
+    ):
+        if dimension == FOLLOWUP_DAY:
+            followups_ahead += count
+            if key == today_key:
+                followups_today += count
+        else:
+            by_status[dimension][status] += count
+
+    statuses = by_status[STATUS]
+    return {
+        "total_enquiries_count": sum(
+            statuses[s]
+            for s in (
+                EnquiryStatus.ACTIVE,
+                EnquiryStatus.CLOSED,
+                EnquiryStatus.REJECT,
+                EnquiryStatus.RE_OPEN,
+            )
+        ),
+        "total_followup_count": followups_ahead,
+        "total_active_count": statuses[EnquiryStatus.ACTIVE],
+        "total_closed_count": statuses[EnquiryStatus.CLOSED] + statuses[EnquiryStatus.REJECT],
+        "total_draft_count": statuses[EnquiryStatus.DRAFT],
+        "today_draft_count": by_status[CREATED_DAY][EnquiryStatus.DRAFT],
+        "today_followup_count": followups_today,
+        "today_created_count": by_status[CREATED_DAY][EnquiryStatus.ACTIVE],
+        "current_month_count": sum(by_status[CREATED_MONTH].values()),
+    }
+
+
+# --- reconciliation ---
+def compute_counters(enquiry_model=Enquiry, loan_details_model=EnquiryLoanDetails):
+    """Recount every counter from Enquiry / EnquiryLoanDetails with GROUP BY."""
+    expected = Counter()
+    enquiries = (
+        enquiry_model.objects.annotate(
+            created_day=TruncDate("created_at"),
+            is_deleted=ExpressionWrapper(
+                Q(deleted_at__isnull=False), output_field=BooleanField()
+            ),
+        )
+        .values("is_status", "assign_to_id", "created_day", "is_deleted")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in enquiries:
+        for key in enquiry_keys(
+            row["is_status"], row["assign_to_id"], row["created_day"], row["is_deleted"]
+        ):
+            expected[key] += row["total"]
+
+    followups = (
+        loan_details_model.objects.filter(followup_pickup_date__isnull=False)
+        .annotate(
+            is_deleted=ExpressionWrapper(
+                Q(enquiry__deleted_at__isnull=False), output_field=BooleanField()
+            )
+        )
+        .values("followup_pickup_date", "is_deleted")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in followups:
+        for key in followup_keys(row["followup_pickup_date"], row["is_deleted"]):
+            expected[key] += row["total"]
+    return expected
+
+
+def reconcile_counters(dry_run=False, apps=None):
+    """
+    Bring the counters back in line with the source tables and return the
+    drift found as {key: expected - stored}. ``apps`` is the historical app
+    registry when this runs from a data migration.
+    """
+    enquiry_model, loan_details_model, counter_model = (
+        Enquiry,
+        EnquiryLoanDetails,
+        EnquiryCounter,
+    )
+    if apps:
+        enquiry_model = apps.get_model("lead", "Enquiry")
+        loan_details_model = apps.get_model("lead", "EnquiryLoanDetails")
+        counter_model = apps.get_model("lead", "EnquiryCounter")
+
+    with transaction.atomic():
+        expected = compute_counters(enquiry_model, loan_details_model)
+        stored = {
+            (row.dimension, row.key, row.status, row.is_deleted): row
+            for row in counter_model.objects.select_for_update()
+        }
+        drift = {}
+        for key in set(expected) | set(stored):
+            stored_count = stored[key].count if key in stored else 0
+            if expected.get(key, 0) != stored_count:
+                drift[key] = expected.get(key, 0) - stored_count
+        if dry_run or not drift:
+            return drift
+
+        now = timezone.now()
+        to_update, to_create, to_delete = [], [], []
+        for key in drift:
+            count = expected.get(key, 0)
+            if key not in stored:
+                dimension, counter_key, status, is_deleted = key
+                to_create.append(
+                    counter_model(
+                        dimension=dimension,
+                        key=counter_key,
+                        status=status,
+                        is_deleted=is_deleted,
+                        count=count,
+                    )
+                )
+            elif count:
+                stored[key].count = count
+                stored[key].updated_at = now
+                to_update.append(stored[key])
+            else:
+                to_delete.append(stored[key].pk)
+        counter_model.objects.bulk_update(to_update, ["count", "updated_at"], batch_size=1000)
+        counter_model.objects.bulk_create(to_create, batch_size=1000)
+        counter_model.objects.filter(pk__in=to_delete).delete()
+    return drift
@@ -0,0 +1,332 @@
+import csv
+import tempfile
+from datetime import date
+
+from django.db.models import Q
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date
+
+from auth_system.models.user import TblUser
+from auth_system.utils.export_jobs import iter_with_progress, write_export_file
+from constants import ENQUIRY_TYPE_CHOICES, EMAIL_STATUS_CHOICES, MOBILE_STATUS_CHOICES
+from constants import PercentageStatus
+from ems.models.branch import TblBranch
+from lead.models.enquiry import Enquiry
+from lead.models.enquiry_loan_details import EnquiryLoanDetails
+from lead.models.enquiry_verifications import EnquiryVerification
+from lead.models.nature_of_business import NatureOfBusiness
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMAT_XLSX = "xlsx"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMATS = (EXPORT_FORMAT_XLSX, EXPORT_FORMAT_CSV)
+
+ENQUIRY_REPORT_COLUMNS = [
+    "Unique Code",
+    "Survey Date",
+    "Branch Name",
+    "Product",
+    "Employee Name",
+    "Employee Code",
+    "Customer Name",
+    "Business Name",
+    "Business Place",
+    "Nature of Business",
+    "Customer Contact",
+    "Interested",
+    "KYC Collected",
+    "Loan Demand",
+    "Property Type",
+    "Property Value",
+    "Loan Required On",
+    "Enquiry Type",
+    "Remark",
+    "Verification Mobile",
+    "Verification Mobile Status",
+    "Verification Email",
+    "Verification Email Status",
+    "Aadhaar",
+    "Aadhaar Verified",
+    # --- step completion columns ---
+    "Basic Step",
+    "Address Step",
+    "Verification Step",
+    "Loan Detail Step",
+    "Image Step",
+    "Selfie Step",
+]
+
+STEP_COLUMNS = {
+    PercentageStatus.ENQUIRY_BASIC: "Basic Step",
+    PercentageStatus.ENQUIRY_ADDRESS: "Address Step",
+    PercentageStatus.ENQUIRY_VERIFICATION: "Verification Step",
+    PercentageStatus.ENQUIRY_LOAN_DETAILS: "Loan Detail Step",
+    PercentageStatus.ENQUIRY_IMAGE: "Image Step",
+    PercentageStatus.ENQUIRY_SELFIE: "Selfie Step",
+}
+
+MOBILE_STATUS_LABELS = dict(MOBILE_STATUS_CHOICES)
+EMAIL_STATUS_LABELS = dict(EMAIL_STATUS_CHOICES)
+ENQUIRY_TYPE_LABELS = dict(ENQUIRY_TYPE_CHOICES)
+
+ENQUIRY_EXPORT_FIELDS = [
+    "id",
+    "unique_code",
+    "created_at",
+    "created_by",
+    "name",
+    "business_name",
+    "business_place",
+    "nature_of_business_id",
+    "mobile_number",
+    "interested",
+    "kyc_collected",
+    "is_steps",
+]
+
+
+def get_enquiry_report_filters(data):
+    """Build the report Q filter from request data; returns (filters, error)."""
+    to_date = data.get("to_date")
+    from_date = data.get("from_date")
+    employee_id = data.get("employee_id")
+    assign_to = data.get("assign_to")
+    status_val = data.get("status")
+
+    filters = Q()
+    if from_date and not to_date:
+        return None, "Please select 'to_date' when using 'from_date'."
+
+    if to_date:
+        to_date = parse_date(to_date)
+        if not to_date:
+            return None, "Invalid 'to_date' format. Use YYYY-MM-DD."
+        if from_date:
+            from_date = parse_date(from_date)
+            if not from_date:
+                return None, "Invalid 'from_date' format. Use YYYY-MM-DD."
+            filters &= Q(created_at__date__range=[from_date, to_date])
+        else:
+            filters &= Q(created_at__date=to_date)
+
+    if employee_id:
+        filters &= Q(created_by=employee_id)
+    if assign_to:
+        filters &= Q(assign_to=assign_to)
+
+    if status_val not in (None, ""):
+        try:
+            status_val = int(status_val)
+        except (TypeError, ValueError):
+            return None, "Invalid 'status'. Use a numeric status."
+        if status_val == 5:
+            filters &= Q(is_status=0, created_at__date=date.today())
+        elif status_val == 4:
+            enquiry_ids = EnquiryLoanDetails.objects.filter(
+                followup_pickup_date=date.today()
+            ).values_list("enquiry_id", flat=True)
+            filters &= Q(id__in=enquiry_ids)
+        else:
+            filters &= Q(is_status=status_val)
+
+    return filters, None
+
+
+def _iter_chunks(queryset, chunk_size):
+    """Keyset-paginate ``queryset`` newest first, ``chunk_size`` rows at a time."""
+    last_id = None
+    while True:
+        qs = queryset.order_by("-id")
+        if last_id is not None:
+            qs = qs.filter(id__lt=last_id)
+        chunk = list(qs.values(*ENQUIRY_EXPORT_FIELDS)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]["id"]
+
+
+def _load_chunk_maps(chunk):
+    enquiry_ids = [row["id"] for row in chunk]
+    user_ids = {row["created_by"] for row in chunk if row["created_by"]}
+    nob_ids = {row["nature_of_business_id"] for row in chunk if row["nature_of_business_id"]}
+
+    users = {
+        u["id"]: u
+        for u in TblUser.objects.filter(id__in=user_ids).values(
+            "id", "full_name", "employee_code", "branch_id"
+        )
+    }
+    branch_ids = {u["branch_id"] for u in users.values() if u["branch_id"]}
+    branches = dict(
+        TblBranch.objects.filter(id__in=branch_ids).values_list("id", "branch_name")
+    )
+    natures = dict(
+        NatureOfBusiness.objects.filter(id__in=nob_ids).values_list("id", "name")
+    )
+    verifications = {
+        v["enquiry_id"]: v
+        for v in EnquiryVerification.objects.filter(enquiry_id__in=enquiry_ids).values(
+            "enquiry_id",
+            "mobile",
+            "mobile_status",
+            "email",
+            "email_status",
+            "aadhaar",
+            "aadhaar_verified",
+        )
+    }
+    # The report shows the first loan detail row of each enquiry.
+    loans = {}
+    for loan in (
+        EnquiryLoanDetails.objects.filter(enquiry_id__in=enquiry_ids)
+        .order_by("enquiry_id", "id")
+        .values(
+            "enquiry_id",
+            "loan_type__name",
+            "loan_amount_range_id",
+            "loan_amount_range__loan_amount_from",
+            "loan_amount_range__loan_amount_to",
+            "property_type__name",
+            "property_value",
+            "followup_pickup_date",
+            "enquiry_type",
+            "remark",
+        )
+    ):
+        loans.setdefault(loan["enquiry_id"], loan)
+    return users, branches, natures, verifications, loans
+
+
+def _build_row(enquiry, users, branches, natures, verifications, loans):
+    user = users.get(enquiry["created_by"])
+    verification = verifications.get(enquiry["id"])
+    loan = loans.get(enquiry["id"])
+    step_val = enquiry["is_steps"] or 0
+
+    row = {
+        "Unique Code": enquiry["unique_code"],
+        "Survey Date": (
+            enquiry["created_at"].strftime("%Y-%m-%d") if enquiry["created_at"] else None
+        ),
+        "Branch Name": branches.get(user["branch_id"]) if user else None,
+        "Employee Name": user["full_name"] if user else None,
+        "Employee Code": user["employee_code"] if user else None,
+        "Customer Name": enquiry["name"],
+        "Business Name": enquiry["business_name"],
+        "Business Place": enquiry["business_place"],
+        "Nature of Business": natures.get(enquiry["nature_of_business_id"]),
+        "Customer Contact": enquiry["mobile_number"],
+        "Interested": "Yes" if enquiry["interested"] else "No",
+        "KYC Collected": "Yes" if enquiry["kyc_collected"] else "No",
+        "Verification Mobile": (verification or {}).get("mobile") or "NA",
+        "Verification Mobile Status": (
+            MOBILE_STATUS_LABELS.get(verification["mobile_status"]) if verification else None
+        )
+        or "NA",
+        "Verification Email": (verification or {}).get("email") or "NA",
+        "Verification Email Status": (
+            EMAIL_STATUS_LABELS.get(verification["email_status"]) if verification else None
+        )
+        or "NA",
+        "Aadhaar": (verification or {}).get("aadhaar") or "NA",
+        "Aadhaar Verified": (
+            ("Yes" if verification["aadhaar_verified"] else "No")
+            if verification
+            else "NA"
+        ),
+    }
+    for step_num, column in STEP_COLUMNS.items():
+        row[column] = "Done" if step_num <= step_val else "Not Done"
+
+    if loan:
+        amount_from = loan["loan_amount_range__loan_amount_from"]
+        amount_to = loan["loan_amount_range__loan_amount_to"]
+        row.update(
+            {
+                "Product": loan["loan_type__name"],
+                "Loan Demand": (
+                    f"{amount_from} - {amount_to}"
+                    if loan["loan_amount_range_id"]
+                    else None
+                ),
+                "Property Type": loan["property_type__name"],
+                "Property Value": (
+                    str(loan["property_value"])
+                    if loan["property_value"] is not None
+                    else None
+                ),
+                "Loan Required On": (
+                    loan["followup_pickup_date"].isoformat()
+                    if loan["followup_pickup_date"]
+                    else None
+                ),
+                "Enquiry Type": ENQUIRY_TYPE_LABELS.get(loan["enquiry_type"]),
+                "Remark": loan["remark"],
+            }
+        )
+    return [row.get(column) for column in ENQUIRY_REPORT_COLUMNS]
+
+
+def iter_enquiry_report_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield report rows (lists in ENQUIRY_REPORT_COLUMNS order), resolving
+    users, branches, verifications and loans once per chunk so memory use
+    does not grow with the size of the report.
+    """
+    for chunk in _iter_chunks(queryset, chunk_size):
+        maps = _load_chunk_maps(chunk)
+        for enquiry in chunk:
+            yield _build_row(enquiry, *maps)
+
+
+class _Echo:
+    """File-like object whose write() just returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def stream_enquiry_report_csv(queryset, filename="enquiries_report.csv"):
+    writer = csv.writer(_Echo())
+
+    def rows():
+        yield writer.writerow(ENQUIRY_REPORT_COLUMNS)
+        for row in iter_enquiry_report_rows(queryset):
+            yield writer.writerow(["" if value is None else value for value in row])
+
+    response = StreamingHttpResponse(rows(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def stream_enquiry_report_xlsx(queryset, filename="enquiries_report.xlsx"):
+    # openpyxl's write-only mode spools rows to disk, and the finished file is
+    # streamed back in blocks, so neither step holds the report in memory.
+    spool = tempfile.TemporaryFile(suffix=".xlsx")
+    write_export_file(
+        ENQUIRY_REPORT_COLUMNS,
+        iter_enquiry_report_rows(queryset),
+        EXPORT_FORMAT_XLSX,
+        spool,
+    )
+    spool.seek(0)
+    return FileResponse(
+        spool,
+        as_attachment=True,
+        filename=filename,
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+def run_enquiry_report_export(params, export_format, target_path, progress):
+    """Background export job handler for EnquiryReportDownloadAPIView."""
+    filters, error = get_enquiry_report_filters(params)
+    if error:
+        raise ValueError(error)
+    enquiries = Enquiry.objects.filter(filters)
+    rows = iter_with_progress(
+        iter_enquiry_report_rows(enquiries), enquiries.count(), progress
+    )
+    write_export_file(ENQUIRY_REPORT_COLUMNS, rows, export_format, target_path)
@@ -0,0 +1,85 @@
+from django.db import transaction
+
+from lead.models.enquiry import STEP_FLAG_FIELDS, Enquiry
+from lead.models.enquiry_address import EnquiryAddress
+from lead.models.enquiry_images import EnquiryImages
+from lead.models.enquiry_loan_details import EnquiryLoanDetails
+from lead.models.enquiry_selfie import EnquirySelfie
+from lead.utils.image_renditions import queue_renditions
+
+# Step row model -> Enquiry flag set once the enquiry has such a row.
+STEP_FLAGS = {
+    EnquiryAddress: "has_address",
+    EnquiryLoanDetails: "has_loan_details",
+    EnquiryImages: "has_images",
+    EnquirySelfie: "has_selfie",
+}
+
+
+def mark_enquiry_step(enquiry, flag):
+    """
+    Set ``flag`` on ``enquiry`` (an Enquiry or its id) in the database and,
+    for an instance, in memory. A no-op UPDATE when it is already set.
+    """
+    if isinstance(enquiry, Enquiry):
+        if getattr(enquiry, flag):
+            return
+        setattr(enquiry, flag, True)
+        enquiry_id = enquiry.pk
+    else:
+        enquiry_id = enquiry
+    Enquiry.objects.filter(pk=enquiry_id, **{flag: False}).update(**{flag: True})
+
+
+def mark_step_row(instance):
+    """Flag the enquiry of a newly written step row (see lead.signals)."""
+    flag = STEP_FLAGS[type(instance)]
+    field = type(instance)._meta.get_field("enquiry")
+    # The view's own Enquiry instance when the row was saved with it, so
+    # its completion check sees the flag without a reload.
+    enquiry = instance.enquiry if field.is_cached(instance) else instance.enquiry_id
+    mark_enquiry_step(enquiry, flag)
+
+
+def enquiry_steps_complete(enquiry):
+    """Every data step (address, loan details, images, selfie) has a row."""
+    return all(getattr(enquiry, flag) for flag in STEP_FLAG_FIELDS)
+
+
+def validate_media_files(serializer_class, file_field, data, files):
+    """
+    One validated serializer per file, sharing the other form fields of
+    ``data``. Returns (serializers, None), or (None, (index, errors)) for the
+    first invalid file so nothing is written.
+    """
+    fields = {key: value for key, value in data.items() if key != file_field}
+    serializers = []
+    for index, upload in enumerate(files):
+        # None leaves the field out, so a missing file reads "required".
+        serializer = serializer_class(
+            data=fields if upload is None else {**fields, file_field: upload}
+        )
+        if not serializer.is_valid():
+            return None, (index, serializer.errors)
+        serializers.append(serializer)
+    return serializers, None
+
+
+def bulk_create_media(enquiry, model, serializers, user_id):
+    """
+    Insert the validated images / selfies of ``serializers`` for ``enquiry``
+    with one bulk_create (files are stored by the fields' pre_save), flag
+    the step, and queue their renditions. Returns the new rows.
+    """
+    rows = []
+    for serializer in serializers:
+        row = model(enquiry=enquiry, created_by=user_id, **serializer.validated_data)
+        row.stamp_capture()
+        rows.append(row)
+
+    with transaction.atomic():
+        rows = model.objects.bulk_create(rows)
+        # bulk_create sends no post_save, so flag the step here.
+        mark_enquiry_step(enquiry, STEP_FLAGS[model])
+    queue_renditions(*rows)
+    return rows
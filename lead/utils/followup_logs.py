@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from lead.models.enquiry import Enquiry
+from lead.models.enquiry_loan_details import EnquiryLoanDetails
+from lead.models.lead_logs import LeadLog
+
+FOLLOWUP_SCHEDULED_STATUS = "Follow-up Scheduled"
+
+DEFAULT_FOLLOWUP_LOG_SETTINGS = {
+    # A run also covers follow-ups up to this many days before its date, so
+    # a missed run is caught up without logging every historical follow-up.
+    "LOOKBACK_DAYS": 3,
+}
+
+
+def get_followup_log_settings():
+    conf = dict(DEFAULT_FOLLOWUP_LOG_SETTINGS)
+    conf.update(getattr(settings, "FOLLOWUP_LOGS", {}) or {})
+    return conf
+
+
+def _column(model, field_name):
+    return connection.ops.quote_name(model._meta.get_field(field_name).column)
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def materialize_followup_logs(day, since=None, enquiry_id=None):
+    """
+    Add the "Follow-up Scheduled" LeadLog for every live enquiry with a
+    follow-up between ``since`` (default: LOOKBACK_DAYS before ``day``) and
+    ``day`` that has never had one. Runs one INSERT ... SELECT per pending
+    follow-up date; ``enquiry_id`` limits it to one enquiry. Returns the
+    number of logs created.
+    """
+    if since is None:
+        since = day - timedelta(days=get_followup_log_settings()["LOOKBACK_DAYS"])
+    pending = EnquiryLoanDetails.objects.filter(
+        followup_pickup_date__range=(since, day), enquiry__deleted_at__isnull=True
+    ).exclude(enquiry__leadlog__status=FOLLOWUP_SCHEDULED_STATUS)
+    if enquiry_id is not None:
+        pending = pending.filter(enquiry_id=enquiry_id)
+
+    created = 0
+    with transaction.atomic():
+        dates = pending.values_list("followup_pickup_date", flat=True).distinct()
+        for followup_date in sorted(dates):
+            created += _insert_followup_logs(followup_date, enquiry_id)
+    return created
+
+
+def _insert_followup_logs(day, enquiry_id):
+    log, loan, enquiry = LeadLog, EnquiryLoanDetails, Enquiry
+    enquiry_filter = ""
+    if enquiry_id is not None:
+        enquiry_filter = f"AND l.{_column(loan, 'enquiry')} = %s"
+    sql = f"""
+        INSERT INTO {_table(log)} (
+            {_column(log, "enquiry")}, {_column(log, "status")},
+            {_column(log, "remark")}, {_column(log, "created_by")},
+            {_column(log, "created_at")}, {_column(log, "updated_by")},
+            {_column(log, "deleted_by")}
+        )
+        SELECT DISTINCT l.{_column(loan, "enquiry")}, %s, %s, 0, %s, 0, 0
+        FROM {_table(loan)} l
+        JOIN {_table(enquiry)} e ON e.{_column(enquiry, "id")} = l.{_column(loan, "enquiry")}
+        WHERE l.{_column(loan, "followup_pickup_date")} = %s
+          AND e.{_column(enquiry, "deleted_at")} IS NULL
+          {enquiry_filter}
+          AND NOT EXISTS (
+              SELECT 1 FROM {_table(log)} g
+              WHERE g.{_column(log, "enquiry")} = l.{_column(loan, "enquiry")}
+                AND g.{_column(log, "status")} = %s
+          )
+    """
+    params = [
+        FOLLOWUP_SCHEDULED_STATUS,
+        f"Follow-up scheduled for {day}",
+        timezone.now(),
+        day,
+        *([enquiry_id] if enquiry_id is not None else []),
+        FOLLOWUP_SCHEDULED_STATUS,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
@@ -0,0 +1,286 @@
+import io
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError
+
+from lead.models.enquiry_images import EnquiryImages
+from lead.models.enquiry_selfie import EnquirySelfie
+
+logger = logging.getLogger(__name__)
+
+MODE_THREAD = "thread"
+MODE_SYNC = "sync"
+MODE_OFF = "off"
+
+DEFAULT_IMAGE_RENDITION_SETTINGS = {
+    # "thread": a pool in the web process after commit; "sync": inside the
+    # request; "off": leave it to `manage.py process_enquiry_media`.
+    "MODE": MODE_THREAD,
+    "THREADS": 2,
+    # The stored original is re-encoded to fit in MAX_DIMENSION px at QUALITY.
+    "MAX_DIMENSION": 2048,
+    "QUALITY": 82,
+    # name -> [longest side in px, JPEG quality]
+    "SIZES": {
+        "thumbnail": [320, 70],
+        "preview": [1024, 78],
+    },
+}
+
+# kind -> (model, file field)
+MEDIA_MODELS = {
+    "image": (EnquiryImages, "media_file"),
+    "selfie": (EnquirySelfie, "selfie"),
+}
+
+# kind -> (URL name, id kwarg) of the authorized file endpoint
+MEDIA_FILE_URLS = {
+    "image": ("enquiry-images-file", "image_id"),
+    "selfie": ("enquiry-selfie-file", "selfie_id"),
+}
+
+RENDITIONS_DIR = "renditions"
+
+
+def get_image_rendition_settings():
+    conf = dict(DEFAULT_IMAGE_RENDITION_SETTINGS)
+    conf.update(getattr(settings, "IMAGE_RENDITIONS", {}) or {})
+    return conf
+
+
+def media_kind(instance):
+    for kind, (model, _) in MEDIA_MODELS.items():
+        if isinstance(instance, model):
+            return kind
+    raise ValueError(f"No renditions for {type(instance).__name__}")
+
+
+def encode_jpeg(image, quality):
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def fit(image, max_dimension):
+    if max(image.size) <= max_dimension:
+        return image
+    image = image.copy()
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    return image
+
+
+def load_normalized(storage, name, max_dimension):
+    """
+    Decode ``name`` upright and in RGB. Returns (image, changed, size in
+    bytes) where ``changed`` means the stored bytes are not already an
+    upright JPEG within ``max_dimension``; None when it is not an image.
+    """
+    with storage.open(name, "rb") as f:
+        data = f.read()
+    try:
+        image = Image.open(io.BytesIO(data))
+        source_format = image.format
+        source_size = image.size
+        # JPEG can decode straight at a reduced scale, which is most of the
+        # cost for a 12 MP phone photo.
+        image.draft("RGB", (max_dimension, max_dimension))
+        image.load()
+    except (UnidentifiedImageError, OSError):
+        return None
+
+    # exif_transpose() returns a copy even when there is nothing to rotate,
+    # so read the tag itself.
+    rotated = image.getexif().get(ExifTags.Base.Orientation, 1) != 1
+    changed = rotated or source_format != "JPEG"
+    if rotated:
+        image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+    if max(source_size) > max_dimension:
+        changed = True
+    return image, changed, len(data)
+
+
+def process_media(kind, pk, conf=None):
+    """
+    Re-encode one stored image and write its renditions. The original file
+    is replaced only when that makes it smaller or fixes its orientation /
+    format; files Pillow cannot read (PDFs) are marked skipped.
+    """
+    conf = conf or get_image_rendition_settings()
+    model, field_name = MEDIA_MODELS[kind]
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    field = getattr(instance, field_name)
+    if not field:
+        return None
+    storage = field.storage
+    old_name = field.name
+
+    loaded = load_normalized(storage, old_name, conf["MAX_DIMENSION"])
+    if loaded is None:
+        model.objects.filter(pk=pk, **{field_name: old_name}).update(
+            renditions={"skipped": True}, processed_at=timezone.now()
+        )
+        return None
+    image, changed, original_bytes = loaded
+
+    directory, filename = os.path.split(old_name)
+    stem = os.path.splitext(filename)[0]
+    written = []
+    new_name = old_name
+
+    master = fit(image, conf["MAX_DIMENSION"])
+    master_bytes = encode_jpeg(master, conf["QUALITY"])
+    if changed or len(master_bytes) < original_bytes * 0.9:
+        # A fresh name, so the old file stays valid until the row points away.
+        stem = uuid.uuid4().hex
+        new_name = storage.save(os.path.join(directory, f"{stem}.jpg"), ContentFile(master_bytes))
+        written.append(new_name)
+
+    renditions = {
+        "width": master.width,
+        "height": master.height,
+        "bytes": len(master_bytes) if new_name != old_name else original_bytes,
+        "original_bytes": original_bytes,
+    }
+    for rendition, (max_dimension, quality) in conf["SIZES"].items():
+        path = storage.save(
+            os.path.join(directory, RENDITIONS_DIR, f"{stem}_{rendition}.jpg"),
+            ContentFile(encode_jpeg(fit(master, max_dimension), quality)),
+        )
+        written.append(path)
+        renditions[rendition] = path
+
+    # Only if the row still points at the file we read (a replace may have
+    # raced with us).
+    updated = model.objects.filter(pk=pk, **{field_name: old_name}).update(
+        **{field_name: new_name},
+        renditions=renditions,
+        processed_at=timezone.now(),
+    )
+    if not updated:
+        for path in written:
+            storage.delete(path)
+        return None
+
+    # Renditions of an earlier run (re-processing with --force). In the
+    # media store an identical rendition is the same blob and delete() only
+    # drops the old reference to it; new plain files never reuse a name.
+    for path in (instance.renditions or {}).values():
+        if isinstance(path, str):
+            storage.delete(path)
+    if new_name != old_name:
+        storage.delete(old_name)
+    return renditions
+
+
+def delete_media_files(instance):
+    """Delete the stored file of ``instance`` and every rendition of it."""
+    _, field_name = MEDIA_MODELS[media_kind(instance)]
+    field = getattr(instance, field_name)
+    storage = field.storage
+    for path in (instance.renditions or {}).values():
+        if isinstance(path, str) and storage.exists(path):
+            storage.delete(path)
+    if field and storage.exists(field.name):
+        field.delete(save=False)
+
+
+def media_url(instance, rendition=None, request=None):
+    """
+    URL of the authorized file endpoint for ``instance`` (never the public
+    /media/ path), asking for ``rendition`` once it has been written.
+    """
+    kind = media_kind(instance)
+    _, field_name = MEDIA_MODELS[kind]
+    if not getattr(instance, field_name):
+        return None
+    url_name, id_kwarg = MEDIA_FILE_URLS[kind]
+    url = reverse(url_name, kwargs={"enquiry_id": instance.enquiry_id, id_kwarg: instance.pk})
+    if rendition and isinstance((instance.renditions or {}).get(rendition), str):
+        url += f"?rendition={rendition}"
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def rendition_url(instance, rendition, request=None):
+    """URL of ``rendition``, or of the stored file until it is processed."""
+    return media_url(instance, rendition, request)
+
+
+class RenditionPool:
+    """Runs process_media off the request thread, one pool per process."""
+
+    def __init__(self, conf=None):
+        self.conf = conf or get_image_rendition_settings()
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Threads do not survive a fork, so start the pool per worker pid.
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.conf["THREADS"],
+                    thread_name_prefix="image-renditions",
+                )
+        return self._executor
+
+    def _run(self, kind, pk):
+        try:
+            process_media(kind, pk, self.conf)
+        except Exception:
+            logger.exception("Processing %s #%s failed", kind, pk)
+        finally:
+            close_old_connections()
+
+    def submit(self, kind, pk):
+        mode = self.conf["MODE"]
+        if mode == MODE_SYNC:
+            self._run(kind, pk)
+        elif mode == MODE_THREAD:
+            self._get_executor().submit(self._run, kind, pk)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_rendition_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = RenditionPool()
+    return _pool
+
+
+def queue_renditions(*instances):
+    """Process the given EnquiryImages / EnquirySelfie rows after commit."""
+    jobs = [(media_kind(instance), instance.pk) for instance in instances]
+
+    def submit():
+        pool = get_rendition_pool()
+        for kind, pk in jobs:
+            pool.submit(kind, pk)
+
+    transaction.on_commit(submit)
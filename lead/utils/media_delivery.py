@@ -0,0 +1,191 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from lead.utils.image_renditions import get_image_rendition_settings
+from lead.utils.media_store import ContentAddressedStorage
+
+MODE_ACCEL = "accel"
+MODE_SENDFILE = "sendfile"
+MODE_PYTHON = "python"
+
+DEFAULT_PROTECTED_MEDIA_SETTINGS = {
+    # "accel": nginx X-Accel-Redirect to ACCEL_PREFIX + name;
+    # "sendfile": X-Sendfile with the absolute path (Apache / lighttpd);
+    # "python": served here, with os.sendfile under gunicorn.
+    "MODE": MODE_PYTHON,
+    # nginx `internal` location aliased to MEDIA_ROOT.
+    "ACCEL_PREFIX": "/protected-media/",
+    "CACHE_CONTROL": "private, no-cache",
+    # Bytes per read when the server has no wsgi.file_wrapper.
+    "BLOCK_SIZE": 64 * 1024,
+}
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def get_protected_media_settings():
+    conf = dict(DEFAULT_PROTECTED_MEDIA_SETTINGS)
+    conf.update(getattr(settings, "PROTECTED_MEDIA", {}) or {})
+    return conf
+
+
+def media_etag(storage, name, stat):
+    """
+    Strong ETag: the content hash for media store blobs, otherwise
+    modification time and size (as nginx does).
+    """
+    if isinstance(storage, ContentAddressedStorage) and storage.is_blob(name):
+        return quote_etag(storage.blob_sha(name))
+    return quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to send the
+    whole file (no / multiple / malformed ranges), or False when it cannot
+    be satisfied.
+    """
+    match = RANGE_RE.match(header.replace(" ", ""))
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if size == 0:
+        return False
+    if not first:
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+class FileRange:
+    """
+    ``length`` bytes of an open file from its current position. Keeps
+    fileno() so gunicorn's wsgi.file_wrapper can os.sendfile() exactly the
+    range (it sends Content-Length bytes from the file position).
+    """
+
+    def __init__(self, f, length):
+        self.f = f
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.f.fileno()
+
+    def close(self):
+        self.f.close()
+
+
+def serve_media(request, field, rendition=None):
+    """
+    Response delivering ``field`` (a FieldFile), or its ``rendition`` when it
+    has one, to a request that has already been authorized.
+    """
+    if not field:
+        raise Http404("No file.")
+    storage = field.storage
+    name = field.name
+    if rendition:
+        sizes = get_image_rendition_settings()["SIZES"]
+        if rendition not in sizes:
+            return Response({
+                "success": False,
+                "message": f"rendition must be one of: {', '.join(sizes)}.",
+            }, status=status.HTTP_400_BAD_REQUEST)
+        # The original until the rendition has been written.
+        path = (getattr(field.instance, "renditions", None) or {}).get(rendition)
+        if isinstance(path, str):
+            name = path
+
+    conf = get_protected_media_settings()
+    path = storage.path(name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404("File not found.")
+
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    filename = os.path.basename(name)
+
+    if conf["MODE"] in (MODE_ACCEL, MODE_SENDFILE):
+        # The proxy does Range, conditional requests and the copy itself.
+        response = HttpResponse(content_type=content_type)
+        if conf["MODE"] == MODE_ACCEL:
+            response["X-Accel-Redirect"] = conf["ACCEL_PREFIX"].rstrip("/") + "/" + quote(name)
+        else:
+            response["X-Sendfile"] = path
+        response["Content-Disposition"] = f'inline; filename="{filename}"'
+        response["Cache-Control"] = conf["CACHE_CONTROL"]
+        return response
+
+    etag = media_etag(storage, name, stat)
+    size = stat.st_size
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": conf["CACHE_CONTROL"],
+    }
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        tags = parse_etags(if_none_match)
+        # Weak comparison, as If-None-Match requires.
+        if "*" in tags or etag.strip('"') in {tag.removeprefix("W/").strip('"') for tag in tags}:
+            return HttpResponse(status=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and request.headers.get("If-Range", etag) == etag:
+        byte_range = parse_range(range_header, size)
+        if byte_range is False:
+            return HttpResponse(
+                status=416, headers={**headers, "Content-Range": f"bytes */{size}"}
+            )
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    if request.method == "HEAD":
+        response = HttpResponse(status=206 if byte_range else 200, content_type=content_type)
+    else:
+        f = open(path, "rb")
+        f.seek(start)
+        response = FileResponse(
+            FileRange(f, length),
+            status=206 if byte_range else 200,
+            content_type=content_type,
+        )
+        response.block_size = conf["BLOCK_SIZE"]
+    for header, value in headers.items():
+        response[header] = value
+    response["Content-Length"] = str(length)
+    response["Content-Disposition"] = f'inline; filename="{filename}"'
+    return response
@@ -0,0 +1,343 @@
+import hashlib
+import os
+import threading
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from lead.models.media_blob import MediaBlob
+
+DEFAULT_MEDIA_STORE_SETTINGS = {
+    # Off: uploads are stored under their upload_to names as before.
+    "ENABLED": True,
+    # Blobs live at MEDIA_ROOT/<LOCATION>/<sha[:2]>/<sha[2:4]>/<sha><ext>.
+    "LOCATION": "cas",
+    # Bytes read per chunk while hashing an upload.
+    "CHUNK_SIZE": 64 * 1024,
+    # Unreferenced blobs (and stray files) younger than this are kept, so a
+    # file saved by an upload whose row is not committed yet is never
+    # collected.
+    "GC_GRACE_HOURS": 24,
+}
+
+# Columns holding storage names: the upload itself, and for images /
+# selfies the renditions JSON ({"thumbnail": name, ...}).
+REFERENCE_FIELDS = {
+    "lead.EnquiryImages": ("media_file", "renditions"),
+    "lead.EnquirySelfie": ("selfie", "renditions"),
+    "lead.EnquiryTickets": ("attachment",),
+}
+
+TMP_DIR = "tmp"
+
+
+def get_media_store_settings():
+    conf = dict(DEFAULT_MEDIA_STORE_SETTINGS)
+    conf.update(getattr(settings, "MEDIA_STORE", {}) or {})
+    return conf
+
+
+def iter_names(value):
+    """Storage names in a file column or a renditions dict."""
+    if isinstance(value, dict):
+        for path in value.values():
+            if isinstance(path, str) and path:
+                yield path
+    elif value:
+        yield str(value)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that stores every upload once, under its SHA-256.
+
+    The upload is hashed while it is spooled to a temp file in one pass;
+    if a blob with that digest exists the copy is dropped and the existing
+    name returned, otherwise it is moved into place. Each save adds a
+    reference to the MediaBlob row and each delete() removes one; the file
+    itself is only removed by collect_garbage() once nothing points at it.
+    Names outside LOCATION (files stored before the migration) behave as
+    with FileSystemStorage.
+    """
+
+    def __init__(self, conf=None, **kwargs):
+        super().__init__(**kwargs)
+        self.conf = conf or get_media_store_settings()
+        self.prefix = self.conf["LOCATION"].strip("/") + "/"
+
+    # --- names ---
+    def blob_name(self, sha256, ext):
+        return f"{self.prefix}{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+    def is_blob(self, name):
+        return bool(name) and name.startswith(self.prefix) and not name.startswith(
+            self.prefix + TMP_DIR + "/"
+        )
+
+    def blob_sha(self, name):
+        return os.path.splitext(os.path.basename(name))[0]
+
+    def _makedirs(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        if self.directory_permissions_mode is not None:
+            os.chmod(directory, self.directory_permissions_mode)
+
+    # --- Storage API ---
+    def _save(self, name, content):
+        if not self.conf["ENABLED"]:
+            return super()._save(name, content)
+
+        ext = os.path.splitext(name)[1].lower()
+        tmp_dir = self.path(self.prefix + TMP_DIR)
+        self._makedirs(tmp_dir)
+        tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "xb") as out:
+                for chunk in content.chunks(self.conf["CHUNK_SIZE"]):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+
+            with transaction.atomic():
+                # Locks an existing row, so collect_garbage cannot remove the
+                # file between the check below and our reference.
+                blob, _ = MediaBlob.objects.select_for_update().get_or_create(
+                    sha256=sha256,
+                    defaults={"name": self.blob_name(sha256, ext), "size": size},
+                )
+                full_path = self.path(blob.name)
+                if not os.path.exists(full_path):
+                    self._makedirs(os.path.dirname(full_path))
+                    os.replace(tmp_path, full_path)
+                    tmp_path = None
+                    if self.file_permissions_mode is not None:
+                        os.chmod(full_path, self.file_permissions_mode)
+                else:
+                    # Fresh mtime keeps remove_stray_files off a file whose
+                    # row is being (re)created right now.
+                    os.utime(full_path)
+                MediaBlob.objects.filter(pk=blob.pk).update(
+                    ref_count=F("ref_count") + 1, last_referenced_at=timezone.now()
+                )
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return blob.name
+
+    def delete(self, name):
+        if not self.is_blob(name):
+            return super().delete(name)
+        MediaBlob.objects.filter(sha256=self.blob_sha(name), ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1
+        )
+
+    def remove_blob_file(self, name):
+        try:
+            os.remove(self.path(name))
+        except FileNotFoundError:
+            pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_media_store():
+    """Storage of the enquiry image / selfie / ticket attachment fields."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ContentAddressedStorage()
+    return _store
+
+
+# --- reference counting / GC ---
+def iter_references():
+    """Every storage name referenced by a row of REFERENCE_FIELDS."""
+    for label, fields in REFERENCE_FIELDS.items():
+        model = apps.get_model(label)
+        for row in model._base_manager.values_list(*fields).iterator(chunk_size=2000):
+            for value in row:
+                yield from iter_names(value)
+
+
+def count_references(store=None):
+    """sha256 -> number of references, over every referencing row."""
+    store = store or get_media_store()
+    counts = Counter()
+    for name in iter_references():
+        if store.is_blob(name):
+            counts[store.blob_sha(name)] += 1
+    return counts
+
+
+def recount_blobs(store=None):
+    """
+    Set every MediaBlob.ref_count to the number of rows pointing at it.
+    A row changed by a concurrent save / delete is left for the next run.
+    Returns how many counts were corrected.
+    """
+    counts = count_references(store)
+    corrected = 0
+    for pk, sha256, ref_count in MediaBlob.objects.values_list(
+        "pk", "sha256", "ref_count"
+    ).iterator(chunk_size=2000):
+        actual = counts.get(sha256, 0)
+        if actual != ref_count:
+            corrected += MediaBlob.objects.filter(pk=pk, ref_count=ref_count).update(
+                ref_count=actual
+            )
+    return corrected
+
+
+def collect_garbage(grace_hours=None, dry_run=False, batch_size=500, store=None):
+    """
+    Recount references, then remove blobs nothing has pointed at for
+    ``grace_hours``, and files under LOCATION without a MediaBlob row
+    (left by a rolled back upload or a crash) of the same age.
+    """
+    store = store or get_media_store()
+    if grace_hours is None:
+        grace_hours = store.conf["GC_GRACE_HOURS"]
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+    summary = {"recounted": 0, "deleted": 0, "bytes_freed": 0, "strays": 0}
+
+    orphans = MediaBlob.objects.filter(ref_count__lte=0, last_referenced_at__lt=cutoff)
+    if dry_run:
+        counts = count_references(store)
+        for sha256, size in MediaBlob.objects.filter(
+            last_referenced_at__lt=cutoff
+        ).values_list("sha256", "size"):
+            if not counts.get(sha256):
+                summary["deleted"] += 1
+                summary["bytes_freed"] += size
+    else:
+        summary["recounted"] = recount_blobs(store)
+        while True:
+            with transaction.atomic():
+                # The file goes while the row is locked, so a concurrent
+                # upload of the same bytes waits and then writes it afresh.
+                batch = list(
+                    orphans.select_for_update(skip_locked=True).order_by("id")[:batch_size]
+                )
+                if not batch:
+                    break
+                for blob in batch:
+                    store.remove_blob_file(blob.name)
+                    summary["bytes_freed"] += blob.size
+                MediaBlob.objects.filter(pk__in=[blob.pk for blob in batch]).delete()
+                summary["deleted"] += len(batch)
+
+    summary["strays"] = remove_stray_files(store, cutoff, dry_run)
+    return summary
+
+
+def remove_stray_files(store, cutoff, dry_run=False):
+    root = store.path(store.prefix)
+    if not os.path.isdir(root):
+        return 0
+    cutoff_ts = cutoff.timestamp()
+    removed = 0
+    for directory, _, files in os.walk(root):
+        old = {}
+        for filename in files:
+            path = os.path.join(directory, filename)
+            try:
+                if os.path.getmtime(path) < cutoff_ts:
+                    old[os.path.splitext(filename)[0]] = path
+            except FileNotFoundError:
+                continue
+        if not old:
+            continue
+        known = set(
+            MediaBlob.objects.filter(sha256__in=list(old)).values_list("sha256", flat=True)
+        )
+        for sha256, path in old.items():
+            if sha256 in known:
+                continue
+            removed += 1
+            if not dry_run:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+    return removed
+
+
+def file_digest(storage, name, chunk_size=None):
+    """(sha256, size) of a stored file, read in chunks."""
+    chunk_size = chunk_size or get_media_store_settings()["CHUNK_SIZE"]
+    digest = hashlib.sha256()
+    size = 0
+    with storage.open(name, "rb") as f:
+        for chunk in f.chunks(chunk_size):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+# --- migration of files stored before the media store ---
+def migrate_row(label, pk, store=None):
+    """
+    Move the plain files of one row into the store and point the row at
+    the blobs; the old files are removed once the row is updated. Returns
+    {"moved": n, "bytes": n, "missing": n}.
+    """
+    store = store or get_media_store()
+    model = apps.get_model(label)
+    fields = REFERENCE_FIELDS[label]
+    file_field = fields[0]
+    summary = {"moved": 0, "bytes": 0, "missing": 0}
+    row = model._base_manager.filter(pk=pk).values(*fields).first()
+    if row is None:
+        return summary
+
+    moved = {}
+    for field in fields:
+        for name in iter_names(row[field]):
+            if store.is_blob(name) or name in moved:
+                continue
+            if not store.exists(name):
+                summary["missing"] += 1
+                continue
+            summary["bytes"] += store.size(name)
+            with store.open(name, "rb") as f:
+                moved[name] = store.save(name, f)
+    if not moved:
+        return summary
+
+    values = {}
+    for field in fields:
+        value = row[field]
+        if isinstance(value, dict):
+            values[field] = {
+                key: moved.get(path, path) if isinstance(path, str) else path
+                for key, path in value.items()
+            }
+        elif value:
+            values[field] = moved.get(value, value)
+    # Only if nothing replaced the file meanwhile.
+    updated = model._base_manager.filter(pk=pk, **{file_field: row[file_field]}).update(
+        **values
+    )
+    for old, new in moved.items():
+        # Not a blob, so this removes the old file; or drops the reference
+        # just taken if the row changed under us.
+        store.delete(old if updated else new)
+    if updated:
+        summary["moved"] = len(moved)
+    else:
+        summary["bytes"] = 0
+    return summary
@@ -0,0 +1,218 @@
+import fcntl
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.http import UnreadablePostError
+from django.utils import timezone
+
+from constants import UPLOAD_KIND_IMAGE, UPLOAD_KIND_SELFIE, UploadSessionStatus
+from lead.models.upload_session import UploadSession
+from lead.serializers.enquiry_images_serializer import EnquiryImageSerializer
+from lead.serializers.enquiry_selfie_serializer import EnquirySelfieSerializer
+
+DEFAULT_RESUMABLE_UPLOAD_SETTINGS = {
+    # Part files; outside MEDIA_ROOT so they are never served.
+    # None: <BASE_DIR>/upload_sessions
+    "DIRECTORY": None,
+    # Chunk size suggested to clients, and the most one request may carry.
+    "CHUNK_SIZE": 512 * 1024,
+    "MAX_CHUNK_SIZE": 8 * 1024 * 1024,
+    "MAX_FILE_SIZE": 50 * 1024 * 1024,
+    # Bytes read from the request per write.
+    "READ_SIZE": 64 * 1024,
+    # Unfinished sessions are dropped this long after their last chunk.
+    "TTL_HOURS": 24,
+}
+
+# kind -> (serializer, file field)
+UPLOAD_TARGETS = {
+    UPLOAD_KIND_IMAGE: (EnquiryImageSerializer, "media_file"),
+    UPLOAD_KIND_SELFIE: (EnquirySelfieSerializer, "selfie"),
+}
+
+
+class UploadBusy(Exception):
+    """Another request is writing to, or has finished, the same session."""
+
+
+def get_resumable_upload_settings():
+    conf = dict(DEFAULT_RESUMABLE_UPLOAD_SETTINGS)
+    conf.update(getattr(settings, "RESUMABLE_UPLOADS", {}) or {})
+    if not conf["DIRECTORY"]:
+        conf["DIRECTORY"] = os.path.join(settings.BASE_DIR, "upload_sessions")
+    return conf
+
+
+def part_path(session, conf=None):
+    conf = conf or get_resumable_upload_settings()
+    return os.path.join(conf["DIRECTORY"], f"{session.upload_id.hex}.part")
+
+
+def session_expiry(conf=None):
+    conf = conf or get_resumable_upload_settings()
+    return timezone.now() + timedelta(hours=conf["TTL_HOURS"])
+
+
+def split_metadata(kind, data):
+    """
+    The form fields of the target serializer in ``data`` (everything but
+    the file), and errors for invalid or missing ones, so a bad upload is
+    rejected before any bytes are sent.
+    """
+    serializer_class, file_field = UPLOAD_TARGETS[kind]
+    writable = {
+        name: field
+        for name, field in serializer_class().fields.items()
+        if not field.read_only and name != file_field
+    }
+    metadata = {name: data[name] for name in writable if name in data}
+
+    errors = {}
+    check = serializer_class(data=metadata, partial=True)
+    if not check.is_valid():
+        errors.update(check.errors)
+    for name, field in writable.items():
+        if field.required and name not in metadata:
+            errors.setdefault(name, ["This field is required."])
+    return metadata, errors
+
+
+def start_session(enquiry, kind, file_name, total_size, metadata, user_id,
+                  content_type=None, sha256=None):
+    conf = get_resumable_upload_settings()
+    session = UploadSession.objects.create(
+        enquiry=enquiry,
+        kind=kind,
+        file_name=os.path.basename(file_name),
+        content_type=content_type,
+        total_size=total_size,
+        sha256=(sha256 or "").lower() or None,
+        metadata=metadata,
+        created_by=user_id,
+        expires_at=session_expiry(conf),
+    )
+    os.makedirs(conf["DIRECTORY"], exist_ok=True)
+    open(part_path(session, conf), "wb").close()
+    return session
+
+
+def write_chunk(session, offset, stream, length, conf=None):
+    """
+    Append ``length`` bytes read from ``stream`` at ``offset`` (which must
+    be the received size) straight to the part file, a READ_SIZE block at a
+    time. When the client drops mid-chunk, whatever arrived is kept and
+    becomes the offset to resume from. Returns the new offset; raises
+    UploadBusy if another request holds the session or moved it on.
+    """
+    conf = conf or get_resumable_upload_settings()
+    path = part_path(session, conf)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    with os.fdopen(fd, "r+b") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadBusy()
+        # The caller checked the offset before the lock; a request that held
+        # it may have recorded more since, and those bytes must stay.
+        if not UploadSession.objects.filter(
+            pk=session.pk, received_size=offset, status=UploadSessionStatus.UPLOADING
+        ).exists():
+            raise UploadBusy()
+        # Bytes past the recorded offset come from a request that died
+        # before recording them; the client resends them.
+        f.seek(offset)
+        f.truncate()
+
+        written = 0
+        try:
+            while written < length:
+                data = stream.read(min(conf["READ_SIZE"], length - written))
+                if not data:
+                    break
+                f.write(data)
+                written += len(data)
+        except (UnreadablePostError, OSError):
+            pass
+        f.flush()
+        os.fsync(f.fileno())
+
+        # Still under the lock, and only if nothing moved the offset.
+        updated = UploadSession.objects.filter(
+            pk=session.pk, received_size=offset, status=UploadSessionStatus.UPLOADING
+        ).update(
+            received_size=offset + written,
+            updated_at=timezone.now(),
+            expires_at=session_expiry(conf),
+        )
+    if not updated:
+        raise UploadBusy()
+    return offset + written
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssembledUpload(UploadedFile):
+    """A session's part file, handed to the serializers like a request upload."""
+
+    def __init__(self, path, name, content_type, size):
+        super().__init__(open(path, "rb"), name, content_type, size)
+        self.path = path
+
+    def temporary_file_path(self):
+        # Lets ImageField validation read the file from disk instead of
+        # loading it into memory.
+        return self.path
+
+
+def open_assembled(session, conf=None):
+    return AssembledUpload(
+        part_path(session, conf),
+        session.file_name,
+        session.content_type or "application/octet-stream",
+        session.received_size,
+    )
+
+
+def remove_part(session, conf=None):
+    try:
+        os.remove(part_path(session, conf))
+    except FileNotFoundError:
+        pass
+
+
+def expire_sessions():
+    """Drop unfinished sessions past expires_at and their part files."""
+    conf = get_resumable_upload_settings()
+    expired = UploadSession.objects.filter(
+        status=UploadSessionStatus.UPLOADING, expires_at__lt=timezone.now()
+    )
+    count = 0
+    for session in expired.iterator():
+        remove_part(session, conf)
+        count += UploadSession.objects.filter(
+            pk=session.pk, status=UploadSessionStatus.UPLOADING
+        ).update(status=UploadSessionStatus.ABORTED)
+    return count
+
+
+def session_payload(session):
+    return {
+        "upload_id": str(session.upload_id),
+        "kind": session.kind,
+        "file_name": session.file_name,
+        "size": session.total_size,
+        "offset": session.received_size,
+        "status": session.get_status_display(),
+        "result_id": session.result_id,
+        "expires_at": session.expires_at,
+        "chunk_size": get_resumable_upload_settings()["CHUNK_SIZE"],
+    }
@@ -6,7 +6,6 @@ from lead.serializers.enquiry_serializer import EnquirySerializer
 from django.db import IntegrityError
 from rest_framework import status
 from lead.models.enquiry import Enquiry
-from django.db.models import Q
 from auth_system.utils.pagination import CustomPagination
 from rest_framework.exceptions import NotFound
 from constants import PercentageStatus
@@ -14,9 +13,17 @@ from constants import EnquiryStatus
 from lead.models.lead_logs import LeadLog  
 from api_endpoints import CUSTOMER_GET_BY_ACCOUNT_URL
 from lead.utils.mis_helpers import call_mis_api
+from auth_system.utils.mis_async import acall_mis_api
+from auth_system.utils.async_views import AsyncAPIView
+from lead.utils.enquiry_counters import created_on_count, status_count
+from auth_system.utils.search import apply_search, wants_ranking
 from datetime import date
 from django.utils import timezone
 
+# Columns behind ?search= (indexed by migration 0026_enquiry_search_indexes).
+ENQUIRY_SEARCH_FIELDS = ("name",)
+ENQUIRY_SEARCH_PREFIX_FIELDS = ("mobile_number",)
+
 class EnquiryListCreateAPIView(APIView):
     permission_classes = [IsAuthenticated, IsTokenValid]
 
@@ -25,36 +32,39 @@ class EnquiryListCreateAPIView(APIView):
         count_only = request.query_params.get("count_only") == "true"
 
         if search_query:
-            enquiries = Enquiry.objects.filter(
-                Q(name__icontains=search_query) |
-                Q(mobile_number__icontains=search_query),
-                deleted_at__isnull=True
-            )
+            enquiries = Enquiry.objects.filter(deleted_at__isnull=True)
         else:
             enquiries = Enquiry.objects.filter(deleted_at__isnull=True, is_status=EnquiryStatus.ACTIVE)
-
-        total_count = enquiries.count()
+        enquiries = apply_search(
+            enquiries.order_by("-id"),
+            search_query,
+            ENQUIRY_SEARCH_FIELDS,
+            ENQUIRY_SEARCH_PREFIX_FIELDS,
+            rank=wants_ranking(request),
+        )
 
         if count_only:
             return Response({
                 "success": True,
                 "message": "Total enquiry count retrieved.",
-                "total_counts": total_count
+                "total_counts": enquiries.count()
             }, status=status.HTTP_200_OK)
 
-        enquiries = enquiries.order_by("-id")
-
         paginator = CustomPagination()
         page_data = paginator.paginate_queryset(enquiries, request)
         serializer = EnquirySerializer(page_data, many=True)
 
+        extra_fields = {
+            "success": True,
+            "message": "Enquiries retrieved successfully (paginated).",
+        }
+        # Cursor pages skip COUNT(*) unless the client asks for it (?count=...).
+        if not paginator.keyset:
+            extra_fields["total_count"] = paginator.page.paginator.count
+
         return paginator.get_custom_paginated_response(
             data=serializer.data,
-            extra_fields={
-                "success": True,
-                "message": "Enquiries retrieved successfully (paginated).",
-                "total_count": total_count
-            }
+            extra_fields=extra_fields,
         )
 
 
@@ -173,29 +183,52 @@ class EnquiryExistingDataAPIView(APIView):
     permission_classes = [IsAuthenticated, IsTokenValid]
 
     def post(self, request):
-        mobile = request.data.get("mobile_number", "").strip()
-        lan = request.data.get("lan_number", "").strip()
+        params, error_response = existing_data_params(request)
+        if error_response:
+            return error_response
 
-        if not mobile and not lan:
-            return Response(
-                {
-                    "success": False,
-                    "message": "At least mobile_number or lan_number is required.",
-                    "data": None,
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        return call_mis_api(
+            request, CUSTOMER_GET_BY_ACCOUNT_URL, params=params, timeout=30
+        )
 
-        params = {}
-        if lan:
-            params["loanAccount"] = lan
-        if mobile:
-            params["mobileNumber"] = mobile
 
-        return call_mis_api(
+class EnquiryExistingDataAsyncAPIView(AsyncAPIView):
+    """EnquiryExistingDataAPIView for ASGI deployments (MIS_ASYNC_VIEWS)."""
+
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    async def post(self, request):
+        params, error_response = existing_data_params(request)
+        if error_response:
+            return error_response
+
+        return await acall_mis_api(
             request, CUSTOMER_GET_BY_ACCOUNT_URL, params=params, timeout=30
         )
 
+
+def existing_data_params(request):
+    """MIS lookup params from the posted mobile_number / lan_number."""
+    mobile = request.data.get("mobile_number", "").strip()
+    lan = request.data.get("lan_number", "").strip()
+
+    if not mobile and not lan:
+        return None, Response(
+            {
+                "success": False,
+                "message": "At least mobile_number or lan_number is required.",
+                "data": None,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    params = {}
+    if lan:
+        params["loanAccount"] = lan
+    if mobile:
+        params["mobileNumber"] = mobile
+    return params, None
+
 class EnquiryDraftAPIView(APIView):
     permission_classes = [IsAuthenticated, IsTokenValid]
 
@@ -204,24 +237,28 @@ class EnquiryDraftAPIView(APIView):
         count_only = request.query_params.get("count_only") == "true"
 
         if search_query:
-            enquiries = Enquiry.objects.filter(
-                Q(name__icontains=search_query) |
-                Q(mobile_number__icontains=search_query),
-                deleted_at__isnull=True
-            )
+            enquiries = Enquiry.objects.filter(deleted_at__isnull=True)
         else:
             enquiries = Enquiry.objects.filter(deleted_at__isnull=True, is_status=EnquiryStatus.DRAFT)
-
-        total_count = enquiries.count()
+        enquiries = apply_search(
+            enquiries.order_by("id"),
+            search_query,
+            ENQUIRY_SEARCH_FIELDS,
+            ENQUIRY_SEARCH_PREFIX_FIELDS,
+            rank=wants_ranking(request),
+        )
 
         if count_only:
+            # Without a search the count comes from the materialized counters.
             return Response({
                 "success": True,
                 "message": "Total draft enquiry count retrieved.",
-                "total_counts": total_count
+                "total_counts": (
+                    enquiries.count() if search_query else status_count(EnquiryStatus.DRAFT)
+                )
             }, status=status.HTTP_200_OK)
 
-        enquiries = enquiries.order_by("id")
+        total_count = enquiries.count()
 
         paginator = CustomPagination()
         page_data = paginator.paginate_queryset(enquiries, request)
@@ -246,31 +283,31 @@ class EnquiryTodayDraftAPIView(APIView):
 
         today = date.today()
 
-        if search_query:
-            enquiries = Enquiry.objects.filter(
-                Q(name__icontains=search_query) |
-                Q(mobile_number__icontains=search_query),
-                deleted_at__isnull=True,
-                is_status=EnquiryStatus.DRAFT,
-                created_at__date=today 
-            )
-        else:
-            enquiries = Enquiry.objects.filter(
-                deleted_at__isnull=True,
-                is_status=EnquiryStatus.DRAFT,
-                created_at__date=today  
-            )
-
-        total_count = enquiries.count()
+        enquiries = Enquiry.objects.filter(
+            deleted_at__isnull=True,
+            is_status=EnquiryStatus.DRAFT,
+            created_at__date=today
+        ).order_by("id")
+        enquiries = apply_search(
+            enquiries,
+            search_query,
+            ENQUIRY_SEARCH_FIELDS,
+            ENQUIRY_SEARCH_PREFIX_FIELDS,
+            rank=wants_ranking(request),
+        )
 
         if count_only:
             return Response({
                 "success": True,
                 "message": "Today's draft enquiry count retrieved.",
-                "total_counts": total_count
+                "total_counts": (
+                    enquiries.count()
+                    if search_query
+                    else created_on_count(today, EnquiryStatus.DRAFT)
+                )
             }, status=status.HTTP_200_OK)
 
-        enquiries = enquiries.order_by("id")
+        total_count = enquiries.count()
 
         paginator = CustomPagination()
         page_data = paginator.paginate_queryset(enquiries, request)
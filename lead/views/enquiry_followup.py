@@ -18,6 +18,7 @@ from django.utils import timezone
 from lead.models.enquiry_lead_assign_log import LeadAssignLog
 from ems.models.emp_basic_profile import TblEmpBasicProfile
 from django.db import transaction
+from lead.utils.enquiry_counters import dashboard_counts, followups_on_count, status_count
 
 class EnquiryFollowUpCountAPIView(APIView):
     permission_classes = [IsAuthenticated, IsTokenValid]
@@ -26,34 +27,26 @@ class EnquiryFollowUpCountAPIView(APIView):
         today = date.today()
         count_only = request.query_params.get("count_only") == "true"
 
-        loan_qs = EnquiryLoanDetails.objects.filter(
-            followup_pickup_date=today, enquiry__deleted_at__isnull=True
-        )
-
-        enquiry_ids = loan_qs.values_list("enquiry_id", flat=True).distinct()
-        enquiries = Enquiry.objects.filter(id__in=enquiry_ids).order_by("-created_at")
-
-        for loan_detail in loan_qs:
-            LeadLog.objects.get_or_create(
-                enquiry_id=loan_detail.enquiry_id,
-                status="Follow-up Scheduled",
-                defaults={
-                    "created_by": 0,
-                    "remark": f"Follow-up scheduled for {loan_detail.followup_pickup_date}",
-                },
-            )
-
-        total_count = enquiries.count()
-
         if count_only:
             return Response(
                 {
                     "status": "success",
-                    "count": total_count,
+                    "count": followups_on_count(today),
                 },
                 status=status.HTTP_200_OK,
             )
 
+        loan_qs = EnquiryLoanDetails.objects.filter(
+            followup_pickup_date=today, enquiry__deleted_at__isnull=True
+        )
+
+        enquiry_ids = loan_qs.values_list("enquiry_id", flat=True).distinct()
+        enquiries = Enquiry.objects.filter(id__in=enquiry_ids).order_by("-created_at")
+
+        # The "Follow-up Scheduled" logs are written when a follow-up is set
+        # to today or earlier (lead.signals) and by the daily
+        # `manage.py materialize_followup_logs`, so this GET only reads.
+
         paginator = CustomPagination()
         paginated_enquiries = paginator.paginate_queryset(enquiries, request)
 
@@ -124,20 +117,18 @@ class ActiveEnquiriesAPIView(APIView):
     def get(self, request):
         count_only = request.query_params.get("count_only") == "true"
 
-        active_enquiries = Enquiry.objects.filter(
-            is_status=EnquiryStatus.ACTIVE,
-            deleted_at__isnull=True
-        ).order_by("-id")
-
-        total_count = active_enquiries.count()
-
         if count_only:
             return Response({
                 "success": True,
                 "message": "Total active enquiry count retrieved.",
-                "total_count": total_count
+                "total_count": status_count(EnquiryStatus.ACTIVE)
             }, status=status.HTTP_200_OK)
 
+        active_enquiries = Enquiry.objects.filter(
+            is_status=EnquiryStatus.ACTIVE,
+            deleted_at__isnull=True
+        ).order_by("-id")
+
         paginator = CustomPagination()
         paginated_enquiries = paginator.paginate_queryset(active_enquiries, request)
 
@@ -156,19 +147,17 @@ class ClosedEnquiriesAPIView(APIView):
 
         count_only = request.query_params.get("count_only") == "true"
 
-        closed_enquiries = Enquiry.objects.filter(
-            is_status=EnquiryStatus.CLOSED,
-            deleted_at__isnull=True
-        ).order_by("-id")
-
-        total_count = closed_enquiries.count()
-
         if count_only:
             return Response({
                 "success": True,
                 "message": "Total closed enquiry count retrieved.",
-                "total_count": total_count
+                "total_count": status_count(EnquiryStatus.CLOSED)
             }, status=status.HTTP_200_OK)
+
+        closed_enquiries = Enquiry.objects.filter(
+            is_status=EnquiryStatus.CLOSED,
+            deleted_at__isnull=True
+        ).order_by("-id")
         
 
         paginator = CustomPagination()
@@ -285,74 +274,13 @@ class AllCountAPIView(APIView):
     permission_classes = [IsAuthenticated, IsTokenValid]
 
     def get(self, request):
-        today = date.today()
-
-        today_followups = EnquiryLoanDetails.objects.filter(
-            followup_pickup_date=today,
-            enquiry__deleted_at__isnull=True
-        ).count()
-
-        today_created = Enquiry.objects.filter(
-            created_at__date=today,
-            deleted_at__isnull=True,
-            is_status=EnquiryStatus.ACTIVE,
-
-        ).count()
-
-        this_month_created = Enquiry.objects.filter(
-            created_at__year=today.year,
-            created_at__month=today.month,
-            deleted_at__isnull=True
-        ).count()
-
-        total_draft_count = Enquiry.objects.filter(
-            is_status=EnquiryStatus.DRAFT,
-            deleted_at__isnull=True
-        ).count()
-
-        today_draft_count = Enquiry.objects.filter(
-            is_status=EnquiryStatus.DRAFT,
-            deleted_at__isnull=True,
-            created_at__date=today
-        ).count()
+        # Served from the materialized counters (lead.utils.enquiry_counters).
+        counts = dashboard_counts(date.today())
 
         return Response({
             "success": True,
             "message": "Enquiry counts retrieved successfully.",
-
-            "total_enquiries_count": Enquiry.objects.filter(
-                deleted_at__isnull=True,
-                is_status__in=[
-                    EnquiryStatus.ACTIVE,
-                    EnquiryStatus.CLOSED,
-                    EnquiryStatus.REJECT,
-                    EnquiryStatus.RE_OPEN,
-                ]
-            ).count(),
-
-            "total_followup_count": EnquiryLoanDetails.objects.filter(
-                followup_pickup_date__gte=today,
-                enquiry__deleted_at__isnull=True
-            ).values("enquiry_id").distinct().count(),
-
-            "total_active_count": Enquiry.objects.filter(
-                is_status=EnquiryStatus.ACTIVE,
-                deleted_at__isnull=True
-            ).count(),
-            
-            "total_closed_count": Enquiry.objects.filter(
-                deleted_at__isnull=True, 
-                is_status__in=[
-                    EnquiryStatus.CLOSED,
-                    EnquiryStatus.REJECT,
-                ]
-            ).count(),
-
-            "total_draft_count": total_draft_count,
-            "today_draft_count": today_draft_count,
-            "today_followup_count": today_followups,
-            "today_created_count": today_created,
-            "current_month_count": this_month_created
+            **counts,
         }, status=status.HTTP_200_OK)
 
 class ThisMonthEnquiryListAPIView(APIView):
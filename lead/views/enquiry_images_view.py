@@ -2,7 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 
 from lead.serializers.enquiry_images_serializer import EnquiryImageSerializer
@@ -13,6 +13,49 @@ from django.utils import timezone
 from lead.models.lead_logs import LeadLog  
 from lead.models.enquiry_images import EnquiryImages
 from django.http import FileResponse, Http404
+from lead.utils.enquiry_steps import bulk_create_media, validate_media_files
+from lead.utils.media_delivery import serve_media
+
+
+def save_enquiry_images(enquiry, serializers, user_id):
+    """
+    Insert validated EnquiryImageSerializers for ``enquiry`` in one
+    bulk_create and record the image step with one LeadLog; shared by the
+    upload and resumable-upload endpoints.
+    """
+    images = bulk_create_media(enquiry, EnquiryImages, serializers, user_id)
+
+    if enquiry.is_steps < PercentageStatus.ENQUIRY_IMAGE:
+        enquiry.is_steps = PercentageStatus.ENQUIRY_IMAGE
+        enquiry.updated_by = user_id
+        enquiry.updated_at = timezone.now()
+        enquiry.save()
+
+    LeadLog.objects.create(
+        enquiry=enquiry,
+        status="Enquiry Image Form",
+        created_by=user_id,
+    )
+    return images
+
+
+def enquiry_images_saved_response(enquiry_id):
+    imageData = list(EnquiryImages.objects.filter(enquiry=enquiry_id, deleted_at__isnull=True))
+
+    if not imageData:
+        return Response({
+            "success": False,
+            "message": "Failed to save enquiry image.",
+            "data": []
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    serialized_images = EnquiryImageSerializer(imageData, many=True)
+
+    return Response({
+        "success": True,
+        "message": "Enquiry image saved successfully.",
+        "data": serialized_images.data, 
+    }, status=status.HTTP_201_CREATED)
 
 
 class EnquiryImagesCreateAPIView(APIView):
@@ -21,52 +64,30 @@ class EnquiryImagesCreateAPIView(APIView):
     def post(self, request, enquiry_id):
         enquiry = get_object_or_404(Enquiry, pk=enquiry_id)
 
-        serializer = EnquiryImageSerializer(data=request.data)
-        if serializer.is_valid():
-            try:
-                serializer.save(enquiry=enquiry, created_by=request.user.id)
-
-                if enquiry.is_steps < PercentageStatus.ENQUIRY_IMAGE:
-                    enquiry.is_steps = PercentageStatus.ENQUIRY_IMAGE
-                    enquiry.updated_by = request.user.id
-                    enquiry.updated_at = timezone.now()
-                    enquiry.save()
-
-                LeadLog.objects.create(
-                    enquiry=enquiry,
-                    status="Enquiry Image Form",
-                    created_by=request.user.id,
-                )
-
-                imageData = EnquiryImages.objects.filter(enquiry=enquiry_id, deleted_at__isnull=True)
-
-                if not imageData.exists():
-                    return Response({
-                        "success": False,
-                        "message": "Failed to save enquiry image.",
-                        "data": []
-                    }, status=status.HTTP_400_BAD_REQUEST)
-
-                serialized_images = EnquiryImageSerializer(imageData, many=True)
-
-                return Response({
-                    "success": True,
-                    "message": "Enquiry image saved successfully.",
-                    "data": serialized_images.data, 
-                }, status=status.HTTP_201_CREATED)
-            
-
-            except IntegrityError as e:
-                return Response({
-                    "success": False,
-                    "message": "Database integrity error while saving image.",
-                    "error": str(e)
-                }, status=status.HTTP_400_BAD_REQUEST)
-        return Response({
-            "success": False,
-            "message": "Invalid data submitted for enquiry image.",
-            "errors": serializer.errors
-        }, status=status.HTTP_400_BAD_REQUEST)
+        # One or more media_file parts, validated before anything is written.
+        media_files = request.FILES.getlist("media_file") or [None]
+        serializers, error = validate_media_files(
+            EnquiryImageSerializer, "media_file", request.data, media_files
+        )
+        if error:
+            index, errors = error
+            return Response({
+                "success": False,
+                "message": f"Invalid data submitted for enquiry image (file {index + 1}).",
+                "errors": errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with transaction.atomic():
+                save_enquiry_images(enquiry, serializers, request.user.id)
+            return enquiry_images_saved_response(enquiry_id)
+
+        except IntegrityError as e:
+            return Response({
+                "success": False,
+                "message": "Database integrity error while saving image.",
+                "error": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
 
 class EnquiryImagesDeleteAPIView(APIView):
 
@@ -113,6 +134,22 @@ class EnquiryImagesGetAPIView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+
+
+class EnquiryImageFileAPIView(APIView):
+    """The image file itself (?rendition=thumbnail|preview), after the token check."""
+
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def get(self, request, enquiry_id, image_id):
+        image = get_object_or_404(
+            EnquiryImages,
+            pk=image_id,
+            enquiry_id=enquiry_id,
+            deleted_at__isnull=True
+        )
+        return serve_media(request, image.media_file, request.query_params.get("rendition"))
+
     
 
 class EnquiryImagesListAPIView(APIView):
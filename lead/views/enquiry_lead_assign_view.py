@@ -17,6 +17,7 @@ from ems.serializers.branch_serializers import TblBranchSerializer
 
 from lead.serializers.employee_serializers import EmployeeSerializer 
 from lead.serializers.enquiry_serializer import EnquirySerializer
+from lead.utils.enquiry_counters import assigned_count
 
 class GetBranchAndFilterEmployeesAPIView(APIView):
     permission_classes = [IsAuthenticated, IsTokenValid]
@@ -143,7 +144,7 @@ class GetAssignedCount(APIView):
 
     def get(self, request):
         userId = request.user.id  
-        count = Enquiry.objects.filter(assign_to_id=userId).count()
+        count = assigned_count(userId)
 
         return Response(
             {"assigned_enquiry_count": count},
@@ -2,7 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from lead.models import Enquiry
 from lead.serializers.enquiry_selfie_serializer import EnquirySelfieSerializer
@@ -11,9 +11,45 @@ from constants import PercentageStatus, EnquiryStatus
 from django.utils import timezone
 from lead.models.lead_logs import LeadLog  
 from lead.models.enquiry_selfie import EnquirySelfie
+from lead.utils.image_renditions import delete_media_files, queue_renditions
+from lead.utils.media_delivery import serve_media
+from lead.utils.enquiry_steps import bulk_create_media, enquiry_steps_complete, validate_media_files
 
     
 
+def record_selfie_step(enquiry, user_id, log_status):
+    """
+    Move ``enquiry`` to the selfie step once selfies are saved, activating
+    it when every step has data (the Enquiry step flags); shared by the
+    selfie and resumable-upload endpoints.
+    """
+    if enquiry.is_steps < PercentageStatus.ENQUIRY_SELFIE:
+        enquiry.is_steps = PercentageStatus.ENQUIRY_SELFIE
+
+    enquiry.updated_by = user_id
+    enquiry.updated_at = timezone.now()
+
+    if enquiry_steps_complete(enquiry):
+        enquiry.is_status = EnquiryStatus.ACTIVE
+    enquiry.save()
+
+    LeadLog.objects.create(
+        enquiry=enquiry,
+        status=log_status,
+        created_by=user_id,
+    )
+
+
+def selfies_saved_response(enquiry):
+    all_selfies = EnquirySelfieSerializer(enquiry.enquiry_selfies.all(), many=True).data
+
+    return Response({
+        "success": True,
+        "message": "Selfie(s) saved successfully.",
+        "data": all_selfies
+    }, status=status.HTTP_201_CREATED)
+
+
 class EnquirySelfieCreateAPIView(APIView):
     permission_classes = [IsAuthenticated, IsTokenValid]
 
@@ -27,49 +63,22 @@ class EnquirySelfieCreateAPIView(APIView):
                 "message": "At least one selfie is required."
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        for selfie_file in selfie_files:
-            data = request.data.copy()
-            data["selfie"] = selfie_file
-
-            serializer = EnquirySelfieSerializer(data=data)
-            if serializer.is_valid():
-                serializer.save(enquiry=enquiry, created_by=request.user.id)
-            else:
-                return Response({
-                    "success": False,
-                    "message": "Invalid selfie data.",
-                    "errors": serializer.errors
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-        if enquiry.is_steps < PercentageStatus.ENQUIRY_SELFIE:
-            enquiry.is_steps = PercentageStatus.ENQUIRY_SELFIE
-
-        enquiry.updated_by = request.user.id
-        enquiry.updated_at = timezone.now()
-
-        all_data_present = (
-            enquiry.enquiry_addresses.exists()
-            and enquiry.enquiry_loan_details.exists()
-            and enquiry.enquiry_images.exists()
-            and enquiry.enquiry_selfies.exists()
+        # Every file is validated before anything is written.
+        serializers, error = validate_media_files(
+            EnquirySelfieSerializer, "selfie", request.data, selfie_files
         )
-        if all_data_present:
-            enquiry.is_status = EnquiryStatus.ACTIVE
-        enquiry.save()
-
-        LeadLog.objects.create(
-            enquiry=enquiry,
-            status="Enquiry Selfie Form",
-            created_by=request.user.id,
-        )
-
-        all_selfies = EnquirySelfieSerializer(enquiry.enquiry_selfies.all(), many=True).data
+        if error:
+            index, errors = error
+            return Response({
+                "success": False,
+                "message": f"Invalid selfie data (file {index + 1}).",
+                "errors": errors
+            }, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response({
-            "success": True,
-            "message": "Selfie(s) saved successfully.",
-            "data": all_selfies
-        }, status=status.HTTP_201_CREATED)
+        with transaction.atomic():
+            bulk_create_media(enquiry, EnquirySelfie, serializers, request.user.id)
+            record_selfie_step(enquiry, request.user.id, "Enquiry Selfie Form")
+        return selfies_saved_response(enquiry)
     
     
 class EnquirySelfieReplaceAPIView(APIView):
@@ -89,8 +98,7 @@ class EnquirySelfieReplaceAPIView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         if selfie_instance.selfie:
-            if selfie_instance.selfie.storage.exists(selfie_instance.selfie.name):
-                selfie_instance.selfie.delete(save=False)
+            delete_media_files(selfie_instance)
 
         selfie_instance.delete()
 
@@ -99,7 +107,7 @@ class EnquirySelfieReplaceAPIView(APIView):
         serializer = EnquirySelfieSerializer(data=data)
 
         if serializer.is_valid():
-            serializer.save(enquiry=enquiry, created_by=request.user.id)
+            queue_renditions(serializer.save(enquiry=enquiry, created_by=request.user.id))
         else:
             return Response({
                 "success": False,
@@ -107,27 +115,7 @@ class EnquirySelfieReplaceAPIView(APIView):
                 "errors": serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        if enquiry.is_steps < PercentageStatus.ENQUIRY_SELFIE:
-            enquiry.is_steps = PercentageStatus.ENQUIRY_SELFIE
-
-        enquiry.updated_by = request.user.id
-        enquiry.updated_at = timezone.now()
-
-        all_data_present = (
-            enquiry.enquiry_addresses.exists()
-            and enquiry.enquiry_loan_details.exists()
-            and enquiry.enquiry_images.exists()
-            and enquiry.enquiry_selfies.exists()
-        )
-        if all_data_present:
-            enquiry.is_status = EnquiryStatus.ACTIVE
-        enquiry.save()
-
-        LeadLog.objects.create(
-            enquiry=enquiry,
-            status="Enquiry Selfie Updated",
-            created_by=request.user.id,
-        )
+        record_selfie_step(enquiry, request.user.id, "Enquiry Selfie Updated")
 
         all_selfies = EnquirySelfieSerializer(enquiry.enquiry_selfies.all(), many=True).data
 
@@ -183,6 +171,21 @@ class EnquirySelfieGetAPIView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+class EnquirySelfieFileAPIView(APIView):
+    """The selfie file itself (?rendition=thumbnail|preview), after the token check."""
+
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def get(self, request, enquiry_id, selfie_id):
+        selfie = get_object_or_404(
+            EnquirySelfie,
+            pk=selfie_id,
+            enquiry_id=enquiry_id,
+            deleted_at__isnull=True
+        )
+        return serve_media(request, selfie.selfie, request.query_params.get("rendition"))
+
+
 class EnquirySelfieListAPIView(APIView):
     permission_classes = [IsAuthenticated, IsTokenValid]
 
@@ -7,6 +7,7 @@ from ..serializers.enquiry_tickets_serializers import EnquiryTicketSerializer
 from ..models.enquiry_tickets import EnquiryTickets
 from django.shortcuts import get_object_or_404
 from auth_system.utils.pagination import CustomPagination
+from lead.utils.media_delivery import serve_media
 
 
 class EnquiryTicketCreateAPIView(APIView):
@@ -121,4 +122,13 @@ class EnquiryTicketDetailAPIView(APIView):
                 "message": "Status updated successfully.",
             },
             status=status.HTTP_200_OK,
-        )
\ No newline at end of file
+        )
+
+
+class EnquiryTicketAttachmentAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsTokenValid]
+    def get(self, request, ticket_id):
+        ticket = get_object_or_404(
+            EnquiryTickets, pk=ticket_id, deleted_at__isnull=True
+        )
+        return serve_media(request, ticket.attachment)
@@ -0,0 +1,242 @@
+from django.db import IntegrityError, transaction
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_system.permissions.token_valid import IsTokenValid
+from constants import UPLOAD_KIND_IMAGE, UPLOAD_KIND_SELFIE, UploadSessionStatus
+from lead.models import Enquiry
+from lead.models.enquiry_selfie import EnquirySelfie
+from lead.models.upload_session import UploadSession
+from lead.utils.enquiry_steps import bulk_create_media
+from lead.utils.resumable_upload import (
+    UPLOAD_TARGETS,
+    UploadBusy,
+    file_sha256,
+    get_resumable_upload_settings,
+    open_assembled,
+    part_path,
+    remove_part,
+    session_payload,
+    split_metadata,
+    start_session,
+    write_chunk,
+)
+from lead.views.enquiry_images_view import enquiry_images_saved_response, save_enquiry_images
+from lead.views.enquiry_selfie_view import record_selfie_step, selfies_saved_response
+
+OFFSET_HEADER = "Upload-Offset"
+
+
+def offset_response(session, http_status=status.HTTP_200_OK, message="Upload offset retrieved."):
+    response = Response({
+        "success": http_status < 400,
+        "message": message,
+        "data": session_payload(session),
+    }, status=http_status)
+    response[OFFSET_HEADER] = str(session.received_size)
+    return response
+
+
+def get_session(request, enquiry_id, upload_id):
+    return get_object_or_404(
+        UploadSession,
+        upload_id=upload_id,
+        enquiry_id=enquiry_id,
+        created_by=request.user.id,
+    )
+
+
+class EnquiryUploadInitiateAPIView(APIView):
+    """
+    Start a resumable image / selfie upload. Takes the same form fields as
+    the images/ or selfie/ endpoint without the file, plus kind, file_name,
+    size and optionally content_type and sha256 (hex, of the whole file).
+    """
+
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def post(self, request, enquiry_id):
+        enquiry = get_object_or_404(Enquiry, pk=enquiry_id)
+        conf = get_resumable_upload_settings()
+
+        kind = request.data.get("kind")
+        if kind not in UPLOAD_TARGETS:
+            return Response({
+                "success": False,
+                "message": f"kind must be one of: {', '.join(UPLOAD_TARGETS)}.",
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        file_name = request.data.get("file_name")
+        try:
+            size = int(request.data.get("size"))
+        except (TypeError, ValueError):
+            size = 0
+        if not file_name or size <= 0:
+            return Response({
+                "success": False,
+                "message": "file_name and a positive size are required.",
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if size > conf["MAX_FILE_SIZE"]:
+            return Response({
+                "success": False,
+                "message": f"File is larger than {conf['MAX_FILE_SIZE']} bytes.",
+            }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        metadata, errors = split_metadata(kind, request.data)
+        if errors:
+            return Response({
+                "success": False,
+                "message": "Invalid data submitted for enquiry upload.",
+                "errors": errors,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        session = start_session(
+            enquiry,
+            kind,
+            file_name,
+            size,
+            metadata,
+            request.user.id,
+            content_type=request.data.get("content_type"),
+            sha256=request.data.get("sha256"),
+        )
+        return offset_response(session, status.HTTP_201_CREATED, "Upload started.")
+
+
+class EnquiryUploadAPIView(APIView):
+    """
+    GET / HEAD: bytes received so far (also in the Upload-Offset header).
+    PATCH: the next chunk as the raw request body, with Upload-Offset (or
+    ?offset=) set to the bytes received so far.
+    DELETE: abandon the upload.
+    """
+
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def get(self, request, enquiry_id, upload_id):
+        return offset_response(get_session(request, enquiry_id, upload_id))
+
+    def patch(self, request, enquiry_id, upload_id):
+        session = get_session(request, enquiry_id, upload_id)
+        conf = get_resumable_upload_settings()
+
+        if session.status != UploadSessionStatus.UPLOADING:
+            return offset_response(session, status.HTTP_409_CONFLICT, "Upload is no longer open.")
+
+        try:
+            offset = int(request.headers.get(OFFSET_HEADER, request.query_params.get("offset")))
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (TypeError, ValueError):
+            return offset_response(
+                session, status.HTTP_400_BAD_REQUEST, f"{OFFSET_HEADER} is required."
+            )
+        if offset != session.received_size:
+            # Resume from what the server has, not what the client thinks.
+            return offset_response(session, status.HTTP_409_CONFLICT, "Offset does not match.")
+        if length <= 0:
+            return offset_response(
+                session, status.HTTP_411_LENGTH_REQUIRED, "Content-Length is required."
+            )
+        if length > conf["MAX_CHUNK_SIZE"] or offset + length > session.total_size:
+            return offset_response(
+                session, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "Chunk is too large."
+            )
+
+        try:
+            # request.stream is never parsed, so the body goes to disk as it
+            # arrives.
+            write_chunk(session, offset, request.stream, length, conf)
+        except UploadBusy:
+            session.refresh_from_db()
+            return offset_response(
+                session, status.HTTP_409_CONFLICT, "Another chunk is being written."
+            )
+        session.refresh_from_db()
+        return offset_response(session, message="Chunk received.")
+
+    def delete(self, request, enquiry_id, upload_id):
+        session = get_session(request, enquiry_id, upload_id)
+        if session.status == UploadSessionStatus.UPLOADING:
+            UploadSession.objects.filter(
+                pk=session.pk, status=UploadSessionStatus.UPLOADING
+            ).update(status=UploadSessionStatus.ABORTED)
+            remove_part(session)
+        return Response({
+            "success": True,
+            "message": "Upload cancelled.",
+        }, status=status.HTTP_200_OK)
+
+
+class EnquiryUploadFinalizeAPIView(APIView):
+    """
+    Attach a fully received upload to the enquiry, exactly as the images/ or
+    selfie/ endpoint would, and answer as they do. Repeating it after a
+    lost response returns the same answer without attaching again.
+    """
+
+    permission_classes = [IsAuthenticated, IsTokenValid]
+
+    def post(self, request, enquiry_id, upload_id):
+        enquiry = get_object_or_404(Enquiry, pk=enquiry_id)
+        get_session(request, enquiry_id, upload_id)
+
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(upload_id=upload_id)
+            if session.status == UploadSessionStatus.COMPLETED:
+                return self.saved_response(enquiry, session)
+            if session.status != UploadSessionStatus.UPLOADING:
+                return offset_response(session, status.HTTP_409_CONFLICT, "Upload is no longer open.")
+            if session.received_size != session.total_size:
+                return offset_response(session, status.HTTP_409_CONFLICT, "Upload is incomplete.")
+
+            if session.sha256 and file_sha256(part_path(session)) != session.sha256:
+                # Start over rather than keep bytes we know are wrong.
+                UploadSession.objects.filter(pk=session.pk).update(received_size=0)
+                open(part_path(session), "wb").close()
+                session.refresh_from_db()
+                return offset_response(
+                    session, status.HTTP_400_BAD_REQUEST, "Checksum does not match; upload again."
+                )
+
+            serializer_class, file_field = UPLOAD_TARGETS[session.kind]
+            upload = open_assembled(session)
+            try:
+                serializer = serializer_class(data={**session.metadata, file_field: upload})
+                if not serializer.is_valid():
+                    return Response({
+                        "success": False,
+                        "message": "Invalid data submitted for enquiry upload.",
+                        "errors": serializer.errors,
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+                try:
+                    if session.kind == UPLOAD_KIND_IMAGE:
+                        instance = save_enquiry_images(enquiry, [serializer], session.created_by)[0]
+                    else:
+                        instance = bulk_create_media(
+                            enquiry, EnquirySelfie, [serializer], session.created_by
+                        )[0]
+                        record_selfie_step(enquiry, session.created_by, "Enquiry Selfie Form")
+                except IntegrityError as e:
+                    return Response({
+                        "success": False,
+                        "message": "Database integrity error while saving upload.",
+                        "error": str(e)
+                    }, status=status.HTTP_400_BAD_REQUEST)
+            finally:
+                upload.close()
+
+            session.status = UploadSessionStatus.COMPLETED
+            session.result_id = instance.id
+            session.save(update_fields=["status", "result_id"])
+            transaction.on_commit(lambda: remove_part(session))
+
+        return self.saved_response(enquiry, session)
+
+    def saved_response(self, enquiry, session):
+        if session.kind == UPLOAD_KIND_SELFIE:
+            return selfies_saved_response(enquiry)
+        return enquiry_images_saved_response(enquiry.id)